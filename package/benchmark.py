@@ -0,0 +1,274 @@
+# Scaling benchmarks of the buy and sell strategies of StockLedger:
+#     python -m package.benchmark --output results.json
+#     python -m package.benchmark --baseline results.json --threshold 0.25
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from random import Random
+from package.linked_deque import LinkedDeque
+from package.ring_deque import RingDeque
+from package.stock_ledger import StockLedger
+
+BUY_STRATEGIES = StockLedger.BUY_STRATEGIES
+SELL_STRATEGIES = StockLedger.SELL_STRATEGIES
+DIMENSIONS = ["orders", "shares", "levels", "symbols"]
+
+
+def make_orders(
+    orders: int, shares: int, levels: int, symbols: int, seed: int = 0
+) -> list[tuple[str, int, float]]:  # O(orders)
+    """Returns orders (stock symbol, quantity, price) of shares each, over symbols stock symbols and levels distinct prices."""
+    order_random = Random(seed)
+    stock_symbols = [f"S{s_i:03d}" for s_i in range(symbols)]
+    prices = [100 + 10 * l_i for l_i in range(levels)]
+    return [
+        (
+            order_random.choice(stock_symbols),
+            shares,
+            order_random.choice(prices),
+        )
+        for o_i in range(orders)
+    ]
+
+
+def _new_ledger(ledger_options: dict, seed: int) -> StockLedger:  # O(1)
+    return StockLedger(rng=Random(seed), **ledger_options)
+
+
+def run_strategy(
+    strategy: str,
+    orders: list[tuple[str, int, float]],
+    ledger_options: dict,
+    seed: int = 0,
+    trace_memory: bool = False,
+) -> tuple[float, int]:  # O(strategy)
+    """Returns (seconds, peak bytes traced, or 0) of strategy over orders; a sell strategy sells the shares of orders, in shuffled order, after buying them with buy (untimed)."""
+    stock_ledger = _new_ledger(ledger_options, seed)
+    if strategy in SELL_STRATEGIES:
+        for stock_symbol, quantity, price in orders:
+            stock_ledger.buy(stock_symbol, quantity, price)
+        orders = list(orders)
+        Random(seed + 1).shuffle(orders)
+    strategy_method = getattr(stock_ledger, strategy)
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    for stock_symbol, quantity, price in orders:
+        strategy_method(stock_symbol, quantity, price)
+    seconds = time.perf_counter() - start
+    peak_bytes = 0
+    if trace_memory:
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return seconds, peak_bytes
+
+
+def fit_exponent(sizes: list[float], seconds: list[float]) -> float | None:
+    """Returns the least squares slope of log(seconds) over log(sizes), or None for fewer than 2 distinct sizes."""
+    points = [
+        (math.log(size), math.log(max(each_seconds, 1e-9)))
+        for size, each_seconds in zip(sizes, seconds)
+    ]
+    mean_x = sum(x for x, y in points) / len(points)
+    mean_y = sum(y for x, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, y in points)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def run_suite(
+    strategies: list[str],
+    base: dict[str, int],
+    factors: list[int],
+    ledger_options: dict,
+    repeats: int = 3,
+    trace_memory: bool = True,
+    seed: int = 0,
+    display: bool = True,
+) -> dict:  # O(strategies * dimensions * factors * repeats)
+    results = []
+    exponents = {}
+    for each_strategy in strategies:
+        exponents[each_strategy] = {}
+        for each_dimension in DIMENSIONS:
+            sizes = []
+            best_seconds = []
+            for each_factor in factors:
+                params = dict(base)
+                params[each_dimension] = base[each_dimension] * each_factor
+                orders = make_orders(seed=seed, **params)
+                seconds = min(
+                    run_strategy(
+                        each_strategy, orders, ledger_options, seed
+                    )[0]
+                    for r_i in range(repeats)
+                )
+                peak_bytes = 0
+                if trace_memory:
+                    peak_bytes = run_strategy(
+                        each_strategy, orders, ledger_options, seed, True
+                    )[1]
+                total_shares = params["orders"] * params["shares"]
+                results.append(
+                    {
+                        "strategy": each_strategy,
+                        "dimension": each_dimension,
+                        "factor": each_factor,
+                        "params": params,
+                        "seconds": seconds,
+                        "orders_per_second": params["orders"] / seconds,
+                        "shares_per_second": total_shares / seconds,
+                        "peak_bytes": peak_bytes,
+                    }
+                )
+                sizes.append(params[each_dimension])
+                best_seconds.append(seconds)
+                if display:
+                    print(
+                        f"{each_strategy:>14} {each_dimension:>7}"
+                        f" x{each_factor:<3} {seconds * 1e3:10.2f} ms"
+                        f" {params['orders'] / seconds:12.0f} orders/s"
+                        f" {peak_bytes / 1024:10.1f} KiB",
+                        file=sys.stderr,
+                    )
+            exponents[each_strategy][each_dimension] = fit_exponent(
+                sizes, best_seconds
+            )
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "base": base,
+            "factors": factors,
+            "repeats": repeats,
+            "ledger_options": {
+                key: (value.__name__ if isinstance(value, type) else value)
+                for key, value in ledger_options.items()
+            },
+        },
+        "results": results,
+        "exponents": exponents,
+    }
+
+
+def _result_key(result: dict) -> tuple:  # O(1)
+    """Returns the key of result for compare; the dimension is part of it, as every dimension's factor 1 has the same params, but is timed apart."""
+    return (result["strategy"], result["dimension"]) + tuple(
+        sorted(result["params"].items())
+    )
+
+
+def compare(
+    suite: dict, baseline: dict, threshold: float = 0.25
+) -> list[str]:  # O(results)
+    """Returns a line for each regression of suite from baseline: a time more than (1 + threshold) times that of the baseline for the same strategy, dimension and params, or a scaling exponent more than threshold greater."""
+    regressions = []
+    baseline_seconds = {
+        _result_key(each): each["seconds"] for each in baseline["results"]
+    }
+    for each in suite["results"]:
+        key = _result_key(each)
+        if (
+            key in baseline_seconds
+            and each["seconds"] > (1 + threshold) * baseline_seconds[key]
+        ):
+            regressions.append(
+                f"{each['strategy']} {each['dimension']} x{each['factor']}:"
+                f" {each['seconds']:.6f} s,"
+                f" baseline {baseline_seconds[key]:.6f} s"
+            )
+    for strategy, strategy_exponents in suite["exponents"].items():
+        for dimension, exponent in strategy_exponents.items():
+            baseline_exponent = (
+                baseline["exponents"].get(strategy, {}).get(dimension)
+            )
+            if (
+                exponent is not None
+                and baseline_exponent is not None
+                and exponent > baseline_exponent + threshold
+            ):
+                regressions.append(
+                    f"{strategy} {dimension}: exponent {exponent:.2f},"
+                    f" baseline {baseline_exponent:.2f}"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m package.benchmark",
+        description="Times each buy and sell strategy of StockLedger while"
+        " scaling orders, shares per order, cost levels or symbols by each of"
+        " --factors, and fits scaling exponents of time.",
+    )
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        choices=BUY_STRATEGIES + SELL_STRATEGIES,
+        default=BUY_STRATEGIES + SELL_STRATEGIES,
+    )
+    parser.add_argument("--orders", type=int, default=100)
+    parser.add_argument("--shares", type=int, default=5)
+    parser.add_argument("--levels", type=int, default=10)
+    parser.add_argument("--symbols", type=int, default=2)
+    parser.add_argument("--factors", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--lot-based", action="store_true")
+    parser.add_argument("--cost-index", action="store_true")
+    parser.add_argument("--ring-deque", action="store_true")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare to this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args(argv)
+    suite = run_suite(
+        args.strategies,
+        {
+            "orders": args.orders,
+            "shares": args.shares,
+            "levels": args.levels,
+            "symbols": args.symbols,
+        },
+        args.factors,
+        {
+            "lot_based": args.lot_based,
+            "cost_index": args.cost_index,
+            "deque_type": RingDeque if args.ring_deque else LinkedDeque,
+        },
+        args.repeats,
+        not args.no_memory,
+        args.seed,
+    )
+    for strategy, strategy_exponents in suite["exponents"].items():
+        print(
+            f"{strategy:>14}: "
+            + ", ".join(
+                f"{dimension} "
+                + ("-" if exponent is None else f"{exponent:.2f}")
+                for dimension, exponent in strategy_exponents.items()
+            )
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(suite, output_file, indent=1)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            regressions = compare(
+                suite, json.load(baseline_file), args.threshold
+            )
+        for each_regression in regressions:
+            print(f"regression: {each_regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,10 @@
+import os
+from collections.abc import Iterable
+from package.order_stream import (
+    OrderStreamReport,
+    is_display_line,
+    iter_orders,
+)
 from package.stock_ledger import StockLedger
 from random import SystemRandom
 
@@ -10,7 +17,7 @@ def display_interpret_string_as_ledger(
     for each_line in input_lines:  # O(N=len(input_lines))
         each_split_line = each_line.split()  # splits on spaces
         # print(each_line)
-        if each_line.count("Display") == 0:
+        if not is_display_line(each_line):
             price_string = each_split_line[-1].strip(".$")
         if each_split_line[0] == "Buy":
             sl.buy(
@@ -20,7 +27,7 @@ def display_interpret_string_as_ledger(
             sl.sell(
                 each_split_line[4], int(each_split_line[1]), float(price_string)
             )
-        elif display:
+        elif display and is_display_line(each_line):
             sl.display_ledger()
     return sl
 
@@ -29,6 +36,24 @@ def interpret_string_as_ledger(input_str: str) -> StockLedger:  # O(N)
     return display_interpret_string_as_ledger(input_str)
 
 
+def display_interpret_stream_as_ledger(
+    source: os.PathLike | Iterable[str], display: bool = False
+) -> tuple[StockLedger, OrderStreamReport]:  # O(N) time, O(1) memory
+    """Same as display_interpret_string_as_ledger, for an order log given as a file path (os.PathLike), a file object, or any iterable of lines (see order_stream.iter_lines); malformed lines are counted in the returned OrderStreamReport."""
+    sl = StockLedger()
+    report = OrderStreamReport()
+    for buy_or_sell, stock_symbol, quantity, price in iter_orders(
+        source, report
+    ):
+        if buy_or_sell == "Buy":
+            sl.buy(stock_symbol, quantity, price)
+        elif buy_or_sell == "Sell":
+            sl.sell(stock_symbol, quantity, price)
+        elif display:
+            sl.display_ledger()
+    return sl, report
+
+
 def get_buy_sell_line(
     stock_symbol: str, buy_sell_str: str, quantity: int, price: float
 ) -> str:  # O(1)
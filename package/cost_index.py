@@ -0,0 +1,225 @@
+from collections import deque
+from random import Random
+
+
+class CostLevels:
+    """CostLevels is an indexable skip list of cost levels in ascending order, each weighted by its number of shares. Each link stores the number of shares it skips over, so the share at any rank (such as the median) is found in O(log n), and the lowest and highest levels are read in O(1)."""
+
+    MAX_HEIGHT = 32
+
+    class Level:
+        def __init__(
+            self, cost: float | None, shares: int, height: int
+        ) -> None:
+            self.cost = cost
+            self.shares = shares
+            self.next_levels = [None] * height
+            self.widths = [0] * height  # shares after this level, up to and
+            # including next_levels[i]
+
+    def __init__(self) -> None:
+        self._head = CostLevels.Level(None, 0, CostLevels.MAX_HEIGHT)
+        self._tail = None
+        self._height = 1
+        self._random = Random(0)  # heights do not change results
+        self.number_of_shares = 0
+        self.number_of_levels = 0
+
+    def __len__(self) -> int:  # O(1)
+        return self.number_of_levels
+
+    def _predecessors(
+        self, cost: float
+    ) -> tuple[list, list[int]]:  # O(log n)
+        """Returns, for each height, the last level before cost and the number of shares up to and including it."""
+        predecessors = [self._head] * CostLevels.MAX_HEIGHT
+        shares_through = [0] * CostLevels.MAX_HEIGHT
+        current = self._head
+        position = 0
+        for h_i in reversed(range(self._height)):
+            while (
+                current.next_levels[h_i] is not None
+                and current.next_levels[h_i].cost < cost
+            ):
+                position += current.widths[h_i]
+                current = current.next_levels[h_i]
+            predecessors[h_i] = current
+            shares_through[h_i] = position
+        return predecessors, shares_through
+
+    def add(self, cost: float, quantity: int) -> None:  # O(log n)
+        predecessors, shares_through = self._predecessors(cost)
+        found = predecessors[0].next_levels[0]
+        self.number_of_shares += quantity
+        if found is not None and found.cost == cost:
+            for h_i in range(self._height):
+                if predecessors[h_i].next_levels[h_i] is not None:
+                    predecessors[h_i].widths[h_i] += quantity
+            found.shares += quantity
+            return
+        height = 1
+        while (
+            height < CostLevels.MAX_HEIGHT and self._random.random() < 0.5
+        ):
+            height += 1
+        self._height = max(self._height, height)
+        new_level = CostLevels.Level(cost, quantity, height)
+        new_position = shares_through[0] + quantity
+        for h_i in range(self._height):
+            predecessor = predecessors[h_i]
+            if h_i < height:
+                if predecessor.next_levels[h_i] is not None:
+                    new_level.widths[h_i] = (
+                        predecessor.widths[h_i]
+                        + shares_through[h_i]
+                        + quantity
+                        - new_position
+                    )
+                new_level.next_levels[h_i] = predecessor.next_levels[h_i]
+                predecessor.next_levels[h_i] = new_level
+                predecessor.widths[h_i] = new_position - shares_through[h_i]
+            elif predecessor.next_levels[h_i] is not None:
+                predecessor.widths[h_i] += quantity
+        if new_level.next_levels[0] is None:
+            self._tail = new_level
+        self.number_of_levels += 1
+
+    def remove(self, cost: float, quantity: int) -> None:  # O(log n)
+        predecessors, shares_through = self._predecessors(cost)
+        found = predecessors[0].next_levels[0]
+        self.number_of_shares -= quantity
+        found.shares -= quantity
+        if found.shares > 0:
+            for h_i in range(self._height):
+                if predecessors[h_i].next_levels[h_i] is not None:
+                    predecessors[h_i].widths[h_i] -= quantity
+            return
+        for h_i in range(self._height):
+            predecessor = predecessors[h_i]
+            if predecessor.next_levels[h_i] is found:
+                if found.next_levels[h_i] is None:
+                    predecessor.widths[h_i] = 0
+                else:
+                    predecessor.widths[h_i] += (
+                        found.widths[h_i] - quantity
+                    )
+                predecessor.next_levels[h_i] = found.next_levels[h_i]
+            elif predecessor.next_levels[h_i] is not None:
+                predecessor.widths[h_i] -= quantity
+        if self._tail is found:
+            self._tail = (
+                None if predecessors[0] is self._head else predecessors[0]
+            )
+        self.number_of_levels -= 1
+
+    def lowest(self) -> float:  # O(1)
+        return self._head.next_levels[0].cost
+
+    def highest(self) -> float:  # O(1)
+        return self._tail.cost
+
+    def copy(self) -> "CostLevels":  # O(n log n)
+        """Returns CostLevels of the same cost levels and shares (with heights of its own)."""
+        levels_copy = CostLevels()
+        current = self._head.next_levels[0]
+        while current is not None:
+            levels_copy.add(current.cost, current.shares)
+            current = current.next_levels[0]
+        return levels_copy
+
+    def select(self, rank: int) -> float:  # O(log n)
+        """Returns the cost of the share at rank (0 is a lowest cost share)."""
+        current = self._head
+        position = 0
+        for h_i in reversed(range(self._height)):
+            while (
+                current.next_levels[h_i] is not None
+                and position + current.widths[h_i] <= rank
+            ):
+                position += current.widths[h_i]
+                current = current.next_levels[h_i]
+        return current.next_levels[0].cost
+
+
+class CostIndex:
+    """CostIndex is a multiset of the costs of the shares in a LotLedgerEntry, with the StockLots at each cost level. Cost levels are kept in CostLevels, so the lowest and highest cost levels are read in O(1), and the median in O(log n), without visiting the deque."""
+
+    def __init__(self) -> None:
+        self._shares_by_cost = {}
+        self._lots_by_cost = {}  # cost -> deque of StockLots, oldest first
+        self._live_lots_by_cost = {}
+        self._levels = CostLevels()
+
+    def __len__(self) -> int:  # O(1), number of cost levels
+        return len(self._shares_by_cost)
+
+    def __contains__(self, cost: float) -> bool:  # O(1)
+        return cost in self._shares_by_cost
+
+    def shares_at(self, cost: float) -> int:  # O(1)
+        return self._shares_by_cost.get(cost, 0)
+
+    def add_shares(self, cost: float, quantity: int) -> None:  # O(log n)
+        if cost not in self._shares_by_cost:
+            self._shares_by_cost[cost] = 0
+            self._lots_by_cost[cost] = deque()
+            self._live_lots_by_cost[cost] = 0
+        self._shares_by_cost[cost] += quantity
+        self._levels.add(cost, quantity)
+
+    def remove_shares(self, cost: float, quantity: int) -> None:  # O(log n)
+        self._shares_by_cost[cost] -= quantity
+        self._levels.remove(cost, quantity)
+        if self._shares_by_cost[cost] == 0:
+            del self._shares_by_cost[cost]
+            del self._lots_by_cost[cost]
+            del self._live_lots_by_cost[cost]
+
+    def add_lot(self, lot) -> None:  # O(1)
+        """Records a StockLot placed in the deque; its shares are counted by add_shares."""
+        self._lots_by_cost[lot.cost].append(lot)
+        self._live_lots_by_cost[lot.cost] += 1
+
+    def discard_lot(self, cost: float) -> None:  # O(1) amortized
+        """Records that a StockLot of cost left the deque (its quantity is set to 0 by the caller)."""
+        if cost not in self._live_lots_by_cost:
+            return
+        self._live_lots_by_cost[cost] -= 1
+        cost_lots = self._lots_by_cost[cost]
+        if len(cost_lots) > 2 * self._live_lots_by_cost[cost] + 8:
+            self._lots_by_cost[cost] = deque(
+                each_lot for each_lot in cost_lots if each_lot.quantity > 0
+            )
+
+    def lots_at(self, cost: float) -> deque:  # O(1) amortized
+        """Returns the StockLots of cost, oldest first, dropping those already emptied from the left."""
+        cost_lots = self._lots_by_cost[cost]
+        while cost_lots and cost_lots[0].quantity == 0:
+            cost_lots.popleft()
+        return cost_lots
+
+    def copy(self, lot_copies: dict) -> "CostIndex":  # O(lots + n log n)
+        """Returns a CostIndex of the same costs and shares, holding at each cost the copies (lot_copies, by id of a lot in the deque) of its lots, in the same order; lots that already left the deque are left out, as they hold no shares."""
+        index_copy = CostIndex()
+        index_copy._shares_by_cost = dict(self._shares_by_cost)
+        index_copy._lots_by_cost = {
+            cost: deque(
+                lot_copies[id(each_lot)]
+                for each_lot in cost_lots
+                if id(each_lot) in lot_copies
+            )
+            for cost, cost_lots in self._lots_by_cost.items()
+        }
+        index_copy._live_lots_by_cost = dict(self._live_lots_by_cost)
+        index_copy._levels = self._levels.copy()
+        return index_copy
+
+    def lowest_cost(self) -> float:  # O(1)
+        return self._levels.lowest()
+
+    def highest_cost(self) -> float:  # O(1)
+        return self._levels.highest()
+
+    def median(self) -> float:  # O(log n)
+        """Returns the lower median cost over shares."""
+        return self._levels.select((self._levels.number_of_shares - 1) // 2)
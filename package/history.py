@@ -0,0 +1,276 @@
+import mmap
+import os
+import shutil
+from array import array
+from collections.abc import Iterable, Iterator
+from package.lot_stock_sale import LotStockSale
+from package.snapshot import sales_arrays, sales_from_arrays
+
+
+class SpilledSeries:
+    """SpilledSeries is an append-only series of numbers (as an array of typecode) that keeps only its most recent values in memory: once 2 * window values are held, all but the last window are appended to the spill file at path (created, so it must not exist yet: FileExistsError otherwise; read back through mmap), or dropped when path is None, so memory stays bounded however long the series grows.\n\nIndices count every value ever appended, so series[i] stays the same value as long as it can be read, and reading a dropped value raises IndexError; iteration and tolist cover the values from first_index on (all of them, when spilled)."""
+
+    def __init__(
+        self,
+        typecode: str = "d",
+        window: int = 1 << 16,
+        path: str | os.PathLike | None = None,
+        values: Iterable = (),
+    ) -> None:
+        self.typecode = typecode
+        self.itemsize = array(typecode).itemsize
+        self.window = window
+        self.path = None if path is None else os.fspath(path)
+        self.first_index = 0  # number of values dropped
+        self._memory = array(typecode)
+        self._spilled = 0  # number of values in the spill file
+        self._spill_file = None if path is None else open(path, "x+b")
+        self._mmap = None
+        self._mapped = 0  # number of values _mmap covers
+        self.extend(values)
+
+    def __len__(self) -> int:  # O(1)
+        return self.first_index + self._spilled + len(self._memory)
+
+    def append(self, value) -> None:  # O(1) amortized
+        self._memory.append(value)
+        if len(self._memory) >= 2 * self.window:
+            self._spill(len(self._memory) - self.window)
+
+    def extend(self, values: Iterable) -> None:  # O(len(values)) amortized
+        self._memory.extend(values)
+        if len(self._memory) >= 2 * self.window:
+            self._spill(len(self._memory) - self.window)
+
+    def _spill(self, count: int) -> None:  # O(count)
+        if self._spill_file is None:
+            self.first_index += count
+        else:
+            self._spill_file.write(self._memory[:count].tobytes())
+            self._spill_file.flush()
+            self._spilled += count
+        del self._memory[:count]
+
+    def _read_spilled(self, start: int, stop: int) -> array:  # O(stop - start)
+        """Returns values start to stop of the spill file, mapping it again if it grew since last mapped."""
+        if stop > self._mapped:
+            if self._mmap is not None:
+                self._mmap.close()
+            self._mmap = mmap.mmap(
+                self._spill_file.fileno(),
+                self._spilled * self.itemsize,
+                access=mmap.ACCESS_READ,
+            )
+            self._mapped = self._spilled
+        values = array(self.typecode)
+        values.frombytes(
+            self._mmap[start * self.itemsize : stop * self.itemsize]
+        )
+        return values
+
+    def _values(self, start: int, stop: int) -> array:  # O(stop - start)
+        if start < self.first_index:
+            raise IndexError(
+                f"values before {self.first_index} were dropped (no spill"
+                " file)"
+            )
+        memory_start = self.first_index + self._spilled
+        if start >= memory_start:
+            return self._memory[start - memory_start : stop - memory_start]
+        values = self._read_spilled(
+            start - self.first_index, min(stop, memory_start) - self.first_index
+        )
+        if stop > memory_start:
+            values.extend(self._memory[: stop - memory_start])
+        return values
+
+    def __getitem__(self, index: int | slice):  # O(1), or O(len(slice))
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return self._values(start, max(start, stop))[::step]
+            return self._values(start, max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("series index out of range")
+        memory_start = self.first_index + self._spilled
+        if index >= memory_start:
+            return self._memory[index - memory_start]
+        return self._values(index, index + 1)[0]
+
+    def __iter__(self) -> Iterator:  # O(window) memory
+        length = len(self)
+        chunk_size = max(self.window, 1 << 12)
+        for chunk_start in range(self.first_index, length, chunk_size):
+            yield from self._values(
+                chunk_start, min(chunk_start + chunk_size, length)
+            )
+
+    def tolist(self) -> list:  # O(N)
+        return self._values(self.first_index, len(self)).tolist()
+
+    def copy(
+        self, path: str | os.PathLike | None = None
+    ) -> "SpilledSeries":  # O(N) on disk, O(window) in memory
+        """Returns a SpilledSeries with the same values, window and first_index as this one, spilling to path (a new file, which gets a copy of the spill file) when this one spills; path is ignored when this one drops values."""
+        if self._spill_file is None:
+            path = None
+        elif path is None:
+            raise ValueError("a spilling series needs a path to copy to")
+        series_copy = SpilledSeries(self.typecode, self.window, path)
+        series_copy.first_index = self.first_index
+        if self._spill_file is not None:
+            self._spill_file.seek(0)
+            shutil.copyfileobj(self._spill_file, series_copy._spill_file)
+            series_copy._spill_file.flush()
+            series_copy._spilled = self._spilled
+        series_copy._memory = array(self.typecode, self._memory)
+        return series_copy
+
+    def close(self) -> None:  # O(1)
+        """Closes the spill file (the series can no longer be read or grown past its memory)."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+            self._mapped = 0
+        if self._spill_file is not None:
+            self._spill_file.close()
+
+
+class SaleHistory:
+    """SaleHistory is an append-only list of sales (LotStockSales) that keeps only the most recent in memory, as SpilledSeries does: older sales are appended to spill files in directory (created, as for SpilledSeries, so one directory holds one SaleHistory), as the arrays of snapshot.sales_arrays (one SpilledSeries per array, plus where each sale's runs start), and rebuilt when read; or dropped when directory is None.\n\nIndices count every sale ever appended; pop removes the last sale, which is always in memory."""
+
+    _COLUMNS = {
+        "sale_symbol_ids": "q",
+        "sale_quantities": "q",
+        "sale_prices": "d",
+        "sale_total_costs": "d",
+        "sale_run_counts": "q",
+        "sale_run_starts": "q",
+        "sale_run_costs": "d",
+        "sale_run_quantities": "q",
+    }
+
+    def __init__(
+        self,
+        window: int = 1 << 12,
+        directory: str | os.PathLike | None = None,
+        sales: Iterable[LotStockSale] = (),
+    ) -> None:
+        self.window = window
+        self.first_index = 0  # number of sales dropped
+        self.symbols = []  # of spilled sales, indexed by sale_symbol_ids
+        self._memory = []
+        self._columns = (
+            None
+            if directory is None
+            else {
+                name: SpilledSeries(
+                    typecode, 0, os.path.join(directory, f"{name}.spill")
+                )
+                for name, typecode in SaleHistory._COLUMNS.items()
+            }
+        )
+        self._runs_spilled = 0
+        for each_sale in sales:
+            self.append(each_sale)
+
+    def __len__(self) -> int:  # O(1)
+        if self._columns is None:
+            return self.first_index + len(self._memory)
+        return len(self._columns["sale_symbol_ids"]) + len(self._memory)
+
+    def append(self, sale: LotStockSale) -> None:  # O(1) amortized
+        self._memory.append(sale)
+        if len(self._memory) >= 2 * self.window:
+            self._spill(len(self._memory) - self.window)
+
+    def pop(self) -> LotStockSale:  # O(1)
+        return self._memory.pop()
+
+    def _spill(self, count: int) -> None:  # O(sale lots spilled)
+        spilled_sales = self._memory[:count]
+        del self._memory[:count]
+        if self._columns is None:
+            self.first_index += count
+            return
+        known_symbols = set(self.symbols)
+        for each_sale in spilled_sales:
+            if each_sale.symbol not in known_symbols:
+                known_symbols.add(each_sale.symbol)
+                self.symbols.append(each_sale.symbol)
+        spilled = sales_arrays(spilled_sales, self.symbols)
+        spilled["sale_run_starts"] = array("q")
+        for run_count in spilled["sale_run_counts"]:
+            spilled["sale_run_starts"].append(self._runs_spilled)
+            self._runs_spilled += run_count
+        for name, each_column in self._columns.items():
+            each_column.extend(spilled[name])
+
+    def _spilled_sale(self, index: int) -> LotStockSale:  # O(its runs)
+        columns = self._columns
+        run_start = columns["sale_run_starts"][index]
+        run_stop = run_start + columns["sale_run_counts"][index]
+        return sales_from_arrays(
+            {
+                "sale_symbol_ids": [columns["sale_symbol_ids"][index]],
+                "sale_quantities": [columns["sale_quantities"][index]],
+                "sale_prices": [columns["sale_prices"][index]],
+                "sale_total_costs": [columns["sale_total_costs"][index]],
+                "sale_run_counts": [run_stop - run_start],
+                "sale_run_costs": columns["sale_run_costs"][run_start:run_stop],
+                "sale_run_quantities": columns["sale_run_quantities"][
+                    run_start:run_stop
+                ],
+            },
+            self.symbols,
+        )[0]
+
+    def __getitem__(self, index: int | slice):  # O(1), or O(len(slice))
+        if isinstance(index, slice):
+            return [self[s_i] for s_i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("sale index out of range")
+        memory_start = len(self) - len(self._memory)
+        if index >= memory_start:
+            return self._memory[index - memory_start]
+        if self._columns is None:
+            raise IndexError(
+                f"sales before {self.first_index} were dropped (no spill"
+                " directory)"
+            )
+        return self._spilled_sale(index)
+
+    def __iter__(self) -> Iterator[LotStockSale]:  # O(1) memory per sale
+        memory_start = len(self) - len(self._memory)
+        for s_i in range(self.first_index, memory_start):
+            yield self._spilled_sale(s_i)
+        yield from list(self._memory)
+
+    def copy(
+        self, directory: str | os.PathLike | None = None
+    ) -> "SaleHistory":  # O(N) on disk, O(window) in memory
+        """Returns a SaleHistory with the same sales, window and first_index as this one, spilling to directory (copies of the spill files) when this one spills; directory is ignored when this one drops sales."""
+        if self._columns is not None and directory is None:
+            raise ValueError("a spilling history needs a directory to copy to")
+        history_copy = SaleHistory(self.window)
+        history_copy.first_index = self.first_index
+        history_copy.symbols = list(self.symbols)
+        history_copy._memory = list(self._memory)
+        if self._columns is not None:
+            history_copy._columns = {
+                name: each_column.copy(
+                    os.path.join(directory, f"{name}.spill")
+                )
+                for name, each_column in self._columns.items()
+            }
+        history_copy._runs_spilled = self._runs_spilled
+        return history_copy
+
+    def close(self) -> None:  # O(1)
+        if self._columns is not None:
+            for each_column in self._columns.values():
+                each_column.close()
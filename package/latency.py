@@ -0,0 +1,172 @@
+import csv
+import json
+import os
+from typing import TextIO
+
+
+class LatencyHistogram:
+    """LatencyHistogram counts latencies (in nanoseconds) in log-linear buckets: exact below 64 ns, then 32 buckets per power of 2, so a percentile is within about 3% of the latency it reports, in O(1) memory per power of 2 recorded."""
+
+    SUB_BUCKET_BITS = 5
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS  # buckets per power of 2
+
+    def __init__(self) -> None:
+        self.counts = {}  # bucket index -> number of latencies
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def __len__(self) -> int:  # O(1)
+        return self.count
+
+    @staticmethod
+    def bucket_index(latency_ns: int) -> int:  # O(1)
+        if latency_ns < 2 * LatencyHistogram.SUB_BUCKETS:
+            return latency_ns
+        exponent = (
+            latency_ns.bit_length() - LatencyHistogram.SUB_BUCKET_BITS - 1
+        )
+        return LatencyHistogram.SUB_BUCKETS * exponent + (
+            latency_ns >> exponent
+        )
+
+    @staticmethod
+    def bucket_high(index: int) -> int:  # O(1)
+        """Returns the greatest latency counted in the bucket at index."""
+        if index < 2 * LatencyHistogram.SUB_BUCKETS:
+            return index
+        exponent = index // LatencyHistogram.SUB_BUCKETS - 1
+        mantissa = index % LatencyHistogram.SUB_BUCKETS
+        return ((LatencyHistogram.SUB_BUCKETS + mantissa + 1) << exponent) - 1
+
+    def record(self, latency_ns: int) -> None:  # O(1)
+        index = LatencyHistogram.bucket_index(latency_ns)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total_ns += latency_ns
+        if latency_ns > self.max_ns:
+            self.max_ns = latency_ns
+
+    def merge(self, other: "LatencyHistogram") -> None:  # O(buckets)
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentile(self, percent: float) -> int:  # O(buckets)
+        """Returns the latency (ns) at or below which percent of latencies are, rounded up to its bucket (and at most max_ns); 0 when empty."""
+        if self.count == 0:
+            return 0
+        rank = max(1, -(-self.count * percent // 100))  # ceiling
+        counted = 0
+        for index in sorted(self.counts):
+            counted += self.counts[index]
+            if counted >= rank:
+                return min(LatencyHistogram.bucket_high(index), self.max_ns)
+        return self.max_ns
+
+    def p50(self) -> int:  # O(buckets)
+        return self.percentile(50)
+
+    def p99(self) -> int:  # O(buckets)
+        return self.percentile(99)
+
+    def mean(self) -> float:  # O(1)
+        return self.total_ns / self.count if self.count else 0.0
+
+    def summary(self) -> dict:  # O(buckets)
+        return {
+            "count": self.count,
+            "mean_ns": self.mean(),
+            "p50_ns": self.p50(),
+            "p99_ns": self.p99(),
+            "max_ns": self.max_ns,
+        }
+
+
+class LatencyRecorder:
+    """LatencyRecorder keeps a LatencyHistogram for each (strategy, stock symbol) recorded (ex: by TradingBot.enable_latency), which are merged by strategy or by symbol for reports and exports."""
+
+    COLUMNS = [
+        "strategy",
+        "symbol",
+        "count",
+        "mean_ns",
+        "p50_ns",
+        "p99_ns",
+        "max_ns",
+    ]
+
+    def __init__(self) -> None:
+        self.histograms = {}  # (strategy, stock symbol) -> LatencyHistogram
+
+    def __len__(self) -> int:  # O(1)
+        return len(self.histograms)
+
+    def record(
+        self, strategy: str, stock_symbol: str, latency_ns: int
+    ) -> None:  # O(1)
+        key = (strategy, stock_symbol)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = LatencyHistogram()
+        histogram.record(latency_ns)
+
+    def clear(self) -> None:  # O(1)
+        self.histograms = {}
+
+    def _merged(self, key_index: int) -> dict[str, LatencyHistogram]:
+        merged = {}
+        for key, histogram in self.histograms.items():
+            if key[key_index] not in merged:
+                merged[key[key_index]] = LatencyHistogram()
+            merged[key[key_index]].merge(histogram)
+        return merged
+
+    def by_strategy(self) -> dict[str, LatencyHistogram]:  # O(histograms)
+        return self._merged(0)
+
+    def by_symbol(self) -> dict[str, LatencyHistogram]:  # O(histograms)
+        return self._merged(1)
+
+    def rows(self) -> list[dict]:  # O(histograms)
+        """Returns one summary row per strategy and stock symbol, then per strategy (symbol "*"), then per symbol (strategy "*")."""
+        keyed_histograms = list(self.histograms.items())
+        keyed_histograms += [
+            ((strategy, "*"), histogram)
+            for strategy, histogram in self.by_strategy().items()
+        ]
+        keyed_histograms += [
+            (("*", stock_symbol), histogram)
+            for stock_symbol, histogram in self.by_symbol().items()
+        ]
+        return [
+            {"strategy": strategy, "symbol": stock_symbol}
+            | histogram.summary()
+            for (strategy, stock_symbol), histogram in keyed_histograms
+        ]
+
+    def display_report(self) -> None:  # O(histograms)
+        for each_row in self.rows():
+            print(
+                f"{each_row['strategy']:>14} {each_row['symbol']:>6}:"
+                f" n={each_row['count']}, p50={each_row['p50_ns']} ns,"
+                f" p99={each_row['p99_ns']} ns, max={each_row['max_ns']} ns"
+            )
+
+    def to_json(self, destination: str | os.PathLike | TextIO) -> None:
+        if isinstance(destination, (str, os.PathLike)):
+            with open(destination, "w", encoding="utf-8") as each_file:
+                return self.to_json(each_file)
+        json.dump(self.rows(), destination, indent=1)
+
+    def to_csv(self, destination: str | os.PathLike | TextIO) -> None:
+        if isinstance(destination, (str, os.PathLike)):
+            with open(
+                destination, "w", encoding="utf-8", newline=""
+            ) as each_file:
+                return self.to_csv(each_file)
+        csv_writer = csv.DictWriter(destination, LatencyRecorder.COLUMNS)
+        csv_writer.writeheader()
+        csv_writer.writerows(self.rows())
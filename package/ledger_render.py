@@ -0,0 +1,71 @@
+import sys
+import time
+from typing import TextIO
+from package.snapshot import entry_runs
+
+
+class LedgerRenderer:
+    """LedgerRenderer writes a StockLedger, as display_ledger shows it, to any text stream (sys.stdout by default) in one buffered write per ledger, instead of a print per share; each entry is read iteratively (see snapshot.entry_runs: runs() of a LotLedgerEntry, one turn of increment_entry of a LedgerEntry), so large entries render without LinkedDeque's recursive display.\n\nper_share: one line per share (ex: "AAPL: 20.0"), instead of display_ledger's one line per entry, with its shares grouped into runs of (cost, quantity).\n\nevery, min_interval: throttle Display directives (see due) during long replays: only every n-th call renders (0: none do), and none within min_interval seconds of the last render; calls skipped are counted in skipped."""
+
+    HEADER = "----  Stock Ledger  ----"
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        per_share: bool = False,
+        every: int = 1,
+        min_interval: float = 0.0,
+    ) -> None:
+        self.stream = stream
+        self.per_share = per_share
+        self.every = every
+        self.min_interval = min_interval
+        self.calls = 0
+        self.skipped = 0
+        self._last_render = None  # time.perf_counter() of the last render
+
+    def entry_lines(self, entry) -> list[str]:  # O(runs), O(shares) in lines
+        if len(entry) == 0:
+            return [f"{entry.symbol}: None"]
+        runs = entry_runs(entry)
+        if self.per_share:
+            lines = []
+            for cost, quantity in runs:
+                lines.extend([f"{entry.symbol}: {cost}"] * quantity)
+            return lines
+        return [
+            f"{entry.symbol}: "
+            + "".join(
+                f"{cost} ({quantity} shares)   " for cost, quantity in runs
+            )
+        ]
+
+    def render(self, stock_ledger) -> str:  # O(entries + lines)
+        """Returns the text write writes for stock_ledger."""
+        lines = [LedgerRenderer.HEADER]
+        for each_entry in stock_ledger.ledger_entries:
+            lines.extend(self.entry_lines(each_entry))
+        lines.append("")
+        return "\n".join(lines)
+
+    def write(self, stock_ledger) -> None:  # O(entries + lines)
+        """Writes stock_ledger to the stream in one write."""
+        stream = sys.stdout if self.stream is None else self.stream
+        stream.write(self.render(stock_ledger))
+
+    def due(self) -> bool:  # O(1)
+        """Counts one Display directive, and returns whether it should be rendered (see every and min_interval); calls not due are counted in skipped."""
+        self.calls += 1
+        now = time.perf_counter()
+        if (
+            self.every < 1
+            or self.calls % self.every != 0
+            or (
+                self._last_render is not None
+                and now - self._last_render < self.min_interval
+            )
+        ):
+            self.skipped += 1
+            return False
+        self._last_render = now
+        return True
@@ -0,0 +1,151 @@
+import asyncio
+import contextlib
+from collections.abc import AsyncIterable, AsyncIterator
+from package.order_stream import OrderStreamReport, parse_order
+
+
+class LiveUpdate:
+    """LiveUpdate is what a LiveFeed publishes to its subscribers after each micro-batch of orders: the number of orders (Display directives included) in the batch and applied so far, and the TradingBot's balance, profit and revenue after the batch."""
+
+    def __init__(
+        self,
+        batch_size: int,
+        orders_applied: int,
+        balance: float,
+        profit: float,
+        revenue: float,
+    ) -> None:
+        self.batch_size = batch_size
+        self.orders_applied = orders_applied
+        self.balance = balance
+        self.profit = profit
+        self.revenue = revenue
+
+    def __str__(self) -> str:
+        return (
+            f"LiveUpdate: {self.orders_applied} orders"
+            f" (+{self.batch_size}), balance {self.balance:.2f},"
+            f" profit {self.profit:.2f}, revenue {self.revenue:.2f}"
+        )
+
+
+class LiveFeed:
+    """LiveFeed runs a TradingBot (with its buy and sell settings) against a live order feed: an async iterable of lines (str or bytes, ex: an asyncio.StreamReader, see run_connection) or of orders as iter_orders yields them.\n\nOrders are read into a queue of at most max_queue orders, so a fast feed waits (backpressure) rather than growing memory; whatever has queued up is applied as one micro-batch of up to max_batch orders (TradingBot.apply_orders, run in the event loop's default executor, one batch at a time, so the feed keeps being read and subscribers keep being served while a batch is applied), after which a LiveUpdate is put on each subscriber's queue without waiting: when a subscriber's queue is full its oldest update is dropped (counted in dropped_updates), so a slow subscriber never holds up ingestion. When the feed ends, subscribers get None."""
+
+    _END = object()  # put on the order queue by the reader when the feed ends
+
+    def __init__(
+        self, trading_bot, max_queue: int = 1024, max_batch: int = 256
+    ) -> None:
+        self.trading_bot = trading_bot
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.report = OrderStreamReport()
+        self.orders_applied = 0
+        self.number_of_batches = 0
+        self.dropped_updates = 0
+        self._subscribers = []
+
+    def subscribe(self, max_updates: int = 64) -> asyncio.Queue:  # O(1)
+        """Returns a new queue of at most max_updates LiveUpdates, which gets one after each micro-batch, and None when the feed ends."""
+        updates = asyncio.Queue(max_updates)
+        self._subscribers.append(updates)
+        return updates
+
+    def unsubscribe(self, updates: asyncio.Queue) -> None:  # O(subscribers)
+        self._subscribers.remove(updates)
+
+    @staticmethod
+    async def iter_updates(
+        updates: asyncio.Queue,
+    ) -> AsyncIterator[LiveUpdate]:  # O(1) per update
+        """Yields the LiveUpdates of a queue from subscribe, until the feed ends."""
+        while (each_update := await updates.get()) is not None:
+            yield each_update
+
+    def _publish(self, update: LiveUpdate | None) -> None:  # O(subscribers)
+        for each_queue in self._subscribers:
+            if each_queue.full():
+                each_queue.get_nowait()
+                self.dropped_updates += 1
+            each_queue.put_nowait(update)
+
+    async def _read(
+        self, source: AsyncIterable, orders: asyncio.Queue
+    ) -> None:  # O(1) memory
+        line_number = 0
+        try:
+            async for each_item in source:
+                if isinstance(each_item, (str, bytes)):
+                    line_number += 1
+                    each_item = parse_order(
+                        each_item, self.report, line_number
+                    )
+                    if each_item is None:
+                        continue
+                await orders.put(each_item)  # waits while the queue is full
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            await orders.put(LiveFeed._END)
+            raise
+        await orders.put(LiveFeed._END)
+
+    async def _apply(
+        self, orders: asyncio.Queue, display_bool: bool
+    ) -> None:  # O(f(N)) per order
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await orders.get()]
+            while len(batch) < self.max_batch and not orders.empty():
+                batch.append(orders.get_nowait())
+            feed_ended = batch[-1] is LiveFeed._END
+            if feed_ended:
+                batch.pop()
+            if batch:
+                await loop.run_in_executor(
+                    None, self.trading_bot.apply_orders, batch, display_bool
+                )
+                self.orders_applied += len(batch)
+                self.number_of_batches += 1
+                self._publish(
+                    LiveUpdate(
+                        len(batch),
+                        self.orders_applied,
+                        self.trading_bot.balance,
+                        self.trading_bot.profit(),
+                        self.trading_bot.revenue(),
+                    )
+                )
+            if feed_ended:
+                return
+            await asyncio.sleep(0)  # lets the reader and subscribers run
+
+    async def run(
+        self, source: AsyncIterable, display_bool: bool = False
+    ) -> OrderStreamReport:  # O(N) time, O(max_queue) memory
+        """Applies every order of source as it arrives, until source ends, and returns the OrderStreamReport of lines read (malformed lines are counted and skipped)."""
+        orders = asyncio.Queue(self.max_queue)
+        reader = asyncio.create_task(self._read(source, orders))
+        try:
+            await self._apply(orders, display_bool)
+        except BaseException:
+            reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await reader
+            raise
+        finally:
+            self._publish(None)
+        await reader  # raises what the reader raised, if anything
+        return self.report
+
+    async def run_connection(
+        self, host: str, port: int, display_bool: bool = False
+    ) -> OrderStreamReport:  # O(N) time, O(max_queue) memory
+        """Same as run, for the lines sent over a TCP connection to host and port, until it is closed."""
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            return await self.run(reader, display_bool)
+        finally:
+            writer.close()
+            await writer.wait_closed()
@@ -0,0 +1,386 @@
+from package.cost_index import CostIndex
+from package.linked_deque import LinkedDeque
+from package.stock_purchase import StockPurchase
+
+
+class StockLot:
+    """StockLot is a run of shares of one stock bought at the same cost_per_share, held as a single StockPurchase and a quantity."""
+
+    def __init__(self, purchase: StockPurchase, quantity: int) -> None:
+        self.purchase = purchase
+        self.cost = purchase.cost
+        self.quantity = quantity
+
+    def __str__(self) -> str:
+        return f"{self.purchase} ({self.quantity} shares)"
+
+    def __lt__(self, other) -> bool:
+        return self.cost < other.cost
+
+
+class LotLedgerEntry:
+    """LotLedgerEntry has the methods of LedgerEntry, but its deque holds StockLots (runs of cost_per_share, quantity) instead of one StockPurchase per share, so memory and time grow with the number of distinct runs rather than the number of shares. Each share-wise method behaves as if the runs were expanded into single shares; a run is split when only part of it is moved or sold.
+
+    cost_index: when True, a CostIndex of cost levels is kept in step with the deque, so the lowest or highest cost shares can be sold in O(log n) per cost level (see remove_lowest_cost), median() is O(log n) and median_2() is O(1). Lots sold this way from the middle of the deque are left in place with quantity 0 and dropped when they reach the front or back, or when they outnumber the other lots.
+
+    deque_type: the deque class holding the lots, LinkedDeque or RingDeque (any class with the methods of LinkedDeque)."""
+
+    def __init__(
+        self,
+        stock_symbol: str,
+        cost_index: bool = False,
+        deque_type: type = LinkedDeque,
+    ) -> None:
+        self.symbol = stock_symbol
+        self._linked_deque = deque_type(None, "back")
+        self._number_of_shares = 0
+        self._empty_lots = 0  # sold-out lots still in the deque
+        self.cost_index = CostIndex() if cost_index else None
+
+    def __len__(self) -> int:  # O(1), number of shares (not lots)
+        return self._number_of_shares
+
+    def number_of_lots(self) -> int:  # O(1)
+        return len(self._linked_deque) - self._empty_lots
+
+    def _count_scan(self, lots: int, comparisons: int = 0) -> None:  # O(1)
+        """Called once per walk of the deque with the lots stepped over and the costs compared; does nothing here, and counts traversals and comparisons in an entry type from operation_counts.counting_entry_type."""
+
+    def _sorted_lots(self, lots) -> list[StockLot]:  # O(lots log lots)
+        return sorted(lots)
+
+    def _live_lots(self):  # O(lots)
+        return (
+            each_lot for each_lot in self._linked_deque if each_lot.quantity > 0
+        )
+
+    def _count_shares(self, cost: float, quantity: int) -> None:  # O(log n)
+        self._number_of_shares += quantity
+        if self.cost_index is not None:
+            if quantity > 0:
+                self.cost_index.add_shares(cost, quantity)
+            else:
+                self.cost_index.remove_shares(cost, -quantity)
+
+    def _place_lot(
+        self, lot: StockLot, to_front: bool = False, moved: bool = False
+    ) -> None:  # O(1)
+        """Adds lot to one end of the deque, merging it into the end lot if that lot has the same cost. Does not count shares. moved: lot was already in the deque (and in cost_index)."""
+        if self._linked_deque.is_empty():
+            end_lot = None
+        elif to_front:
+            end_lot = self._linked_deque.get_front()
+        else:
+            end_lot = self._linked_deque.get_back()
+        if end_lot is not None and end_lot.cost == lot.cost:
+            end_lot.quantity += lot.quantity
+            if moved:
+                self._discard_lot(lot)
+            return
+        if to_front:
+            self._linked_deque.add_to_front(lot)
+        else:
+            self._linked_deque.add_to_back(lot)
+        if self.cost_index is not None and not moved:
+            self.cost_index.add_lot(lot)
+
+    def _discard_lot(self, lot: StockLot) -> None:  # O(1)
+        """Marks a lot that has left the deque, or was merged into another lot, as empty."""
+        if self.cost_index is not None and lot.quantity > 0:
+            self.cost_index.discard_lot(lot.cost)
+        lot.quantity = 0
+
+    def _trim(self) -> None:  # O(1) amortized
+        """Drops sold-out lots from the front and back, so the front and back lots always hold shares."""
+        while (
+            not self._linked_deque.is_empty()
+            and self._linked_deque.get_front().quantity == 0
+        ):
+            self._linked_deque.remove_front()
+            self._empty_lots -= 1
+        while (
+            not self._linked_deque.is_empty()
+            and self._linked_deque.get_back().quantity == 0
+        ):
+            self._linked_deque.remove_back()
+            self._empty_lots -= 1
+
+    def _compact(self) -> None:  # O(lots)
+        """Removes sold-out lots from the middle of the deque, keeping the order of the others."""
+        for l_i in range(len(self._linked_deque)):
+            each_lot = self._linked_deque.remove_front()
+            if each_lot.quantity > 0:
+                self._linked_deque.add_to_back(each_lot)
+        self._empty_lots = 0
+
+    def copy_to(self, entry: "LotLedgerEntry") -> None:  # O(lots)
+        """Fills entry (a new LotLedgerEntry of the same stock symbol) with copies of the lots of this one, in the same deque order, sold-out lots included, and with a copy of its CostIndex, so entry then behaves exactly as this one would."""
+        lot_copies = {}  # id of a lot in the deque -> its copy
+        for each_lot in self._linked_deque:
+            lot_copies[id(each_lot)] = StockLot(
+                each_lot.purchase, each_lot.quantity
+            )
+            entry._linked_deque.add_to_back(lot_copies[id(each_lot)])
+        entry._number_of_shares = self._number_of_shares
+        entry._empty_lots = self._empty_lots
+        entry.cost_index = (
+            None
+            if self.cost_index is None
+            else self.cost_index.copy(lot_copies)
+        )
+
+    def add_purchase(
+        self, new_purchase: StockPurchase, quantity: int = 1
+    ) -> None:  # O(1)
+        if quantity <= 0:
+            return
+        self._count_shares(new_purchase.cost, quantity)
+        self._place_lot(StockLot(new_purchase, quantity))
+
+    def add_purchase_front(
+        self, new_purchase: StockPurchase, quantity: int = 1
+    ) -> None:  # O(1)
+        if quantity <= 0:
+            return
+        self._count_shares(new_purchase.cost, quantity)
+        self._place_lot(StockLot(new_purchase, quantity), to_front=True)
+
+    def peek(self) -> StockPurchase:  # O(1)
+        return self._linked_deque.get_front().purchase
+
+    def peek_back(self) -> StockPurchase:  # O(1)
+        return self._linked_deque.get_back().purchase
+
+    def peek_lot(self) -> StockLot:  # O(1)
+        return self._linked_deque.get_front()
+
+    def peek_back_lot(self) -> StockLot:  # O(1)
+        return self._linked_deque.get_back()
+
+    def _rotate_lots(self, lots: int) -> None:  # O(1) to O(lots)
+        """Moves lots whole lots (sold-out ones included) from the front to the back, without merging: in one rotate call when the deque has one (RingDeque), otherwise one front_to_back per lot."""
+        if hasattr(self._linked_deque, "rotate"):
+            self._linked_deque.rotate(lots)
+        else:
+            for l_i in range(lots):
+                self._linked_deque.front_to_back()
+        self._trim()
+
+    def _rotate_until(self, is_front) -> None:  # O(lots)
+        """Rotates whole lots, front to back, until is_front(back_lot, front_lot) holds, or one full turn (which leaves the lots in order). The lots are scanned once, then rotated in one _rotate_lots call, rather than checked again after each lot is moved."""
+        live_lots = [
+            (l_i, each_lot)
+            for l_i, each_lot in enumerate(self._linked_deque)
+            if each_lot.quantity > 0
+        ]
+        for r_i in range(len(live_lots)):
+            if is_front(live_lots[r_i - 1][1], live_lots[r_i][1]):
+                self._count_scan(len(self._linked_deque), r_i + 1)
+                self._rotate_lots(live_lots[r_i][0])
+                return
+        self._count_scan(len(self._linked_deque), len(live_lots))
+
+    def increment_entry(self, shares: int = 1) -> None:  # O(lots moved)
+        """Moves shares from the front to the back, the same as calling LedgerEntry.increment_entry() shares times."""
+        if self._number_of_shares == 0:
+            return
+        shares %= self._number_of_shares  # a full cycle leaves the deque as-is
+        lots_moved = 0
+        while shares > 0:
+            lots_moved += 1
+            front_lot = self._linked_deque.get_front()
+            if front_lot.quantity <= shares:
+                shares -= front_lot.quantity
+                self._linked_deque.remove_front()
+                self._trim()
+                self._place_lot(front_lot, moved=True)
+            else:  # split the front lot
+                front_lot.quantity -= shares
+                self._place_lot(StockLot(front_lot.purchase, shares))
+                shares = 0
+        self._count_scan(lots_moved)
+
+    def decrement_entry(self, shares: int = 1) -> None:  # O(lots moved)
+        """Moves shares from the back to the front, the same as calling LedgerEntry.decrement_entry() shares times."""
+        if self._number_of_shares == 0:
+            return
+        shares %= self._number_of_shares
+        lots_moved = 0
+        while shares > 0:
+            lots_moved += 1
+            back_lot = self._linked_deque.get_back()
+            if back_lot.quantity <= shares:
+                shares -= back_lot.quantity
+                self._linked_deque.remove_back()
+                self._trim()
+                self._place_lot(back_lot, to_front=True, moved=True)
+            else:  # split the back lot
+                back_lot.quantity -= shares
+                self._place_lot(
+                    StockLot(back_lot.purchase, shares), to_front=True
+                )
+                shares = 0
+        self._count_scan(lots_moved)
+
+    def rotate_entry(self, shares: int) -> None:  # O(lots moved)
+        """Rotates the entry by shares, front to back (back to front when negative), moving whole lots and splitting at most one. Goes whichever way moves fewer shares, so at most half of the lots are moved however large shares is."""
+        if self._number_of_shares == 0:
+            return
+        shares %= self._number_of_shares
+        if shares <= self._number_of_shares // 2:
+            self.increment_entry(shares)
+        else:
+            self.decrement_entry(self._number_of_shares - shares)
+
+    def remove_purchase(self) -> StockPurchase:  # O(1)
+        return self.remove_lots(1)[0].purchase
+
+    def _take_from_lot(self, lot: StockLot, quantity: int) -> StockLot:  # O(1)
+        """Takes quantity shares out of lot (in the deque), and returns them as a new StockLot."""
+        self._count_shares(lot.cost, -quantity)
+        if lot.quantity == quantity:
+            self._discard_lot(lot)
+            self._empty_lots += 1
+        else:
+            lot.quantity -= quantity
+        return StockLot(lot.purchase, quantity)
+
+    def remove_lots(
+        self, quantity: int, cost: float | None = None
+    ) -> list[StockLot]:  # O(lots removed)
+        """Removes up to quantity shares from the front, stopping early at a share whose cost differs from cost (if cost is given). Returns the removed shares as StockLots, in the order they were removed."""
+        removed = []
+        while quantity > 0 and not self._linked_deque.is_empty():
+            front_lot = self._linked_deque.get_front()
+            if cost is not None and front_lot.cost != cost:
+                break
+            removed.append(
+                self._take_from_lot(
+                    front_lot, min(quantity, front_lot.quantity)
+                )
+            )
+            quantity -= removed[-1].quantity
+            self._trim()
+        return removed
+
+    def remove_lots_back(self, quantity: int) -> list[StockLot]:  # O(lots)
+        """Removes up to quantity shares from the back, as remove_lots does from the front."""
+        removed = []
+        while quantity > 0 and not self._linked_deque.is_empty():
+            back_lot = self._linked_deque.get_back()
+            removed.append(
+                self._take_from_lot(back_lot, min(quantity, back_lot.quantity))
+            )
+            quantity -= removed[-1].quantity
+            self._trim()
+        return removed
+
+    def remove_lowest_cost(self, quantity: int) -> list[StockLot]:
+        """Removes quantity shares, lowest cost first, from wherever they are in the deque, and returns them as StockLots. Needs cost_index. O(log n) per cost level."""
+        return self._remove_by_cost(quantity, self.cost_index.lowest_cost)
+
+    def remove_highest_cost(self, quantity: int) -> list[StockLot]:
+        """Removes quantity shares, highest cost first, as remove_lowest_cost does. Needs cost_index. O(log n) per cost level."""
+        return self._remove_by_cost(quantity, self.cost_index.highest_cost)
+
+    def _remove_by_cost(self, quantity: int, next_cost) -> list[StockLot]:
+        removed = []
+        while quantity > 0 and self._number_of_shares > 0:
+            each_lot = self.cost_index.lots_at(next_cost())[0]
+            removed.append(
+                self._take_from_lot(each_lot, min(quantity, each_lot.quantity))
+            )
+            quantity -= removed[-1].quantity
+        self._trim()
+        if self._empty_lots > self.number_of_lots():
+            self._compact()
+        return removed
+
+    def runs(self) -> list[tuple[float, int]]:  # O(lots)
+        """Returns (cost, quantity) for each run of equal cost shares, front to back, merging adjacent lots of equal cost."""
+        out_runs = []
+        for each_lot in self._live_lots():
+            if out_runs and out_runs[-1][0] == each_lot.cost:
+                out_runs[-1] = (
+                    each_lot.cost,
+                    out_runs[-1][1] + each_lot.quantity,
+                )
+            else:
+                out_runs.append((each_lot.cost, each_lot.quantity))
+        return out_runs
+
+    def __eq__(self, other) -> bool:
+        return self.equals(other)
+
+    def equals(self, other) -> bool:  # O(lots)
+        return (
+            isinstance(other, LotLedgerEntry)
+            and self.symbol == other.symbol
+            and self.runs() == other.runs()
+        )
+
+    def display_entry(self) -> None:  # O(lots)
+        if self._number_of_shares == 0:
+            print(f"{self.symbol}: None")
+        else:
+            print(
+                f"{self.symbol}: "
+                + "".join(
+                    f"{cost} ({quantity} shares)   "
+                    for cost, quantity in self.runs()
+                )
+            )
+
+    def position_entry_add_between(
+        self, cost_per_share: float
+    ) -> None:  # O(lots)
+        """Rotates whole lots until adding to the back places cost_per_share between the back and the front (in ascending order)."""
+
+        def is_front(back_lot: StockLot, front_lot: StockLot) -> bool:
+            if back_lot.cost <= cost_per_share <= front_lot.cost:
+                return True
+            return back_lot.cost > front_lot.cost and (
+                cost_per_share >= back_lot.cost
+                or cost_per_share <= front_lot.cost
+            )  # the back and front are the wrap from highest to lowest
+
+        self._rotate_until(is_front)
+
+    def align_head_tail(self) -> None:  # O(lots)
+        """Rotates whole lots until the front is the lowest cost after the highest cost (at the back)."""
+        self._rotate_until(
+            lambda back_lot, front_lot: back_lot.cost > front_lot.cost
+        )
+
+    def position_entry_lowest_cost(self) -> float:  # O(lots)
+        """Rotates the entry the same way sellOptimal_1 does for single shares, and returns the lowest cost: if the front share is a lowest cost share, one share is moved to the back, otherwise the entry is rotated to the first lot of lowest cost."""
+        lowest_cost = min(each_lot.cost for each_lot in self._live_lots())
+        self._count_scan(len(self._linked_deque), self.number_of_lots())
+        if self._linked_deque.get_front().cost == lowest_cost:
+            self.increment_entry()
+        else:
+            self._rotate_until(
+                lambda back_lot, front_lot: front_lot.cost == lowest_cost
+            )
+        return lowest_cost
+
+    def median(self) -> float:  # O(log n) with cost_index, else O(lots)
+        """Returns the lower median cost over shares."""
+        if self.cost_index is not None:
+            return self.cost_index.median()
+        self._count_scan(len(self._linked_deque))
+        lots_by_cost = self._sorted_lots(self._live_lots())
+        shares_below = 0
+        for each_lot in lots_by_cost:
+            shares_below += each_lot.quantity
+            if shares_below > (self._number_of_shares - 1) // 2:
+                return each_lot.cost
+
+    def median_2(self) -> float:  # O(1) with cost_index, else O(lots)
+        if self.cost_index is not None:
+            return (
+                self.cost_index.highest_cost() - self.cost_index.lowest_cost()
+            ) / 2 + self.cost_index.lowest_cost()
+        costs = [each_lot.cost for each_lot in self._live_lots()]
+        self._count_scan(len(self._linked_deque), 2 * len(costs) - 2)
+        return (max(costs) - min(costs)) / 2 + min(costs)
@@ -0,0 +1,78 @@
+import math
+from package.lot_ledger_entry import StockLot
+from package.stock_purchase import StockPurchase
+from package.stock_sale import StockSale
+
+
+def _repeated_sum(total: float, addend: float, count: int) -> float:
+    """Returns total with addend added count times, one addition at a time, so rounded exactly as that loop would be (not as total + addend * count), in O(binades of total crossed) rather than O(count): within one binade, once two additions in a row add the same step, every further addition adds that step, until the sums reach the next binade."""
+    while count > 0:
+        if count < 3 or addend <= 0 or total < 0:
+            for c_i in range(count):
+                total += addend
+            return total
+        first = total + addend
+        second = first + addend
+        count -= 2
+        step = second - first
+        if (
+            step == first - total
+            and step > 0
+            and math.frexp(first)[1] == math.frexp(second)[1]
+        ):
+            binade_top = math.ldexp(1.0, math.frexp(second)[1])
+            jump = min(count, int((binade_top - second) // step) - 2)
+            if jump > 0:  # with room for the rounding of one more addition
+                second += jump * step
+                count -= jump
+        elif step == 0 and first == total:  # addend is lost in rounding
+            return second
+        total = second
+    return total
+
+
+class LotStockSale(StockSale):
+    """LotStockSale is a StockSale that keeps the shares sold as lots (StockLots of consecutive shares of the same cost) with a running total cost, instead of one StockPurchase per share, so len, total_cost, get_profit and is_filled are O(1) and memory grows with the number of lots rather than shares.\n\nshares is still available (and used by __str__), as a list of one StockPurchase per share expanded from the lots."""
+
+    def __init__(self, stock_symbol: str, quantity: int, price: float) -> None:
+        super().__init__(stock_symbol, quantity, price)
+        self.shares = []  # no lots yet
+
+    @property
+    def shares(self) -> list[StockPurchase]:  # O(number of shares)
+        return [
+            each_lot.purchase
+            for each_lot in self.lots
+            for share in range(each_lot.quantity)
+        ]
+
+    @shares.setter
+    def shares(self, shares: list[StockPurchase]) -> None:  # O(len(shares))
+        self.lots = []
+        self._number_of_shares = 0
+        self._total_cost = 0
+        for each_share in shares:
+            self.add_sale(each_share)
+
+    def __len__(self) -> int:  # O(1), number of shares (not lots)
+        return self._number_of_shares
+
+    def add_sale(
+        self, stock: StockPurchase, quantity: int = 1
+    ) -> None:  # O(1) per binade of the total cost
+        """Adds quantity shares of stock to the sale, to its last lot if that has the same cost; the total cost is summed share by share (see _repeated_sum), so it is the same float as StockSale.total_cost of the shares."""
+        if self.lots and self.lots[-1].cost == stock.cost:
+            self.lots[-1].quantity += quantity
+        else:
+            self.lots.append(StockLot(stock, quantity))
+        self._number_of_shares += quantity
+        self._total_cost = _repeated_sum(self._total_cost, stock.cost, quantity)
+
+    def total_cost(self) -> float:  # O(1)
+        return self._total_cost
+
+    def get_profit(self) -> float:  # O(1)
+        return self.price * self._number_of_shares - self._total_cost
+
+    def is_filled(self) -> bool:  # O(1)
+        return self._number_of_shares == self.quantity
@@ -0,0 +1,209 @@
+from functools import cmp_to_key, wraps
+from package.lot_ledger_entry import LotLedgerEntry
+from package.stock_purchase import StockPurchase
+
+OPERATIONS = (
+    "traversals",  # steps over an entry: shares moved by increment_entry and
+    # decrement_entry, or, for lots, lots moved or scanned (_count_scan)
+    "adds",  # shares added
+    "removes",  # shares removed
+    "medians",  # median() and median_2() calls
+    "comparisons",  # StockPurchase <, >, ==, or, for lots, of lot costs
+    "deque_moves",  # front_to_back, back_to_front (lots moved)
+    "deque_adds",  # add_to_back, add_to_front
+    "deque_removes",  # remove_front, remove_back
+)
+# the compiled LedgerEntry keeps its own deque (whatever deque_type), so a
+# per-share ledger has no deque operations to count
+SHARE_OPERATIONS = OPERATIONS[:5]
+
+
+class OperationCounts:
+    """OperationCounts counts operations on ledger entries, their deques, and StockPurchases (see OPERATIONS), by the strategy (StockLedger method, ex: "buyOptimal_2") that caused them, as a machine-independent cost of each strategy; operations outside any strategy (ex: display_ledger) are counted in outside_strategies, not in by_strategy.\n\noperations: the operations reported by per_call, rows and display_report (StockLedger.enable_operation_counts gives SHARE_OPERATIONS to a per-share ledger); traversals and comparisons are steps and comparisons of each ledger's unit of storage, shares or lots, so a lot_based ledger's lower counts are what it saves."""
+
+    def __init__(self, operations: tuple[str, ...] = OPERATIONS) -> None:
+        self.operations = operations
+        self.by_strategy = {}
+        self.outside_strategies = OperationCounts._zeros()
+        self._current = self.outside_strategies
+        self._strategy = None
+
+    @staticmethod
+    def _zeros() -> dict[str, int]:  # O(1)
+        zeros = {each_operation: 0 for each_operation in OPERATIONS}
+        zeros["calls"] = 0
+        return zeros
+
+    def count(self, operation: str, amount: int = 1) -> None:  # O(1)
+        self._current[operation] += amount
+
+    def begin(self, strategy: str) -> bool:  # O(1)
+        """Counts operations under strategy until end(); returns False (and changes nothing) when already inside a strategy, so nested calls count toward the outer one."""
+        if self._strategy is not None:
+            return False
+        if strategy not in self.by_strategy:
+            self.by_strategy[strategy] = OperationCounts._zeros()
+        self._strategy = strategy
+        self._current = self.by_strategy[strategy]
+        self._current["calls"] += 1
+        return True
+
+    def end(self) -> None:  # O(1)
+        self._strategy = None
+        self._current = self.outside_strategies
+
+    def clear(self) -> None:  # O(1)
+        self.__init__(self.operations)
+
+    def totals(self) -> dict[str, int]:  # O(strategies)
+        """Returns the counts of every strategy and outside_strategies."""
+        totals = OperationCounts._zeros()
+        for each_counts in [
+            self.outside_strategies,
+            *self.by_strategy.values(),
+        ]:
+            for each_operation in totals:
+                totals[each_operation] += each_counts[each_operation]
+        return totals
+
+    def per_call(self, strategy: str) -> dict[str, float]:  # O(1)
+        strategy_counts = self.by_strategy[strategy]
+        calls = max(1, strategy_counts["calls"])
+        return {
+            each_operation: strategy_counts[each_operation] / calls
+            for each_operation in self.operations
+        }
+
+    def rows(self) -> list[dict]:  # O(strategies)
+        return [
+            {"strategy": strategy, "calls": strategy_counts["calls"]}
+            | {
+                each_operation: strategy_counts[each_operation]
+                for each_operation in self.operations
+            }
+            for strategy, strategy_counts in self.by_strategy.items()
+        ]
+
+    def display_report(self) -> None:  # O(strategies)
+        for each_row in self.rows():
+            print(
+                f"{each_row['strategy']:>14}: "
+                + ", ".join(
+                    f"{each_operation} {each_row[each_operation]}"
+                    for each_operation in ("calls",) + self.operations
+                )
+            )
+
+
+def _counted(method, counts: OperationCounts, operation: str, amount):
+    """Returns method, counting amount(args, result) of operation in counts for each call (amount is None to count 1)."""
+    count = counts.count
+
+    @wraps(method)
+    def counted_method(self, *args):
+        result = method(self, *args)
+        count(operation, 1 if amount is None else amount(args, result))
+        return result
+
+    return counted_method
+
+
+def _quantity_argument(args, result) -> int:  # O(1)
+    return args[1] if len(args) > 1 else 1
+
+
+def _lots_quantity(args, result) -> int:  # O(lots returned)
+    return sum(each_lot.quantity for each_lot in result)
+
+
+def counting_entry_type(entry_type: type, counts: OperationCounts) -> type:
+    """Returns a subclass of entry_type (LedgerEntry or LotLedgerEntry) that counts traversals, adds, removes and medians in counts (adds and removes as shares, traversals and comparisons of lots as LotLedgerEntry._count_scan reports them)."""
+    methods = {}
+    if issubclass(entry_type, LotLedgerEntry):
+        count = counts.count
+
+        def _count_scan(self, lots: int, comparisons: int = 0) -> None:
+            count("traversals", lots)
+            count("comparisons", comparisons)
+
+        def compare_costs(lot, other_lot) -> int:
+            count("comparisons")
+            return (lot.cost > other_lot.cost) - (lot.cost < other_lot.cost)
+
+        def _sorted_lots(self, lots) -> list:
+            return sorted(lots, key=cmp_to_key(compare_costs))
+
+        methods = {"_count_scan": _count_scan, "_sorted_lots": _sorted_lots}
+        counted_methods = {
+            "add_purchase": ("adds", _quantity_argument),
+            "add_purchase_front": ("adds", _quantity_argument),
+            "remove_lots": ("removes", _lots_quantity),
+            "remove_lots_back": ("removes", _lots_quantity),
+            "remove_lowest_cost": ("removes", _lots_quantity),
+            "remove_highest_cost": ("removes", _lots_quantity),
+        }
+    else:
+        counted_methods = {
+            "increment_entry": ("traversals", None),
+            "decrement_entry": ("traversals", None),
+            "add_purchase": ("adds", None),
+            "add_purchase_front": ("adds", None),
+            "remove_purchase": ("removes", None),
+        }
+    counted_methods["median"] = ("medians", None)
+    counted_methods["median_2"] = ("medians", None)
+    return type(
+        "Counting" + entry_type.__name__,
+        (entry_type,),
+        methods
+        | {
+            method_name: _counted(
+                getattr(entry_type, method_name), counts, operation, amount
+            )
+            for method_name, (operation, amount) in counted_methods.items()
+        },
+    )
+
+
+def counting_deque_type(deque_type: type, counts: OperationCounts) -> type:
+    """Returns a subclass of deque_type (LinkedDeque or RingDeque) that counts node moves (RingDeque.rotate by the front_to_back or back_to_front calls it makes), adds and removes in counts."""
+    counted_methods = {
+        "front_to_back": ("deque_moves", None),
+        "back_to_front": ("deque_moves", None),
+        "add_to_back": ("deque_adds", None),
+        "add_to_front": ("deque_adds", None),
+        "remove_front": ("deque_removes", None),
+        "remove_back": ("deque_removes", None),
+    }
+    return type(
+        "Counting" + deque_type.__name__,
+        (deque_type,),
+        {
+            method_name: _counted(
+                getattr(deque_type, method_name), counts, operation, amount
+            )
+            for method_name, (operation, amount) in counted_methods.items()
+        },
+    )
+
+
+def counting_purchase_type(counts: OperationCounts) -> type:
+    """Returns a subclass of StockPurchase that counts its comparisons in counts."""
+    count = counts.count
+
+    class CountingStockPurchase(StockPurchase):
+        __hash__ = StockPurchase.__hash__
+
+        def __lt__(self, other) -> bool:
+            count("comparisons")
+            return StockPurchase.__lt__(self, other)
+
+        def __gt__(self, other) -> bool:
+            count("comparisons")
+            return StockPurchase.__lt__(other, self)
+
+        def __eq__(self, other) -> bool:
+            count("comparisons")
+            return StockPurchase.__eq__(self, other)
+
+    return CountingStockPurchase
@@ -0,0 +1,186 @@
+import os
+from array import array
+from collections.abc import Iterator
+from typing import TextIO
+from package.order_stream import CompiledOrderStream
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only OrderGenerator needs it
+    np = None
+
+
+class OrderGenerator:
+    """OrderGenerator makes orders in batches of NumPy arrays, with the price models of capital_gains_helper_methods.generate_buy_sell_lines_string (NVDA goes up; MSFT goes down, then up, around a counter of 200; other symbols are uniform from 150 to 350; no price is greater than 400), from a seeded numpy.random.Generator, so the same seed makes the same orders.\n\nAs there, an order is a Buy when its quantity is more than the shares held of its symbol, and otherwise a Buy or Sell with equal chance; shares_quantity_list is the expected number of shares of each symbol (in order of stock_symbols) after the orders made so far.\n\nRequires numpy (pip install numpy)."""
+
+    def __init__(
+        self,
+        stock_symbols: list[str],
+        minimum_quantity: int = 1,
+        maximum_quantity: int = 100,
+        seed: int | None = None,
+        batch_size: int = 1 << 16,
+    ) -> None:
+        if np is None:
+            raise ImportError(
+                "OrderGenerator requires numpy: pip install numpy"
+            )
+        self.stock_symbols = list(stock_symbols)
+        self.minimum_quantity = minimum_quantity
+        self.maximum_quantity = maximum_quantity
+        self.batch_size = batch_size
+        self._generator = np.random.default_rng(seed)
+        self._nvda_id = self._symbol_id_or_none("NVDA")
+        self._msft_id = self._symbol_id_or_none("MSFT")
+        self.counter = 0  # number of orders made so far
+        self.shares_quantity_list = [0 for s_i in range(len(stock_symbols))]
+
+    def _symbol_id_or_none(self, stock_symbol: str) -> int | None:  # O(N)
+        if stock_symbol in self.stock_symbols:
+            return self.stock_symbols.index(stock_symbol)
+        return None
+
+    def _prices(self, symbol_ids, counters, uniforms):  # O(batch)
+        prices = np.floor(150 + uniforms[:, 3] * 201)  # randrange(150, 351)
+        if self._nvda_id is not None:
+            is_nvda = symbol_ids == self._nvda_id
+            prices[is_nvda] = np.round(
+                (100 + counters[is_nvda])
+                * (uniforms[is_nvda, 3] + uniforms[is_nvda, 4]),
+                2,
+            )
+        if self._msft_id is not None:
+            is_msft = symbol_ids == self._msft_id
+            prices[is_msft] = np.round(
+                uniforms[is_msft, 3]
+                * 200
+                * (np.abs(200 - counters[is_msft]) / 200),
+                2,
+            )
+        return np.minimum(prices, 400)
+
+    def _sides(self, symbol_ids, quantities, coin_flips):  # O(batch)
+        """Returns 1 (Buy) or -1 (Sell) for each order, in one pass, as each side depends on the shares held after the orders before it."""
+        shares_held = self.shares_quantity_list
+        sides = array("b", bytes(len(symbol_ids)))
+        for o_i, (symbol_id, quantity, is_buy) in enumerate(
+            zip(symbol_ids.tolist(), quantities.tolist(), coin_flips.tolist())
+        ):
+            if is_buy or quantity > shares_held[symbol_id]:
+                sides[o_i] = 1
+                shares_held[symbol_id] += quantity
+            else:
+                sides[o_i] = -1
+                shares_held[symbol_id] -= quantity
+        return np.frombuffer(sides, dtype=np.int8)
+
+    def iter_batches(
+        self, number_of_transactions: int
+    ) -> Iterator[tuple]:  # O(number_of_transactions)
+        """Yields (sides, symbol ids, quantities, prices) arrays of up to batch_size orders each, for number_of_transactions orders; side is 1 for Buy and -1 for Sell, as in CompiledOrderStream.\n\nEach order is made from 5 uniforms (symbol, quantity, Buy or Sell, 2 for price), so orders do not depend on batch_size."""
+        remaining = number_of_transactions
+        while remaining > 0:
+            batch_size = min(self.batch_size, remaining)
+            counters = np.arange(
+                self.counter + 1, self.counter + batch_size + 1
+            )
+            uniforms = self._generator.random((batch_size, 5))
+            symbol_ids = (uniforms[:, 0] * len(self.stock_symbols)).astype(
+                np.int64
+            )
+            quantities = self.minimum_quantity + (
+                uniforms[:, 1]
+                * (self.maximum_quantity - self.minimum_quantity + 1)
+            ).astype(np.int64)
+            coin_flips = uniforms[:, 2] < 0.5
+            prices = self._prices(symbol_ids, counters, uniforms)
+            sides = self._sides(symbol_ids, quantities, coin_flips)
+            self.counter += batch_size
+            remaining -= batch_size
+            yield sides, symbol_ids, quantities, prices
+
+    def iter_lines(
+        self, number_of_transactions: int
+    ) -> Iterator[str]:  # O(number_of_transactions), O(batch) memory
+        """Yields orders as lines of text, ex: "Buy 20 shares of AAPL at $245.", for TradingBot.stream_to_trading_bot or a file."""
+        for sides, symbol_ids, quantities, prices in self.iter_batches(
+            number_of_transactions
+        ):
+            for side, symbol_id, quantity, price in zip(
+                sides.tolist(),
+                symbol_ids.tolist(),
+                quantities.tolist(),
+                prices.tolist(),
+            ):
+                if symbol_id != self._nvda_id and symbol_id != self._msft_id:
+                    price = int(price)  # as randrange(150, 351)
+                yield (
+                    f"{'Buy' if side == 1 else 'Sell'} {quantity} shares of"
+                    f" {self.stock_symbols[symbol_id]} at ${price}."
+                )
+
+    def write_lines(
+        self,
+        destination: str | os.PathLike | TextIO,
+        number_of_transactions: int,
+    ) -> list[int]:  # O(number_of_transactions), O(batch) memory
+        """Writes number_of_transactions lines to destination (a file path, or a file object), and returns shares_quantity_list."""
+        if isinstance(destination, (str, os.PathLike)):
+            with open(destination, "w", encoding="utf-8") as each_file:
+                return self.write_lines(each_file, number_of_transactions)
+        for each_line in self.iter_lines(number_of_transactions):
+            destination.write(each_line + "\n")
+        return self.shares_quantity_list
+
+    def compiled_stream(
+        self, number_of_transactions: int
+    ) -> CompiledOrderStream:  # O(number_of_transactions)
+        """Returns number_of_transactions orders as a CompiledOrderStream (for TradingBot.replay), without making any text."""
+        compiled = CompiledOrderStream()
+        for each_symbol in self.stock_symbols:
+            compiled.symbol_id(each_symbol)
+        for sides, symbol_ids, quantities, prices in self.iter_batches(
+            number_of_transactions
+        ):
+            for each_column, each_array, each_dtype in (
+                (compiled.sides, sides, np.int8),
+                (compiled.symbol_ids, symbol_ids, np.intc),
+                (compiled.quantities, quantities, np.int64),
+                (compiled.prices, prices, np.float64),
+            ):
+                each_column.frombytes(each_array.astype(each_dtype).tobytes())
+        return compiled
+
+
+def generate_buy_sell_lines_string(
+    stock_symbols: list[str],
+    number_of_transactions: int,
+    minimum_quantity: int = 1,
+    maximum_quantity: int = 100,
+    seed: int | None = None,
+) -> tuple[str, list[int]]:  # O(N)
+    """Same as capital_gains_helper_methods.generate_buy_sell_lines_string, from a seeded OrderGenerator."""
+    order_generator = OrderGenerator(
+        stock_symbols, minimum_quantity, maximum_quantity, seed
+    )
+    return (
+        "\n".join(order_generator.iter_lines(number_of_transactions)),
+        order_generator.shares_quantity_list,
+    )
+
+
+def generate_compiled_order_stream(
+    stock_symbols: list[str],
+    number_of_transactions: int,
+    minimum_quantity: int = 1,
+    maximum_quantity: int = 100,
+    seed: int | None = None,
+) -> tuple[CompiledOrderStream, list[int]]:  # O(N)
+    """Same as generate_buy_sell_lines_string, returning a CompiledOrderStream instead of a str."""
+    order_generator = OrderGenerator(
+        stock_symbols, minimum_quantity, maximum_quantity, seed
+    )
+    return (
+        order_generator.compiled_stream(number_of_transactions),
+        order_generator.shares_quantity_list,
+    )
@@ -0,0 +1,240 @@
+import io
+import os
+import re
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+
+# one pattern for every line of an order log
+# ex: "Buy 20 shares of AAPL at $45.", "Display"
+ORDER_PATTERN = re.compile(
+    r"\s*(?:(Buy|Sell)\s+(\d+)\s+shares?\s+of\s+(\S+)\s+at\s+\$?"
+    r"(\d+(?:\.\d+)?|\.\d+)\.?|(Display)\b.*?)\s*"
+)
+# a Display directive is any line starting with the word Display, the same in
+# ORDER_PATTERN and is_display_line
+DISPLAY_PATTERN = re.compile(r"\s*Display\b")
+
+
+class OrderStreamReport:
+    """OrderStreamReport counts the lines of an order log as it is streamed: orders, Display directives, blank lines (skipped), and malformed lines (skipped, with the first max_examples kept as (line number, line) for reporting)."""
+
+    def __init__(self, max_examples: int = 5) -> None:
+        self.number_of_lines = 0
+        self.number_of_buys = 0
+        self.number_of_sells = 0
+        self.number_of_displays = 0
+        self.number_of_blank_lines = 0
+        self.number_of_malformed_lines = 0
+        self.malformed_examples = []
+        self.max_examples = max_examples
+
+    def __str__(self) -> str:  # O(max_examples)
+        report_str = (
+            f"OrderStreamReport: {self.number_of_lines} lines,"
+            f" {self.number_of_buys} buys, {self.number_of_sells} sells,"
+            f" {self.number_of_displays} displays,"
+            f" {self.number_of_malformed_lines} malformed"
+        )
+        for line_number, each_line in self.malformed_examples:
+            report_str += f"\n  line {line_number}: {each_line!r}"
+        return report_str
+
+    def is_clean(self) -> bool:  # O(1)
+        return self.number_of_malformed_lines == 0
+
+    def _add_malformed(self, line_number: int, line: str) -> None:  # O(1)
+        self.number_of_malformed_lines += 1
+        if len(self.malformed_examples) < self.max_examples:
+            self.malformed_examples.append((line_number, line))
+
+
+def iter_lines(
+    source: os.PathLike | Iterable[str],
+) -> Iterator[str]:  # O(1) memory
+    """Yields the lines of source, which is a file path (os.PathLike, ex: a pathlib.Path, opened and closed here), a file object, or any iterable of lines (ex: a list, or a generator); bytes lines are decoded as UTF-8.\n\nA str is neither: TradingBot.string_to_trading_bot reads a str as the text of an order log, so rather than guess, a str raises TypeError (pass pathlib.Path(path) for a file, or io.StringIO(text) for text)."""
+    if isinstance(source, str):
+        raise TypeError(
+            "order log source is a str: pass pathlib.Path(path) for a file,"
+            " or io.StringIO(text) for the text of an order log"
+        )
+    if isinstance(source, os.PathLike):
+        with open(source, encoding="utf-8") as source_file:
+            yield from source_file
+    else:
+        for each_line in source:
+            if isinstance(each_line, bytes):
+                each_line = each_line.decode("utf-8")
+            yield each_line
+
+
+def is_display_line(line: str) -> bool:  # O(1)
+    """Returns whether line is a Display directive, as parse_order reads it (TradingBot.string_to_trading_bot uses the same rule)."""
+    return DISPLAY_PATTERN.match(line) is not None
+
+
+def parse_order(
+    line: str | bytes, report: OrderStreamReport, line_number: int
+) -> tuple[str, str | None, int, float] | None:  # O(len(line))
+    """Returns the order of one line of an order log, as iter_orders yields it, counting it in report; returns None for a blank or malformed line."""
+    if isinstance(line, bytes):
+        line = line.decode("utf-8")
+    report.number_of_lines += 1
+    order_match = ORDER_PATTERN.fullmatch(line)
+    if order_match is None:
+        if line.strip():
+            report._add_malformed(line_number, line.rstrip("\r\n"))
+        else:
+            report.number_of_blank_lines += 1
+        return None
+    buy_or_sell, quantity, stock_symbol, price, display = order_match.groups()
+    if display is not None:
+        report.number_of_displays += 1
+        return display, None, 0, 0.0
+    if buy_or_sell == "Buy":
+        report.number_of_buys += 1
+    else:
+        report.number_of_sells += 1
+    return buy_or_sell, stock_symbol, int(quantity), float(price)
+
+
+def iter_orders(
+    source: os.PathLike | Iterable[str],
+    report: OrderStreamReport | None = None,
+) -> Iterator[tuple[str, str | None, int, float]]:  # O(1) memory
+    """Yields ("Buy" or "Sell", stock symbol, quantity, price), or ("Display", None, 0, 0.0), for each line of source (see iter_lines), as it is read; blank and malformed lines are counted in report and skipped."""
+    if report is None:
+        report = OrderStreamReport()
+    for line_number, each_line in enumerate(iter_lines(source), 1):
+        order = parse_order(each_line, report, line_number)
+        if order is not None:
+            yield order
+
+
+class CompiledOrderStream:
+    """CompiledOrderStream is an order log parsed once into columns (side, symbol id, quantity, price arrays, with an interned symbol table), so it can be replayed by any number of TradingBots (TradingBot.replay) without parsing again, and saved to and loaded from a binary file.\n\nside: 1 for Buy, -1 for Sell, 0 for Display"""
+
+    SIDES = {"Buy": 1, "Sell": -1, "Display": 0}
+    SIDE_NAMES = {1: "Buy", -1: "Sell", 0: "Display"}
+    _MAGIC = b"TDOS"
+    _VERSION = 1
+    _HEADER = struct.Struct("<4sBBxxQI")  # magic, version, little endian,
+    # number of orders, number of bytes of the symbol table
+
+    def __init__(self) -> None:
+        self.sides = array("b")
+        self.symbol_ids = array("i")
+        self.quantities = array("q")
+        self.prices = array("d")
+        self.symbols = []  # symbol id -> stock symbol
+        self._symbol_ids = {}  # stock symbol -> symbol id
+        self.report = None  # OrderStreamReport, when compiled from a source
+
+    def __len__(self) -> int:  # O(1)
+        return len(self.sides)
+
+    def __iter__(
+        self,
+    ) -> Iterator[tuple[str, str | None, int, float]]:  # O(1) per order
+        """Yields orders as iter_orders does."""
+        symbols = self.symbols
+        for side, symbol_id, quantity, price in zip(
+            self.sides, self.symbol_ids, self.quantities, self.prices
+        ):
+            if side == 0:
+                yield "Display", None, 0, 0.0
+            else:
+                buy_or_sell = CompiledOrderStream.SIDE_NAMES[side]
+                yield buy_or_sell, symbols[symbol_id], quantity, price
+
+    def __eq__(self, other) -> bool:  # O(N)
+        return (
+            isinstance(other, CompiledOrderStream)
+            and self.symbols == other.symbols
+            and self.sides == other.sides
+            and self.symbol_ids == other.symbol_ids
+            and self.quantities == other.quantities
+            and self.prices == other.prices
+        )
+
+    def symbol_id(self, stock_symbol: str) -> int:  # O(1)
+        """Returns the id of stock_symbol, adding it to the symbol table if new."""
+        if stock_symbol not in self._symbol_ids:
+            self._symbol_ids[stock_symbol] = len(self.symbols)
+            self.symbols.append(sys.intern(stock_symbol))
+        return self._symbol_ids[stock_symbol]
+
+    def append(
+        self,
+        buy_or_sell: str,
+        stock_symbol: str | None,
+        quantity: int,
+        price: float,
+    ) -> None:  # O(1) amortized
+        side = CompiledOrderStream.SIDES[buy_or_sell]
+        self.sides.append(side)
+        self.symbol_ids.append(
+            -1 if stock_symbol is None else self.symbol_id(stock_symbol)
+        )
+        self.quantities.append(quantity)
+        self.prices.append(price)
+
+    @classmethod
+    def from_source(
+        cls, source: os.PathLike | Iterable[str]
+    ) -> "CompiledOrderStream":  # O(N)
+        """Compiles an order log given as a file path (os.PathLike), a file object, or any iterable of lines (see iter_lines); malformed lines are counted in report."""
+        compiled = cls()
+        compiled.report = OrderStreamReport()
+        for each_order in iter_orders(source, compiled.report):
+            compiled.append(*each_order)
+        return compiled
+
+    @classmethod
+    def from_string(cls, input_str: str) -> "CompiledOrderStream":  # O(N)
+        """Compiles an order log held in a str, as passed to TradingBot.string_to_trading_bot."""
+        return cls.from_source(io.StringIO(input_str))
+
+    def save(self, path: str | os.PathLike) -> None:  # O(N)
+        symbol_table = "\n".join(self.symbols).encode("utf-8")
+        with open(path, "wb") as stream_file:
+            stream_file.write(
+                CompiledOrderStream._HEADER.pack(
+                    CompiledOrderStream._MAGIC,
+                    CompiledOrderStream._VERSION,
+                    sys.byteorder == "little",
+                    len(self),
+                    len(symbol_table),
+                )
+            )
+            stream_file.write(symbol_table)
+            for each_column in self._columns():
+                each_column.tofile(stream_file)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "CompiledOrderStream":  # O(N)
+        compiled = cls()
+        with open(path, "rb") as stream_file:
+            magic, version, little_endian, number_of_orders, table_size = (
+                CompiledOrderStream._HEADER.unpack(
+                    stream_file.read(CompiledOrderStream._HEADER.size)
+                )
+            )
+            if (
+                magic != CompiledOrderStream._MAGIC
+                or version != CompiledOrderStream._VERSION
+            ):
+                raise ValueError(f"{path} is not a CompiledOrderStream file")
+            symbol_table = stream_file.read(table_size).decode("utf-8")
+            if symbol_table:
+                for each_symbol in symbol_table.split("\n"):
+                    compiled.symbol_id(each_symbol)
+            for each_column in compiled._columns():
+                each_column.fromfile(stream_file, number_of_orders)
+                if bool(little_endian) != (sys.byteorder == "little"):
+                    each_column.byteswap()
+        return compiled
+
+    def _columns(self) -> tuple[array, array, array, array]:  # O(1)
+        return self.sides, self.symbol_ids, self.quantities, self.prices
@@ -0,0 +1,197 @@
+import importlib
+import json
+import os
+import struct
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import blake2b
+from package import __version__
+from package.order_stream import CompiledOrderStream
+from package.snapshot import SnapshotFile
+
+
+class ResultCache:
+    """ResultCache is an on-disk cache of replay results, one SnapshotFile (named arrays and a JSON meta dict) per result, named by a hash of what determines the result: the compiled order stream's content, the strategy pair, the rng seed, the TradingBot options, and the package version and source (see key and code_digest), so a result is found again whatever the stream was loaded from, and never after the code that made it changes, even when the version is not bumped.\n\nThe cache keeps at most max_bytes of files, evicting the least recently used (by file modification time, which get touches) when a put goes over; writes go through a temporary file and os.replace, so a reader never sees half a result."""
+
+    SUFFIX = ".result"
+
+    def __init__(
+        self, directory: str | os.PathLike, max_bytes: int = 1 << 28
+    ) -> None:  # O(files) to index the directory
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._sizes = OrderedDict()  # key -> file size, least recent first
+        listed = []
+        for each_entry in os.scandir(self.directory):
+            if each_entry.name.endswith(ResultCache.SUFFIX):
+                each_stat = each_entry.stat()
+                listed.append(
+                    (
+                        each_stat.st_mtime_ns,
+                        each_entry.name[: -len(ResultCache.SUFFIX)],
+                        each_stat.st_size,
+                    )
+                )
+        for mtime_ns, key, size in sorted(listed):
+            self._sizes[key] = size
+        self.total_bytes = sum(self._sizes.values())
+
+    def __len__(self) -> int:  # O(1)
+        return len(self._sizes)
+
+    def __contains__(self, key: str) -> bool:  # O(1)
+        return key in self._sizes
+
+    @staticmethod
+    def stream_digest(compiled_stream: CompiledOrderStream) -> str:  # O(N)
+        """Returns a hash of the orders of compiled_stream (sides, stock symbols, quantities, prices), the same for equal streams however they were compiled: stock symbols are numbered in order of first appearance, not by the stream's symbol table."""
+        first_ids = {}  # symbol id -> its number in order of first appearance
+        for symbol_id in compiled_stream.symbol_ids:
+            if symbol_id not in first_ids:
+                first_ids[symbol_id] = len(first_ids)
+        symbols = [
+            compiled_stream.symbols[symbol_id] if symbol_id >= 0 else None
+            for symbol_id in first_ids
+        ]  # None for Display orders
+        digest = blake2b(digest_size=16)
+        digest.update(json.dumps(symbols).encode())
+        for each_array in (
+            compiled_stream.sides,
+            array(
+                "q",
+                [
+                    first_ids[symbol_id]
+                    for symbol_id in compiled_stream.symbol_ids
+                ],
+            ),
+            compiled_stream.quantities,
+            compiled_stream.prices,
+        ):
+            digest.update(each_array.typecode.encode())
+            digest.update(len(each_array).to_bytes(8, "little"))
+            digest.update(each_array.tobytes())
+        return digest.hexdigest()
+
+    # modules whose code determines a replay's result
+    RESULT_MODULES = [
+        "package.cost_index",
+        "package.ledger_entry",
+        "package.linked_deque",
+        "package.lot_ledger_entry",
+        "package.lot_stock_sale",
+        "package.order_stream",
+        "package.ring_deque",
+        "package.stock_ledger",
+        "package.stock_purchase",
+        "package.stock_sale",
+        "package.strategy_sweep",
+        "package.trading_bot",
+    ]
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def code_digest() -> str:  # O(size of RESULT_MODULES), once per process
+        """Returns a hash of the files (source, or compiled extension) that RESULT_MODULES were imported from."""
+        digest = blake2b(digest_size=16)
+        for module_name in ResultCache.RESULT_MODULES:
+            module = importlib.import_module(module_name)
+            digest.update(module_name.encode())
+            module_path = getattr(module, "__file__", None)
+            if module_path is not None:
+                with open(module_path, "rb") as module_file:
+                    digest.update(module_file.read())
+        return digest.hexdigest()
+
+    @staticmethod
+    def key(
+        stream_digest: str,
+        buy_setting: int,
+        sell_setting: int,
+        seed: int | str | None,
+        bot_options: dict,
+    ) -> str:  # O(1)
+        """Returns the cache key of replaying the stream of stream_digest (see stream_digest) with TradingBot(buy_setting, sell_setting, **bot_options) and an rng from seed (None: unseeded), for this package version and code (see code_digest)."""
+        return blake2b(
+            json.dumps(
+                [
+                    __version__,
+                    ResultCache.code_digest(),
+                    stream_digest,
+                    buy_setting,
+                    sell_setting,
+                    repr(seed),
+                    sorted(
+                        (
+                            name,
+                            (
+                                value.__name__
+                                if isinstance(value, type)
+                                else repr(value)
+                            ),
+                        )
+                        for name, value in bot_options.items()
+                    ),
+                ]
+            ).encode(),
+            digest_size=16,
+        ).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ResultCache.SUFFIX)
+
+    def get(
+        self, key: str
+    ) -> tuple[dict[str, array], dict] | None:  # O(size of the result)
+        """Returns (arrays, meta) stored under key, copied out of the file, and marks it most recently used; None when there is none."""
+        if key not in self._sizes:
+            self.misses += 1
+            return None
+        try:
+            with SnapshotFile(self._path(key)) as result_file:
+                arrays = {
+                    name: array(
+                        result_file.typecode(name), result_file.array(name)
+                    )
+                    for name in result_file.names()
+                }
+                meta = result_file.meta
+            os.utime(self._path(key))
+        except (OSError, ValueError, struct.error):  # removed or damaged
+            self._forget(key)
+            self.misses += 1
+            return None
+        self._sizes.move_to_end(key)
+        self.hits += 1
+        return arrays, meta
+
+    def put(
+        self, key: str, arrays: dict[str, array], meta: dict
+    ) -> None:  # O(size of the result), O(files evicted)
+        """Stores arrays and meta (JSON serializable) under key, then evicts least recently used results while over max_bytes (never the one just stored)."""
+        path = self._path(key)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        SnapshotFile.write(temporary_path, arrays, meta)
+        os.replace(temporary_path, path)
+        self._forget(key, remove=False)
+        self._sizes[key] = os.path.getsize(path)
+        self.total_bytes += self._sizes[key]
+        while self.total_bytes > self.max_bytes and len(self._sizes) > 1:
+            self._forget(next(iter(self._sizes)))
+
+    def _forget(self, key: str, remove: bool = True) -> None:  # O(1)
+        size = self._sizes.pop(key, None)
+        if size is not None:
+            self.total_bytes -= size
+            if remove:
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+
+    def clear(self) -> None:  # O(files)
+        for key in list(self._sizes):
+            self._forget(key)
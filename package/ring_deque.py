@@ -0,0 +1,146 @@
+from collections.abc import Iterable
+
+
+class RingDeque:
+    """RingDeque has the methods of LinkedDeque, backed by a contiguous ring buffer (a list whose length is a power of 2) instead of linked DLNodes. Adding, removing, front_to_back, back_to_front and indexing are O(1) (amortized, as the buffer doubles when full and halves when under a quarter full), rotate moves the front in O(1) when the buffer is full, and display is iterative.\n\nIteration and display are the same as LinkedDeque's: __iter__ returns the deque itself, with __next__ reading from a cursor, and display prints "LinkedDeque: " and the items, so either deque can back a LotLedgerEntry with the same output."""
+
+    def __init__(
+        self, initial_data: Iterable | None = None, front_or_back: str = "back"
+    ) -> None:
+        self._items = [None] * 8
+        self._head = 0  # index of the front in _items
+        self._size = 0
+        self._current = 0  # index of the next item of iteration
+        if initial_data is not None:
+            for each_datum in initial_data:
+                if front_or_back == "front":
+                    self.add_to_front(each_datum)
+                else:
+                    self.add_to_back(each_datum)
+
+    def __len__(self) -> int:  # O(1)
+        return self._size
+
+    def _slot(self, index: int) -> int:  # O(1)
+        return (self._head + index) & (len(self._items) - 1)
+
+    def __getitem__(self, index: int) -> any:  # O(1)
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("RingDeque index out of range")
+        return self._items[self._slot(index)]
+
+    def _items_data_list(self) -> list[any]:  # O(N)
+        return [self._items[self._slot(i)] for i in range(self._size)]
+
+    def __iter__(self):  # O(1)
+        self._current = 0
+        return self
+
+    def __next__(self) -> any:  # O(1)
+        if self._current >= self._size:
+            raise StopIteration
+        self._current += 1
+        return self._items[self._slot(self._current - 1)]
+
+    def __eq__(self, other) -> bool:  # O(N)
+        return self._items_data_list() == list(other)
+
+    def _resize(self, capacity: int) -> None:  # O(N)
+        self._items = self._items_data_list() + [None] * (
+            capacity - self._size
+        )
+        self._head = 0
+
+    def _shrink(self) -> None:  # O(1) amortized
+        if len(self._items) > 8 and self._size < len(self._items) // 4:
+            self._resize(len(self._items) // 2)
+
+    def add_to_back(self, new_entry) -> None:  # O(1) amortized
+        if self._size == len(self._items):
+            self._resize(2 * len(self._items))
+        self._items[self._slot(self._size)] = new_entry
+        self._size += 1
+
+    def add_to_front(self, new_entry) -> None:  # O(1) amortized
+        if self._size == len(self._items):
+            self._resize(2 * len(self._items))
+        self._head = self._slot(-1)
+        self._items[self._head] = new_entry
+        self._size += 1
+
+    def get_back(self) -> any:  # O(1)
+        if self._size == 0:
+            return None
+        return self._items[self._slot(self._size - 1)]
+
+    def get_front(self) -> any:  # O(1)
+        if self._size == 0:
+            return None
+        return self._items[self._head]
+
+    def remove_front(self) -> any:  # O(1) amortized
+        if self._size == 0:
+            return None
+        front = self._items[self._head]
+        self._items[self._head] = None
+        self._head = self._slot(1)
+        self._size -= 1
+        self._shrink()
+        return front
+
+    def remove_back(self) -> any:  # O(1) amortized
+        if self._size == 0:
+            return None
+        back_slot = self._slot(self._size - 1)
+        back = self._items[back_slot]
+        self._items[back_slot] = None
+        self._size -= 1
+        self._shrink()
+        return back
+
+    def clear(self) -> None:  # O(1)
+        self._items = [None] * 8
+        self._head = 0
+        self._size = 0
+
+    def is_empty(self) -> bool:  # O(1)
+        return self._size == 0
+
+    def front_to_back(self) -> None:  # O(1)
+        if self._size > 0:
+            self.add_to_back(self.remove_front())
+
+    def back_to_front(self) -> None:  # O(1)
+        if self._size > 0:
+            self.add_to_front(self.remove_back())
+
+    def rotate(self, steps: int) -> None:  # O(min(steps, N - steps))
+        """Same as steps calls of front_to_back() (back_to_front() when negative), going whichever way is shorter; O(1) when the buffer is full."""
+        if self._size == 0:
+            return
+        steps %= self._size
+        if self._size == len(self._items):
+            self._head = self._slot(steps)
+        elif steps <= self._size // 2:
+            for r_i in range(steps):
+                self.front_to_back()
+        else:
+            for r_i in range(self._size - steps):
+                self.back_to_front()
+
+    def display(self) -> None:  # O(N)
+        print(
+            "LinkedDeque: "
+            + ", ".join(str(each_datum) for each_datum in self)
+        )
+
+    def count_eq_data_portion(self, datum: any) -> int:  # O(N)
+        return sum(1 for each_datum in self if each_datum == datum)
+
+    def count_lt_data_portion(self, datum: any) -> int:  # O(N)
+        return sum(1 for each_datum in self if each_datum < datum)
+
+    def count_gt_data_portion(self, datum: any) -> int:  # O(N)
+        return sum(1 for each_datum in self if datum < each_datum)
@@ -0,0 +1,269 @@
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from package.linked_deque import LinkedDeque
+from package.order_stream import CompiledOrderStream
+from package.snapshot import (
+    entry_runs,
+    restore_entry,
+    sales_arrays,
+    sales_from_arrays,
+)
+from package.stock_ledger import StockLedger
+from package.trading_bot import TradingBot
+
+_worker_options = {}  # set in each worker process by _initialize_worker
+
+
+def _initialize_worker(ledger_options: dict) -> None:  # O(1), once per worker
+    global _worker_options
+    _worker_options = ledger_options
+
+
+def _shard_rng(seed: int | str | None, shard_index: int) -> Random | None:
+    if seed is None:
+        return None
+    return Random(f"{seed}:{shard_index}")
+
+
+def _replay_shard(
+    shard: tuple[int, CompiledOrderStream, str, str, int | str | None],
+) -> "ShardResult":  # O(replay of the shard)
+    shard_index, shard_stream, buy_strategy, sell_strategy, seed = shard
+    stock_ledger = StockLedger(
+        rng=_shard_rng(seed, shard_index), **_worker_options
+    )
+    symbols = shard_stream.symbols
+    results, buy_ns, sell_ns = stock_ledger.trade_many(
+        [
+            (side, symbols[symbol_id], quantity, price)
+            for side, symbol_id, quantity, price in zip(
+                shard_stream.sides,
+                shard_stream.symbol_ids,
+                shard_stream.quantities,
+                shard_stream.prices,
+            )
+        ],
+        buy_strategy,
+        sell_strategy,
+    )
+    first_buys = {}  # stock symbol -> index of its first buy in the shard
+    for o_i, (side, symbol_id) in enumerate(
+        zip(shard_stream.sides, shard_stream.symbol_ids)
+    ):
+        if side == 1 and symbols[symbol_id] not in first_buys:
+            first_buys[symbols[symbol_id]] = o_i
+    sold = array("b", [each_result is not None for each_result in results])
+    entries = []
+    for each_entry in stock_ledger.ledger_entries:
+        each_runs = entry_runs(each_entry)
+        entries.append(
+            (
+                first_buys[each_entry.symbol],
+                each_entry.symbol,
+                stock_ledger.number_of_shares(each_entry.symbol),
+                array("d", [cost for cost, quantity in each_runs]),
+                array("q", [quantity for cost, quantity in each_runs]),
+            )
+        )
+    return ShardResult(
+        shard_index,
+        sold,
+        sales_arrays(
+            [each_result for each_result in results if each_result is not None],
+            symbols,
+        ),
+        buy_ns,
+        sell_ns,
+        entries,
+    )
+
+
+class ShardResult:
+    """ShardResult is what a worker sends back for one shard, as arrays rather than objects so it pickles quickly: whether each of its orders made a sale, the sales made (encoded by snapshot.sales_arrays, with the shard stream's symbols), nanoseconds spent buying and selling, and each entry of its ledger as (index of the first buy of its stock symbol in the shard, stock symbol, number of shares, run costs, run quantities)."""
+
+    def __init__(
+        self,
+        shard_index: int,
+        sold: array,
+        sales: dict[str, array],
+        buy_ns: int,
+        sell_ns: int,
+        entries: list[tuple[int, str, int, array, array]],
+    ) -> None:
+        self.shard_index = shard_index
+        self.sold = sold
+        self.sales = sales
+        self.buy_ns = buy_ns
+        self.sell_ns = sell_ns
+        self.entries = entries
+
+
+class ShardedReplay:
+    """ShardedReplay replays one CompiledOrderStream as TradingBot.replay does, with the stream partitioned by stock symbol into shards (symbols spread to even out orders), each replayed on its own StockLedger in a process pool, as no strategy reads another symbol's entry; the shards' results are merged into one TradingBot, with its ledger entries (restored lazily, in order of first buy, see snapshot.restore_entry), balance series, sales and profits in the order of the original stream, exactly as a single replay makes them.\n\nDisplay orders are skipped. With buyRandom or sellRandom, each shard draws from its own Random (from seed and the shard), so results depend on the number of shards.\n\nshards: number of shards (defaults to max_workers, or os.cpu_count())\n\nmax_workers: size of the process pool (defaults to os.cpu_count()); 0 replays every shard in this process\n\nledger_options: passed to each StockLedger and the merged TradingBot (lot_based, cost_index, deque_type, cost_fingerprint)"""
+
+    def __init__(
+        self,
+        compiled_stream: CompiledOrderStream | str,
+        buy_setting: int = 1,
+        sell_setting: int = 1,
+        initial_balance: float = 0,
+        shards: int | None = None,
+        max_workers: int | None = None,
+        seed: int | str | None = None,
+        lot_based: bool = False,
+        cost_index: bool = False,
+        deque_type: type = LinkedDeque,
+        cost_fingerprint: bool = False,
+    ) -> None:
+        self.compiled_stream = (
+            compiled_stream
+            if isinstance(compiled_stream, CompiledOrderStream)
+            else CompiledOrderStream.from_string(compiled_stream)
+        )
+        self.buy_setting = buy_setting
+        self.sell_setting = sell_setting
+        self.initial_balance = initial_balance
+        self.max_workers = max_workers
+        self.shards = shards or max_workers or os.cpu_count() or 1
+        self.seed = seed
+        self.ledger_options = {
+            "lot_based": lot_based,
+            "cost_index": cost_index,
+            "deque_type": deque_type,
+            "cost_fingerprint": cost_fingerprint,
+        }
+        self.wall_time = 0.0  # seconds, of the last run
+
+    def partition(
+        self,
+    ) -> list[tuple[CompiledOrderStream, array]]:  # O(N + symbols log symbols)
+        """Returns, for each non-empty shard, its orders as a CompiledOrderStream and their indices in compiled_stream; each symbol goes (most orders first) to the shard with the fewest orders so far."""
+        compiled_stream = self.compiled_stream
+        orders_per_symbol = [0] * len(compiled_stream.symbols)
+        for side, symbol_id in zip(
+            compiled_stream.sides, compiled_stream.symbol_ids
+        ):
+            if side != 0:
+                orders_per_symbol[symbol_id] += 1
+        shard_sizes = [0] * self.shards
+        shard_of_symbol = [0] * len(compiled_stream.symbols)
+        for symbol_id in sorted(
+            range(len(orders_per_symbol)),
+            key=lambda s_i: -orders_per_symbol[s_i],
+        ):
+            shard_index = shard_sizes.index(min(shard_sizes))
+            shard_of_symbol[symbol_id] = shard_index
+            shard_sizes[shard_index] += orders_per_symbol[symbol_id]
+        shard_streams = [CompiledOrderStream() for s_i in range(self.shards)]
+        shard_order_indices = [array("q") for s_i in range(self.shards)]
+        for o_i, (side, symbol_id, quantity, price) in enumerate(
+            zip(
+                compiled_stream.sides,
+                compiled_stream.symbol_ids,
+                compiled_stream.quantities,
+                compiled_stream.prices,
+            )
+        ):
+            if side != 0:
+                shard_index = shard_of_symbol[symbol_id]
+                shard_stream = shard_streams[shard_index]
+                shard_stream.sides.append(side)
+                shard_stream.symbol_ids.append(
+                    shard_stream.symbol_id(compiled_stream.symbols[symbol_id])
+                )
+                shard_stream.quantities.append(quantity)
+                shard_stream.prices.append(price)
+                shard_order_indices[shard_index].append(o_i)
+        return [
+            (shard_stream, order_indices)
+            for shard_stream, order_indices in zip(
+                shard_streams, shard_order_indices
+            )
+            if len(shard_stream) > 0
+        ]
+
+    def run(self, lazy: bool = True) -> TradingBot:  # O(replay) / workers
+        """Replays the shards and returns the merged TradingBot; lazy: restore its ledger entries when first used (see snapshot.restore_entry)."""
+        start = time.perf_counter()
+        partitions = self.partition()
+        shards = [
+            (
+                shard_index,
+                shard_stream,
+                TradingBot.BUY_STRATEGIES[self.buy_setting - 1],
+                TradingBot.SELL_STRATEGIES[self.sell_setting - 1],
+                self.seed,
+            )
+            for shard_index, (shard_stream, order_indices) in enumerate(
+                partitions
+            )
+        ]
+        if self.max_workers == 0:
+            _initialize_worker(self.ledger_options)
+            shard_results = [_replay_shard(each_shard) for each_shard in shards]
+        else:
+            with ProcessPoolExecutor(
+                min(self.max_workers or os.cpu_count() or 1, len(shards) or 1),
+                initializer=_initialize_worker,
+                initargs=(self.ledger_options,),
+            ) as executor:
+                shard_results = list(executor.map(_replay_shard, shards))
+        trading_bot = self._merge(shard_results, partitions, lazy)
+        self.wall_time = time.perf_counter() - start
+        return trading_bot
+
+    def _merge(
+        self,
+        shard_results: list[ShardResult],
+        partitions: list[tuple[CompiledOrderStream, array]],
+        lazy: bool,
+    ) -> TradingBot:  # O(N + entries + sale lots)
+        trading_bot = TradingBot(
+            self.initial_balance,
+            self.buy_setting,
+            self.sell_setting,
+            rng=None if self.seed is None else Random(self.seed),
+            **self.ledger_options,
+        )
+        results = [None] * len(self.compiled_stream)
+        entries = []  # (index of first buy, stock symbol, shares, runs)
+        for each_result, (shard_stream, order_indices) in zip(
+            shard_results, partitions
+        ):
+            shard_sales = iter(
+                sales_from_arrays(each_result.sales, shard_stream.symbols)
+            )
+            for o_i, sold in zip(order_indices, each_result.sold):
+                if sold:
+                    results[o_i] = next(shard_sales)
+            for first_buy, *each_entry in each_result.entries:
+                entries.append((order_indices[first_buy], *each_entry))
+            trading_bot.buy_time += each_result.buy_ns / 1e9
+            trading_bot.sell_time += each_result.sell_ns / 1e9
+        entries.sort()  # in order of first buy, as a single replay opens them
+        for first_buy, stock_symbol, shares, costs, quantities in entries:
+            restore_entry(
+                trading_bot.stock_ledger,
+                stock_symbol,
+                shares,
+                costs,
+                quantities,
+                lazy,
+            )
+        append_balance = trading_bot.balance_over_transactions.append
+        for side, quantity, price, each_order_result in zip(
+            self.compiled_stream.sides,
+            self.compiled_stream.quantities,
+            self.compiled_stream.prices,
+            results,
+        ):
+            if side == 1:
+                trading_bot.balance -= quantity * price
+                append_balance(trading_bot.balance)
+            elif each_order_result is not None:
+                trading_bot.stock_sales_list.append(each_order_result)
+                trading_bot._count_sale(each_order_result, quantity, price)
+        return trading_bot
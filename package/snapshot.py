@@ -0,0 +1,382 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from random import Random, SystemRandom
+from package.linked_deque import LinkedDeque
+from package.ring_deque import RingDeque
+from package.stock_purchase import StockPurchase
+from package.lot_stock_sale import LotStockSale
+
+DEQUE_TYPES = {"LinkedDeque": LinkedDeque, "RingDeque": RingDeque}
+
+
+class SnapshotFile:
+    """SnapshotFile is a file of named arrays (array typecodes, 8 byte aligned, in native byte order) and a JSON meta dict, read through mmap, so arrays are memoryviews of the file and nothing is copied until used.\n\nLayout: header (magic, version, little endian, number of arrays, meta size), meta, then for each array a directory record (name, typecode, count, offset), then the arrays."""
+
+    MAGIC = b"TDSS"
+    VERSION = 1
+    _HEADER = struct.Struct("<4sBBxxQQ")
+    _RECORD = struct.Struct("<32scxxxxxxxQQ")
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        with open(path, "rb") as snapshot_file:
+            self._mmap = mmap.mmap(
+                snapshot_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        self._view = memoryview(self._mmap)
+        magic, version, little_endian, number_of_arrays, meta_size = (
+            SnapshotFile._HEADER.unpack_from(self._view)
+        )
+        if magic != SnapshotFile.MAGIC or version != SnapshotFile.VERSION:
+            raise ValueError(f"{path} is not a snapshot file")
+        self._swap_bytes = bool(little_endian) != (sys.byteorder == "little")
+        position = SnapshotFile._HEADER.size
+        self.meta = json.loads(
+            bytes(self._view[position : position + meta_size])
+        )
+        position += meta_size
+        self._records = {}  # name -> (typecode, count, offset)
+        for a_i in range(number_of_arrays):
+            name, typecode, count, offset = SnapshotFile._RECORD.unpack_from(
+                self._view, position
+            )
+            self._records[name.rstrip(b"\0").decode()] = (
+                typecode.decode(),
+                count,
+                offset,
+            )
+            position += SnapshotFile._RECORD.size
+
+    def __enter__(self) -> "SnapshotFile":
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
+
+    def close(self) -> None:  # O(1)
+        """Unmaps the file; memoryviews from array must have been released (arrays copied from them need not be)."""
+        self._view.release()
+        self._mmap.close()
+
+    def __contains__(self, name: str) -> bool:  # O(1)
+        return name in self._records
+
+    def names(self) -> list[str]:  # O(arrays)
+        return list(self._records)
+
+    def typecode(self, name: str) -> str:  # O(1)
+        return self._records[name][0]
+
+    def array(self, name: str) -> memoryview | array:  # O(1)
+        """Returns the array name as a memoryview of the file (O(1)), or as an array (O(N)) if it was written in the other byte order."""
+        typecode, count, offset = self._records[name]
+        itemsize = array(typecode).itemsize
+        view = self._view[offset : offset + count * itemsize]
+        if self._swap_bytes:
+            swapped = array(typecode, bytes(view))
+            swapped.byteswap()
+            return swapped
+        return view.cast(typecode)
+
+    @staticmethod
+    def write(
+        path: str | os.PathLike, arrays: dict[str, array], meta: dict
+    ) -> None:  # O(N)
+        meta_bytes = json.dumps(meta).encode("utf-8")
+        position = (
+            SnapshotFile._HEADER.size
+            + len(meta_bytes)
+            + SnapshotFile._RECORD.size * len(arrays)
+        )
+        records = []
+        for name, each_array in arrays.items():
+            position += -position % 8
+            records.append(
+                SnapshotFile._RECORD.pack(
+                    name.encode(),
+                    each_array.typecode.encode(),
+                    len(each_array),
+                    position,
+                )
+            )
+            position += len(each_array) * each_array.itemsize
+        with open(path, "wb") as snapshot_file:
+            snapshot_file.write(
+                SnapshotFile._HEADER.pack(
+                    SnapshotFile.MAGIC,
+                    SnapshotFile.VERSION,
+                    sys.byteorder == "little",
+                    len(arrays),
+                    len(meta_bytes),
+                )
+            )
+            snapshot_file.write(meta_bytes)
+            for each_record in records:
+                snapshot_file.write(each_record)
+            for each_array in arrays.values():
+                snapshot_file.write(b"\0" * (-snapshot_file.tell() % 8))
+                each_array.tofile(snapshot_file)
+
+
+class LazyLedgerEntry:
+    """LazyLedgerEntry stands in for a LedgerEntry restored from a snapshot: its length is known, and its shares are added (from runs of the snapshot, in deque order) the first time anything else is asked of it, when the StockLedger is also given the restored entry in its place."""
+
+    def __init__(
+        self,
+        stock_ledger,
+        stock_symbol: str,
+        number_of_shares: int,
+        run_costs: Sequence[float],
+        run_quantities: Sequence[int],
+    ) -> None:
+        self.symbol = stock_symbol
+        self._stock_ledger = stock_ledger
+        self._number_of_shares = number_of_shares
+        self._run_costs = run_costs
+        self._run_quantities = run_quantities
+        self._entry = None
+
+    def __len__(self) -> int:  # O(1)
+        if self._entry is None:
+            return self._number_of_shares
+        return len(self._entry)
+
+    def __eq__(self, other) -> bool:
+        return self.materialize() == other
+
+    def __getattr__(self, name: str):
+        return getattr(self.materialize(), name)
+
+    def materialize(self):  # O(runs) for lots, O(shares) otherwise
+        if self._entry is not None:
+            return self._entry
+        stock_ledger = self._stock_ledger
+        entry = stock_ledger._new_entry(self.symbol)
+        for cost, quantity in zip(self._run_costs, self._run_quantities):
+            stock_ledger._add_shares(entry, self.symbol, quantity, cost)
+        self._entry = entry
+        self._run_costs = self._run_quantities = None
+        if stock_ledger._entries_by_symbol.get(self.symbol) is self:
+            stock_ledger._replace_entry(self.symbol, entry)
+        return entry
+
+
+def entry_runs(entry) -> list[tuple[float, int]]:  # O(runs) or O(shares)
+    """Returns (cost, quantity) for each run of equal cost shares of entry, front to back; a LedgerEntry is read by a full turn of increment_entry, which leaves it as it was."""
+    if isinstance(entry, LazyLedgerEntry) and entry._entry is None:
+        return list(zip(entry._run_costs, entry._run_quantities))
+    if hasattr(entry, "runs"):
+        return entry.runs()
+    out_runs = []
+    for s_i in range(len(entry)):
+        cost = entry.peek().cost
+        if out_runs and out_runs[-1][0] == cost:
+            out_runs[-1] = (cost, out_runs[-1][1] + 1)
+        else:
+            out_runs.append((cost, 1))
+        entry.increment_entry()
+    return out_runs
+
+
+def _rng_state(rng) -> tuple[array, dict]:  # O(1)
+    if isinstance(rng, SystemRandom) or not isinstance(rng, Random):
+        return array("Q"), {"rng": None}
+    version, internal_state, gauss_next = rng.getstate()
+    return array("Q", internal_state), {
+        "rng": {"version": version, "gauss_next": gauss_next}
+    }
+
+
+def _restored_rng(snapshot_file: SnapshotFile, prefix: str):  # O(1)
+    rng_meta = snapshot_file.meta[prefix + "rng"]
+    if rng_meta is None:
+        return None
+    rng = Random()
+    rng.setstate(
+        (
+            rng_meta["version"],
+            tuple(snapshot_file.array(prefix + "rng_state")),
+            rng_meta["gauss_next"],
+        )
+    )
+    return rng
+
+
+def ledger_arrays(
+    stock_ledger, prefix: str = ""
+) -> tuple[dict[str, array], dict]:  # O(runs) or O(shares)
+    """Returns the arrays and meta of a snapshot of stock_ledger: per entry (in ledger order) its share count and runs of (cost, quantity) in deque order, and its options and rng state."""
+    entry_run_counts = array("q")
+    entry_shares = array("q")
+    run_costs = array("d")
+    run_quantities = array("q")
+    for each_entry in stock_ledger.ledger_entries:
+        each_runs = entry_runs(each_entry)
+        entry_run_counts.append(len(each_runs))
+        entry_shares.append(stock_ledger.number_of_shares(each_entry.symbol))
+        for cost, quantity in each_runs:
+            run_costs.append(cost)
+            run_quantities.append(quantity)
+    rng_state, rng_meta = _rng_state(stock_ledger.rng)
+    deque_type = getattr(
+        stock_ledger, "_uncounted_deque_type", stock_ledger.deque_type
+    )
+    meta = {
+        "symbols": [each.symbol for each in stock_ledger.ledger_entries],
+        "lot_based": stock_ledger.lot_based,
+        "cost_index": stock_ledger.cost_index,
+        "cost_fingerprint": stock_ledger._cost_hashes is not None,
+        "deque_type": deque_type.__name__,
+        "rng": rng_meta["rng"],
+    }
+    arrays = {
+        "entry_run_counts": entry_run_counts,
+        "entry_shares": entry_shares,
+        "run_costs": run_costs,
+        "run_quantities": run_quantities,
+        "rng_state": rng_state,
+    }
+    return (
+        {prefix + name: each_array for name, each_array in arrays.items()},
+        {prefix + name: value for name, value in meta.items()},
+    )
+
+
+def ledger_options(snapshot_file: SnapshotFile, prefix: str = "") -> dict:
+    """Returns the StockLedger keyword arguments saved in snapshot_file."""
+    meta = snapshot_file.meta
+    return {
+        "lot_based": meta[prefix + "lot_based"],
+        "cost_index": meta[prefix + "cost_index"],
+        "rng": _restored_rng(snapshot_file, prefix),
+        "deque_type": DEQUE_TYPES.get(meta[prefix + "deque_type"], LinkedDeque),
+        "cost_fingerprint": meta.get(prefix + "cost_fingerprint", False),
+    }
+
+
+def restore_ledger(
+    stock_ledger, snapshot_file: SnapshotFile, prefix: str = "", lazy=True
+) -> None:  # O(entries) when lazy
+    """Adds the entries of snapshot_file to an empty stock_ledger, as LazyLedgerEntrys (restored when first used) when lazy."""
+    entry_run_counts = snapshot_file.array(prefix + "entry_run_counts")
+    entry_shares = snapshot_file.array(prefix + "entry_shares")
+    run_costs = snapshot_file.array(prefix + "run_costs")
+    run_quantities = snapshot_file.array(prefix + "run_quantities")
+    run_start = 0
+    for e_i, stock_symbol in enumerate(snapshot_file.meta[prefix + "symbols"]):
+        run_end = run_start + entry_run_counts[e_i]
+        restore_entry(
+            stock_ledger,
+            stock_symbol,
+            entry_shares[e_i],
+            run_costs[run_start:run_end],
+            run_quantities[run_start:run_end],
+            lazy,
+        )
+        run_start = run_end
+
+
+def restore_entry(
+    stock_ledger,
+    stock_symbol: str,
+    number_of_shares: int,
+    run_costs: Sequence[float],
+    run_quantities: Sequence[int],
+    lazy: bool = True,
+) -> None:  # O(runs), O(1) more when lazy
+    """Adds an entry for stock_symbol to stock_ledger, with its shares as runs of (cost, quantity) in deque order, as a LazyLedgerEntry when lazy."""
+    entry = LazyLedgerEntry(
+        stock_ledger, stock_symbol, number_of_shares, run_costs, run_quantities
+    )
+    stock_ledger._register_entry(stock_symbol, entry, number_of_shares)
+    for cost, quantity in zip(run_costs, run_quantities):
+        stock_ledger._count_costs(stock_symbol, cost, quantity)
+    if not lazy:
+        entry.materialize()
+
+
+def sales_arrays(
+    stock_sales_list: list[LotStockSale], symbols: list[str]
+) -> dict[str, array]:  # O(sale lots)
+    """Returns arrays of stock_sales_list: each sale's symbol (index into symbols), quantity, price, total cost, and runs of (cost, quantity) of the shares sold, in order."""
+    symbol_ids = {stock_symbol: s_i for s_i, stock_symbol in enumerate(symbols)}
+    sale_symbol_ids = array("q")
+    sale_quantities = array("q")
+    sale_prices = array("d")
+    sale_total_costs = array("d")
+    sale_run_counts = array("q")
+    sale_run_costs = array("d")
+    sale_run_quantities = array("q")
+    for each_sale in stock_sales_list:
+        sale_symbol_ids.append(symbol_ids[each_sale.symbol])
+        sale_quantities.append(each_sale.quantity)
+        sale_prices.append(each_sale.price)
+        sale_total_costs.append(each_sale.total_cost())
+        for each_lot in each_sale.lots:
+            sale_run_costs.append(each_lot.cost)
+            sale_run_quantities.append(each_lot.quantity)
+        sale_run_counts.append(len(each_sale.lots))
+    return {
+        "sale_symbol_ids": sale_symbol_ids,
+        "sale_quantities": sale_quantities,
+        "sale_prices": sale_prices,
+        "sale_total_costs": sale_total_costs,
+        "sale_run_counts": sale_run_counts,
+        "sale_run_costs": sale_run_costs,
+        "sale_run_quantities": sale_run_quantities,
+    }
+
+
+def sales_from_arrays(
+    sale_arrays: dict[str, Sequence], symbols: list[str]
+) -> list[LotStockSale]:  # O(sale lots)
+    """Returns the sales encoded by sales_arrays; each sale keeps its recorded total cost (when there is one), so its profit is exactly the original's, whatever order its lots were summed in."""
+    stock_sales_list = []
+    sale_run_costs = sale_arrays["sale_run_costs"]
+    sale_run_quantities = sale_arrays["sale_run_quantities"]
+    sale_total_costs = sale_arrays.get("sale_total_costs")
+    run_start = 0
+    for sale_i, (symbol_id, quantity, price, run_count) in enumerate(
+        zip(
+            sale_arrays["sale_symbol_ids"],
+            sale_arrays["sale_quantities"],
+            sale_arrays["sale_prices"],
+            sale_arrays["sale_run_counts"],
+        )
+    ):
+        sale = LotStockSale(symbols[symbol_id], quantity, price)
+        for r_i in range(run_start, run_start + run_count):
+            sale.add_sale(
+                StockPurchase(symbols[symbol_id], sale_run_costs[r_i]),
+                sale_run_quantities[r_i],
+            )
+        if sale_total_costs is not None:
+            sale._total_cost = sale_total_costs[sale_i]
+        run_start += run_count
+        stock_sales_list.append(sale)
+    return stock_sales_list
+
+
+def restore_sales(
+    snapshot_file: SnapshotFile, symbols: list[str]
+) -> list[LotStockSale]:  # O(sale lots)
+    return sales_from_arrays(
+        {
+            name: snapshot_file.array(name)
+            for name in (
+                "sale_symbol_ids",
+                "sale_quantities",
+                "sale_prices",
+                "sale_total_costs",
+                "sale_run_counts",
+                "sale_run_costs",
+                "sale_run_quantities",
+            )
+            if name in snapshot_file
+        },
+        symbols,
+    )
@@ -1,11 +1,97 @@
+import os
+import time
+import weakref
+from collections.abc import Sequence
+from functools import lru_cache
+from hashlib import blake2b
+from package.latency import LatencyRecorder
 from package.ledger_entry import LedgerEntry
+from package.linked_deque import LinkedDeque
+from package.lot_ledger_entry import LotLedgerEntry, StockLot
+from package.lot_stock_sale import LotStockSale
+from package.operation_counts import (
+    OPERATIONS,
+    SHARE_OPERATIONS,
+    OperationCounts,
+    counting_deque_type,
+    counting_entry_type,
+    counting_purchase_type,
+)
+from package.snapshot import (
+    SnapshotFile,
+    entry_runs,
+    ledger_arrays,
+    ledger_options,
+    restore_ledger,
+)
 from package.stock_sale import StockSale, StockPurchase
-from random import SystemRandom
+from random import Random, SystemRandom
+
+_FINGERPRINT_MASK = (1 << 64) - 1
+
+
+@lru_cache(maxsize=1 << 16)
+def _stable_hash(value: str | float) -> int:  # O(1)
+    """Returns a 64 bit hash of value that is the same in every process (unlike hash() of a str)."""
+    return int.from_bytes(
+        blake2b(repr(value).encode(), digest_size=8).digest(), "little"
+    )
+
+
+def _release_shared_entries(shared_entries: dict[str, list[int]]) -> None:
+    """Called when a forked (or forked from) StockLedger is collected: the entries it still shared are shared by one fewer ledger."""
+    for sharing in shared_entries.values():
+        sharing[0] -= 1
 
 
 class StockLedger:
-    def __init__(self) -> None:  # required
+    """lot_based: when True, each LedgerEntry is a LotLedgerEntry, which holds runs of (cost_per_share, quantity) instead of one StockPurchase per share; every buy and sell method gives the same shares and profits either way.\n\ncost_index: for lot_based ledgers, each LotLedgerEntry also keeps a CostIndex: sellOptimal_1 takes lowest cost shares directly from it in O(log n) per cost level, buyOptimal_2 gets the median in O(log n), and sellOptimal_2 gets median_2 in O(1).\n\nrng: the random number generator used by buyRandom and sellRandom; pass a seeded random.Random to make them reproducible (defaults to one SystemRandom). Each random placement rotates a lot_based entry in one rotate_entry call, and a per-share entry one share at a time, the shorter way round.\n\ndeque_type: for lot_based ledgers, the deque class each LotLedgerEntry holds its lots in: LinkedDeque, or RingDeque for a contiguous ring buffer.\n\ncost_fingerprint: when True, the ledger also keeps, per symbol, a hash of the multiset of costs of its shares, for equals(other, costs=True) and diff.\n\noperation_counts: an OperationCounts of entry, deque and StockPurchase operations by strategy, from enable_operation_counts (None when disabled)."""
+
+    STRATEGIES = [
+        "buy",
+        "buyRandom",
+        "buyOptimal_1",
+        "buyOptimal_2",
+        "buyOptimal_3",
+        "sell",
+        "sellRandom",
+        "sellOptimal_1",
+        "sellOptimal_2",
+        "sellOptimal_3",
+    ]
+    BUY_STRATEGIES = STRATEGIES[:5]  # in order of TradingBot.buy_setting
+    SELL_STRATEGIES = STRATEGIES[5:]  # and of TradingBot.sell_setting
+    RANDOM_STRATEGIES = ["buyRandom", "sellRandom"]  # draw from rng per order
+    # buying q1 then q2 shares of a symbol at one price with these leaves
+    # the entry as buying q1 + q2 at once does
+    COALESCING_STRATEGIES = ["buy", "buyOptimal_3"]
+
+    def __init__(
+        self,
+        lot_based: bool = False,
+        cost_index: bool = False,
+        rng: Random | None = None,
+        deque_type: type = LinkedDeque,
+        cost_fingerprint: bool = False,
+    ) -> None:  # required
         self.ledger_entries = []
+        self.lot_based = lot_based
+        self.cost_index = cost_index
+        self.rng = SystemRandom() if rng is None else rng
+        self.deque_type = deque_type
+        self._entries_by_symbol = {}  # ledger entry by symbol
+        self._positions_by_symbol = {}  # position in ledger_entries by symbol
+        self._shares_by_symbol = {}  # kept up to date by open_entry, open_sale
+        self._fingerprint = 0  # sum of _stable_hash(symbol) * (shares + 1)
+        self._cost_hashes = {} if cost_fingerprint else None  # by symbol, sum
+        # of _stable_hash(cost) over shares
+        self.operation_counts = None
+        self.entry_type = LedgerEntry  # types made by open_entry, _add_shares
+        self.lot_entry_type = LotLedgerEntry
+        self.purchase_type = StockPurchase
+        self.sale_type = LotStockSale  # made by open_sale
+        self._shared_entries = {}  # by symbol, [number of ledgers sharing it]
+        self._releases_shared = False  # whether fork registered a finalizer
 
     def __len__(self):
         return len(self.ledger_entries)
@@ -13,16 +99,29 @@ class StockLedger:
     def __getitem__(self, index) -> LedgerEntry:
         return self.ledger_entries[index]
 
-    def __str__(self) -> str:  # O(N=total shares)
-        out_string = "Total shares:"
-        for each_entry in self.ledger_entries:
-            out_string += (
-                f"\n{each_entry.symbol}:"
-                f" {self.number_of_shares(each_entry.symbol)} shares"
-            )
-        return out_string
+    def __str__(self) -> str:  # O(number of entries)
+        return "\n".join(
+            ["Total shares:"]
+            + [
+                f"{each_entry.symbol}:"
+                f" {self._shares_by_symbol[each_entry.symbol]} shares"
+                for each_entry in self.ledger_entries
+            ]
+        )
 
-    def equals(self, other) -> bool:
+    def equals(self, other, costs: bool = False) -> bool:
+        """Returns whether other has the same number of shares of the same stock symbols: O(1) when fingerprints differ, O(symbols) otherwise; when costs, and both keep cost fingerprints, the costs of shares of each symbol are compared too (by hash)."""
+        if isinstance(other, StockLedger):
+            return (
+                self._fingerprint == other._fingerprint
+                and self._shares_by_symbol == other._shares_by_symbol
+                and (
+                    not costs
+                    or self._cost_hashes is None
+                    or other._cost_hashes is None
+                    or self._cost_hashes == other._cost_hashes
+                )
+            )
         self_in_other_bool = True  # use any, and all
         other_in_self_bool = True
         self_string = str(self)
@@ -38,19 +137,190 @@ class StockLedger:
         # might be a better comparison)
         return self_in_other_bool and other_in_self_bool
 
-    def open_entry(self, stock_symbol: str) -> LedgerEntry:  # O(1)
+    def fingerprint(self) -> tuple[int, int | None]:  # O(1), O(symbols)
+        """Returns (a hash of the number of shares of each symbol, kept up to date in O(1) per trade, and a hash of the costs of all shares, or None without cost_fingerprint); equal ledgers have equal fingerprints."""
+        if self._cost_hashes is None:
+            return self._fingerprint, None
+        return (
+            self._fingerprint,
+            sum(self._cost_hashes.values()) & _FINGERPRINT_MASK,
+        )
+
+    def diff(self, other: "StockLedger") -> list[str]:  # O(symbols)
+        """Returns a line for each stock symbol held differently in other (number of shares, or, with cost fingerprints, costs), empty when equal."""
+        differences = []
+        for stock_symbol in dict.fromkeys(
+            list(self._shares_by_symbol) + list(other._shares_by_symbol)
+        ):
+            shares = self._shares_by_symbol.get(stock_symbol)
+            other_shares = other._shares_by_symbol.get(stock_symbol)
+            if shares != other_shares:
+                differences.append(
+                    f"{stock_symbol}:"
+                    f" {'no entry' if shares is None else f'{shares} shares'},"
+                    " other: "
+                    + (
+                        "no entry"
+                        if other_shares is None
+                        else f"{other_shares} shares"
+                    )
+                )
+            elif (
+                self._cost_hashes is not None
+                and other._cost_hashes is not None
+                and self._cost_hashes.get(stock_symbol)
+                != other._cost_hashes.get(stock_symbol)
+            ):
+                differences.append(
+                    f"{stock_symbol}: {shares} shares, other: {other_shares}"
+                    " shares of different costs"
+                )
+        return differences
+
+    def _register_entry(
+        self, stock_symbol: str, entry: LedgerEntry, shares: int = 0
+    ) -> None:  # O(1)
+        self._positions_by_symbol[stock_symbol] = len(self.ledger_entries)
+        self.ledger_entries.append(entry)
+        self._entries_by_symbol[stock_symbol] = entry
+        self._shares_by_symbol[stock_symbol] = 0
+        if self._cost_hashes is not None:
+            self._cost_hashes[stock_symbol] = 0
+        self._fingerprint = (
+            self._fingerprint + _stable_hash(stock_symbol)
+        ) & _FINGERPRINT_MASK
+        self._count_shares(stock_symbol, shares)
+
+    def _count_shares(self, stock_symbol: str, change: int) -> None:  # O(1)
+        self._shares_by_symbol[stock_symbol] += change
+        self._fingerprint = (
+            self._fingerprint + _stable_hash(stock_symbol) * change
+        ) & _FINGERPRINT_MASK
+
+    def _count_costs(
+        self, stock_symbol: str, cost_per_share: float, change: int
+    ) -> None:  # O(1)
+        if self._cost_hashes is not None:
+            self._cost_hashes[stock_symbol] = (
+                self._cost_hashes[stock_symbol]
+                + _stable_hash(float(cost_per_share)) * change
+            ) & _FINGERPRINT_MASK
+
+    def _close_sale(self, sale: StockSale | None) -> StockSale | None:
+        """Returns sale, taking the costs of its shares out of the cost fingerprint (O(lots), when kept)."""
+        if sale is not None and self._cost_hashes is not None:
+            for each_lot in sale.lots:
+                self._count_costs(
+                    sale.symbol, each_lot.cost, -each_lot.quantity
+                )
+        return sale
+
+    def _new_entry(self, stock_symbol: str) -> LedgerEntry:  # O(1)
+        if self.lot_based:
+            return self.lot_entry_type(
+                stock_symbol, self.cost_index, self.deque_type
+            )
+        return self.entry_type(stock_symbol)
+
+    def _replace_entry(
+        self, stock_symbol: str, entry: LedgerEntry
+    ) -> None:  # O(1)
+        self._entries_by_symbol[stock_symbol] = entry
+        self.ledger_entries[self._positions_by_symbol[stock_symbol]] = entry
+
+    def _writable_entry(self, stock_symbol: str) -> LedgerEntry | None:
+        """Returns the entry for stock_symbol (None if there is none), first replacing it by a copy (O(lots) for lots, O(shares) otherwise) if another ledger forked from or with this one still shares it."""
+        entry = self._entries_by_symbol.get(stock_symbol)
+        sharing = self._shared_entries.pop(stock_symbol, None)
+        if sharing is not None:
+            sharing[0] -= 1
+            if sharing[0] > 0:
+                entry_copy = self._new_entry(stock_symbol)
+                if isinstance(entry, LotLedgerEntry):
+                    entry.copy_to(entry_copy)
+                else:  # a LedgerEntry, or a LazyLedgerEntry (from its runs)
+                    for cost, quantity in entry_runs(entry):
+                        self._add_shares(
+                            entry_copy, stock_symbol, quantity, cost
+                        )
+                self._replace_entry(stock_symbol, entry_copy)
+                entry = entry_copy
+        return entry
+
+    def fork(self) -> "StockLedger":  # O(symbols)
+        """Returns a StockLedger with the same options, shares and rng state (a copy, for a random.Random) as this one, sharing its entries: whichever of the two ledgers first changes a shared entry copies it (see _writable_entry), so forking costs O(symbols) and each ledger only pays for the entries it changes. Operations of the fork are not counted."""
+        rng = self.rng
+        if isinstance(rng, Random) and not isinstance(rng, SystemRandom):
+            rng = Random()
+            rng.setstate(self.rng.getstate())
+        forked_ledger = StockLedger(
+            self.lot_based,
+            self.cost_index,
+            rng,
+            self.__dict__.get("_uncounted_deque_type", self.deque_type),
+            self._cost_hashes is not None,
+        )
+        forked_ledger.ledger_entries = list(self.ledger_entries)
+        forked_ledger._entries_by_symbol = dict(self._entries_by_symbol)
+        forked_ledger._positions_by_symbol = dict(self._positions_by_symbol)
+        forked_ledger._shares_by_symbol = dict(self._shares_by_symbol)
+        forked_ledger._fingerprint = self._fingerprint
+        if self._cost_hashes is not None:
+            forked_ledger._cost_hashes = dict(self._cost_hashes)
+        for stock_symbol in self._entries_by_symbol:
+            sharing = self._shared_entries.get(stock_symbol)
+            if sharing is None:
+                sharing = self._shared_entries[stock_symbol] = [1]
+            sharing[0] += 1
+            forked_ledger._shared_entries[stock_symbol] = sharing
+        for each_ledger in (self, forked_ledger):
+            if not each_ledger._releases_shared:
+                weakref.finalize(
+                    each_ledger,
+                    _release_shared_entries,
+                    each_ledger._shared_entries,
+                )
+                each_ledger._releases_shared = True
+        return forked_ledger
+
+    def preview_sell(
+        self,
+        stock_symbol: str,
+        quantity: int,
+        price: float,
+        strategies: Sequence[str] = SELL_STRATEGIES,
+    ) -> dict[str, float | None]:  # O(strategies * (symbols + sell))
+        """Returns the profit each sell strategy (names in STRATEGIES) would realize selling quantity shares of stock_symbol at price, each on its own fork, leaving this ledger (and its rng) as it was; None for every strategy when the sale could not be filled."""
+        if quantity > self.number_of_shares(stock_symbol):
+            return dict.fromkeys(strategies)
+        profits = {}
+        for each_strategy in strategies:
+            sale = getattr(self.fork(), each_strategy)(
+                stock_symbol, quantity, price
+            )
+            profits[each_strategy] = None if sale is None else sale.get_profit()
+        return profits
+
+    def open_entry(
+        self,
+        stock_symbol: str,
+        shares_bought: int = 0,
+        cost_per_share: float | None = None,
+    ) -> LedgerEntry:  # O(1)
+        """Returns the LedgerEntry for stock_symbol, making one if needed, and counts shares_bought (of cost_per_share, for the cost fingerprint) toward its number of shares."""
         if not self.contains(stock_symbol):
-            self.ledger_entries.append(LedgerEntry(stock_symbol))
-            entry = self.ledger_entries[-1]
-        else:
-            entry = self.get_entry(stock_symbol)
+            self._register_entry(stock_symbol, self._new_entry(stock_symbol))
+        entry = self._writable_entry(stock_symbol)
+        self._count_shares(stock_symbol, shares_bought)
+        if cost_per_share is not None:
+            self._count_costs(stock_symbol, cost_per_share, shares_bought)
         return entry
 
     def open_sale(
         self, stock_symbol: str, quantity: int, price: float
     ) -> tuple[StockSale | None, LedgerEntry | None]:  # O(number of shares)
-        sale = StockSale(stock_symbol, quantity, price)
-        sell_entry = self.get_entry(stock_symbol)  # O(number of entries)
+        sale = self.sale_type(stock_symbol, quantity, price)
+        sell_entry = self._writable_entry(stock_symbol)  # O(1) unless shared
         if sell_entry is None:
             print(
                 f"Stock symbol not found for {quantity} shares of"
@@ -58,99 +328,172 @@ class StockLedger:
             )  # maybe instead of these, have client code making sense of
             # returned values including some error code
             sale = None
-        elif quantity > len(sell_entry):  # O(len(sell_entry))
+        elif quantity > self._shares_by_symbol[stock_symbol]:  # O(1)
             print(
                 f"Cannot fill quantity of sale: {quantity} shares of"
                 f" {stock_symbol}. len(sell_entry) == {len(sell_entry)}"
             )
             sale = None
+        else:  # every sell method fills the sale
+            self._count_shares(stock_symbol, -quantity)
         return sale, sell_entry
 
+    def _add_shares(
+        self,
+        entry: LedgerEntry,
+        stock_symbol: str,
+        shares_bought: int,
+        cost_per_share: float,
+        to_front: bool = False,
+    ) -> None:  # O(1) for lots, O(shares_bought) otherwise
+        if self.lot_based:
+            if to_front:
+                entry.add_purchase_front(
+                    self.purchase_type(stock_symbol, cost_per_share),
+                    shares_bought,
+                )
+            else:
+                entry.add_purchase(
+                    self.purchase_type(stock_symbol, cost_per_share),
+                    shares_bought,
+                )
+        else:
+            for share in range(shares_bought):
+                if to_front:
+                    entry.add_purchase_front(
+                        self.purchase_type(stock_symbol, cost_per_share)
+                    )
+                else:
+                    entry.add_purchase(
+                        self.purchase_type(stock_symbol, cost_per_share)
+                    )
+
+    def _increment_entry(
+        self, entry: LedgerEntry, steps: int
+    ) -> None:  # O(lots moved) for lots, O(min(steps, N - steps)) otherwise
+        """Rotates entry by steps shares, front to back. Only a LotLedgerEntry is rotated in one call (rotate_entry); a LedgerEntry is still moved one share per increment_entry (or decrement_entry) call, as its LinkedDeque has no rotate, but only as many as the shorter way round needs."""
+        if self.lot_based:
+            entry.rotate_entry(steps)
+            return
+        entry_length = len(entry)
+        if entry_length == 0:
+            return
+        steps %= entry_length  # a full cycle leaves the deque as-is
+        if steps <= entry_length // 2:
+            for step in range(steps):
+                entry.increment_entry()
+        else:
+            for step in range(entry_length - steps):
+                entry.decrement_entry()
+
+    def _add_sales(
+        self,
+        sale: StockSale,
+        entry: LedgerEntry,
+        quantity: int,
+        cost: float | None = None,
+    ) -> int:  # O(quantity)
+        """Sells up to quantity shares from the front of entry (while their cost is cost, if given), returns the number of shares sold."""
+        if not self.lot_based:
+            for s_i in range(quantity):
+                if cost is not None and entry.peek().cost != cost:
+                    return s_i
+                sale.add_sale(entry.remove_purchase())
+            return quantity
+        return self._add_lot_sales(sale, entry.remove_lots(quantity, cost))
+
+    def _add_lot_sales(
+        self, sale: StockSale, sold_lots: list[StockLot]
+    ) -> int:  # O(len(sold_lots))
+        sold = 0
+        for each_lot in sold_lots:
+            sale.add_sale(each_lot.purchase, each_lot.quantity)
+            sold += each_lot.quantity
+        return sold
+
     def buy(
         self, stock_symbol: str, shares_bought: int, cost_per_share: float
     ) -> None:  # required  # O(shares_bought)
-        buy_entry = self.open_entry(stock_symbol)
-        for share in range(shares_bought):
-            buy_entry.add_purchase(StockPurchase(stock_symbol, cost_per_share))
+        buy_entry = self.open_entry(
+            stock_symbol, shares_bought, cost_per_share
+        )
+        self._add_shares(
+            buy_entry, stock_symbol, shares_bought, cost_per_share
+        )
 
     def buyRandom(
         self, stock_symbol: str, shares_bought: int, cost_per_share: float
     ) -> None:  # O(N) = O(N) * O(quantity)
-        buy_entry = self.open_entry(stock_symbol)
+        buy_entry = self.open_entry(
+            stock_symbol, shares_bought, cost_per_share
+        )
         for s_i in range(shares_bought):  # O(shares_to_buy) * O(len(buy_entry))
-            for s_j in range(
-                SystemRandom().randint(0, len(buy_entry) - s_i)
-            ):  # O(N)
-                buy_entry.increment_entry()
-            if SystemRandom().random() >= 0.5:
-                buy_entry.add_purchase(
-                    StockPurchase(stock_symbol, cost_per_share)
-                )
-            else:
-                buy_entry.add_purchase_front(
-                    StockPurchase(stock_symbol, cost_per_share)
-                )
+            self._increment_entry(
+                buy_entry, self.rng.randint(0, len(buy_entry) - s_i)
+            )  # O(N)
+            self._add_shares(
+                buy_entry,
+                stock_symbol,
+                1,
+                cost_per_share,
+                to_front=self.rng.random() < 0.5,
+            )
 
     def buyOptimal_1(
         self, stock_symbol: str, shares_bought: int, cost_per_share: float
     ) -> None:  # O(N)
         """buyOptimal_1 uses a method of LedgerEntry to position the data_portions such that addition places data in ascending order, then after use of an additional method of LedgerEntry that positions the deque such that the front is less than or equal to back, the deque is ascending order."""
-        buy_entry = self.open_entry(stock_symbol)
+        buy_entry = self.open_entry(
+            stock_symbol, shares_bought, cost_per_share
+        )
         buy_entry.position_entry_add_between(cost_per_share)
-        for share in range(shares_bought):
-            buy_entry.add_purchase(
-                StockPurchase(stock_symbol, cost_per_share)
-            )  # COULD DO: centralize all add_purchase buys to a single buy
-            # method
+        self._add_shares(
+            buy_entry, stock_symbol, shares_bought, cost_per_share
+        )
         buy_entry.align_head_tail()
 
     def buyOptimal_2(
         self, stock_symbol: str, shares_bought: int, cost_per_share: float
     ) -> None:  # O(N^2)
         """buyOptimal_2 uses a method of LedgerEntry to get the median data_portion, and adds lower cost shares to the front, and equal or greater cost shares to the back."""
-        buy_entry = self.open_entry(stock_symbol)
+        buy_entry = self.open_entry(
+            stock_symbol, shares_bought, cost_per_share
+        )
         if len(buy_entry) == 0:
-            for share in range(shares_bought):
-                buy_entry.add_purchase(
-                    StockPurchase(stock_symbol, cost_per_share)
-                )
+            self._add_shares(
+                buy_entry, stock_symbol, shares_bought, cost_per_share
+            )
         else:
-            if (
-                cost_per_share >= buy_entry.median()
-            ):  # idea: interesting design problem, chain together one or more
-                # pairs of buy and sell methods (do by instance field assigned
-                # None or object) but not all of them
-                for share in range(shares_bought):
-                    buy_entry.add_purchase(
-                        StockPurchase(stock_symbol, cost_per_share)
-                    )
-            else:
-                for share in range(shares_bought):
-                    buy_entry.add_purchase_front(
-                        StockPurchase(stock_symbol, cost_per_share)
-                    )
+            # idea: interesting design problem, chain together one or more
+            # pairs of buy and sell methods (do by instance field assigned
+            # None or object) but not all of them
+            self._add_shares(
+                buy_entry,
+                stock_symbol,
+                shares_bought,
+                cost_per_share,
+                to_front=cost_per_share < buy_entry.median(),
+            )
 
     def buyOptimal_3(
         self, stock_symbol: str, shares_bought: int, cost_per_share: float
     ) -> None:  # O(1) = O(shares bought)
         """buyOptimal_3 makes an O(1) comparison to the back of the deque, adding to the front if the cost_per_share is less than the back cost."""
-        buy_entry = self.open_entry(stock_symbol)
+        buy_entry = self.open_entry(
+            stock_symbol, shares_bought, cost_per_share
+        )
         if len(buy_entry) == 0:
-            for share in range(shares_bought):
-                buy_entry.add_purchase(
-                    StockPurchase(stock_symbol, cost_per_share)
-                )
+            self._add_shares(
+                buy_entry, stock_symbol, shares_bought, cost_per_share
+            )
         else:
-            if cost_per_share >= buy_entry.peek_back().cost:
-                for share in range(shares_bought):
-                    buy_entry.add_purchase(
-                        StockPurchase(stock_symbol, cost_per_share)
-                    )
-            else:
-                for share in range(shares_bought):
-                    buy_entry.add_purchase_front(
-                        StockPurchase(stock_symbol, cost_per_share)
-                    )
+            self._add_shares(
+                buy_entry,
+                stock_symbol,
+                shares_bought,
+                cost_per_share,
+                to_front=cost_per_share < buy_entry.peek_back().cost,
+            )
 
     def sell(
         self, stock_symbol: str, quantity: int, price: float
@@ -158,9 +501,8 @@ class StockLedger:
         """sell uses remove_purchase() to get a StockPurchase"""
         sale, sell_entry = self.open_sale(stock_symbol, quantity, price)
         if sale is not None:
-            for s_i in range(quantity):  # O(quantity)
-                sale.add_sale(sell_entry.remove_purchase())  # O(1)
-        return sale
+            self._add_sales(sale, sell_entry, quantity)  # O(quantity)
+        return self._close_sale(sale)
 
     def sellRandom(
         self, stock_symbol: str, quantity: int, price: float
@@ -171,28 +513,35 @@ class StockLedger:
             # O(N)
             sell_entry_length = len(sell_entry)  # O(N)
             for s_i in range(quantity):  # O(quantity)
-                for s_j in range(
-                    SystemRandom().randrange(1, sell_entry_length * 2)
-                ):  # O(N) = O(2N)
-                    sell_entry.increment_entry()
-                sale.add_sale(
-                    sell_entry.remove_purchase()
+                self._increment_entry(
+                    sell_entry,
+                    self.rng.randrange(1, sell_entry_length * 2),
+                )  # O(N) = O(2N)
+                self._add_sales(
+                    sale, sell_entry, 1
                 )  # removes from front  # O(1)
-        return sale
+        return self._close_sale(sale)
 
     def sellOptimal_1(
         self, stock_symbol: str, quantity: int, price: float
     ) -> None:  # O(N)
         """sellOptimal_1 sells the lowest cost shares first"""
         sale, sell_entry = self.open_sale(stock_symbol, quantity, price)
+        if sale is None:
+            return None
+        if self.lot_based and self.cost_index:  # O(log n) per cost level
+            self._add_lot_sales(sale, sell_entry.remove_lowest_cost(quantity))
+            return self._close_sale(sale)
         while not sale.is_filled():  # O(N) = O(N) * quantity  # fill the sale
-            if sale.quantity - len(sale) == self.number_of_shares(
-                stock_symbol
-            ):  # O(N)
-                for s_i in range(sale.quantity - len(sale)):
-                    sale.add_sale(sell_entry.remove_purchase())
-                    # if the currently required quantity is equal to the number
-                    # of shares, all must be sold
+            if sale.quantity - len(sale) == len(sell_entry):  # O(N)
+                self._add_sales(sale, sell_entry, sale.quantity - len(sale))
+                # if the currently required quantity is equal to the number
+                # of shares, all must be sold
+            elif self.lot_based:  # O(lots) per cost level
+                lowest_cost = sell_entry.position_entry_lowest_cost()
+                self._add_sales(
+                    sale, sell_entry, sale.quantity - len(sale), lowest_cost
+                )
             else:
                 lowest_cost_share = (
                     sell_entry.peek()
@@ -227,12 +576,13 @@ class StockLedger:
                     ):  # O(N) = O(N/2)
                         sell_entry.decrement_entry()
                 # add sales of current lowest cost
-                while (
-                    not sale.is_filled()
-                    and sell_entry.peek().cost == lowest_cost_share.cost
-                ):
-                    sale.add_sale(sell_entry.remove_purchase())
-        return sale
+                self._add_sales(
+                    sale,
+                    sell_entry,
+                    sale.quantity - len(sale),
+                    lowest_cost_share.cost,
+                )
+        return self._close_sale(sale)
 
     def sellOptimal_2(
         self, stock_symbol: str, quantity: int, price: float
@@ -247,6 +597,9 @@ class StockLedger:
             ):  # this loop will not run indefinitely
                 # (number of shares >= quantity)
                 current_median = sell_entry.median_2()  # O(N)
+                if self.lot_based:
+                    self._visit_lots_up_to(sale, sell_entry, current_median)
+                    continue
                 for t_j in range(
                     len(sell_entry)
                 ):  # must visit up to each data_portion
@@ -260,7 +613,26 @@ class StockLedger:
                         )  # add to sale, remove from front
                     else:
                         sell_entry.increment_entry()  # or add to back of deque
-        return sale
+        return self._close_sale(sale)
+
+    def _visit_lots_up_to(
+        self, sale: StockSale, sell_entry: LotLedgerEntry, current_median: float
+    ) -> None:  # O(lots)
+        """One pass of sellOptimal_2 over lots: visits len(sell_entry) shares from the front, selling those of cost up to current_median and moving the others to the back."""
+        shares_to_visit = len(sell_entry)
+        while shares_to_visit > 0 and not sale.is_filled():
+            front_lot = sell_entry.peek_lot()
+            if front_lot.cost <= current_median:
+                shares_to_visit -= self._add_sales(
+                    sale,
+                    sell_entry,
+                    min(shares_to_visit, sale.quantity - len(sale)),
+                    front_lot.cost,
+                )
+            else:
+                shares_moved = min(shares_to_visit, front_lot.quantity)
+                sell_entry.increment_entry(shares_moved)
+                shares_to_visit -= shares_moved
 
     def sellOptimal_3(
         self, stock_symbol: str, quantity: int, price: float
@@ -274,12 +646,185 @@ class StockLedger:
                 not sale.is_filled()
             ):  # this loop will not run indefinitely
                 # (number of shares >= quantity)
+                if self.lot_based:  # sells a whole run of the lower cost lot
+                    self._sell_lower_cost_end(sale, sell_entry)
+                    continue
                 if (
                     sell_entry.peek() > sell_entry.peek_back()
                 ):  # StockPurchase has __lt__ method
                     sell_entry.decrement_entry()
                 sale.add_sale(sell_entry.remove_purchase())
-        return sale
+        return self._close_sale(sale)
+
+    def _sell_lower_cost_end(
+        self, sale: StockSale, sell_entry: LotLedgerEntry
+    ) -> None:  # O(1)
+        """Sells the lower cost of the front and back lots, as many shares as sellOptimal_3 would sell from that end before comparing again."""
+        if sell_entry.peek() > sell_entry.peek_back():
+            # decrement_entry() then remove_purchase() sells from the back
+            self._add_lot_sales(
+                sale,
+                sell_entry.remove_lots_back(
+                    min(
+                        sale.quantity - len(sale),
+                        sell_entry.peek_back_lot().quantity,
+                    )
+                ),
+            )
+        else:
+            self._add_sales(
+                sale,
+                sell_entry,
+                min(sale.quantity - len(sale), sell_entry.peek_lot().quantity),
+            )
+
+    def trade_many(
+        self,
+        orders: Sequence[tuple[int, str, int, float]],
+        buy_strategy: str = "buy",
+        sell_strategy: str = "sell",
+        latency_recorder: LatencyRecorder | None = None,
+    ) -> tuple[list[StockSale | None], int, int]:  # O(strategy) per order
+        """Applies each (side, stock symbol, quantity, price) of orders (side 1 for a buy with buy_strategy, -1 for a sell with sell_strategy, names in STRATEGIES), and returns (results in order of orders: None for a buy, the sale or None for a sell; nanoseconds buying; nanoseconds selling).\n\nBoth strategy methods are looked up once, and orders are applied grouped by stock symbol (in order of each symbol's first buy, so new entries are made in the same order as when applied one by one, and in order within a symbol), which leaves the ledger and results as if applied in order, as entries are independent (only messages about unfilled sales may print in another order); with a strategy in RANDOM_STRATEGIES, groups are runs of consecutive orders of a symbol, so rng draws stay in order.\n\nlatency_recorder: when given, records the latency of each order under its strategy and stock symbol, as TradingBot.buy and sell record it."""
+        buy_method = getattr(self, buy_strategy)
+        sell_method = getattr(self, sell_strategy)
+        if (
+            buy_strategy in StockLedger.RANDOM_STRATEGIES
+            or sell_strategy in StockLedger.RANDOM_STRATEGIES
+        ):
+            groups = []
+            for o_i, each_order in enumerate(orders):
+                if groups and orders[groups[-1][0]][1] == each_order[1]:
+                    groups[-1].append(o_i)
+                else:
+                    groups.append([o_i])
+        else:
+            orders_by_symbol = {}
+            first_buys = {}  # stock symbol -> index of its first buy
+            for o_i, each_order in enumerate(orders):
+                if each_order[1] in orders_by_symbol:
+                    orders_by_symbol[each_order[1]].append(o_i)
+                else:
+                    orders_by_symbol[each_order[1]] = [o_i]
+                if each_order[0] == 1 and each_order[1] not in first_buys:
+                    first_buys[each_order[1]] = o_i
+            groups = sorted(
+                orders_by_symbol.values(),
+                key=lambda order_indices: first_buys.get(
+                    orders[order_indices[0]][1], order_indices[0]
+                ),
+            )  # only buys make entries
+        results = [None] * len(orders)
+        buy_ns = sell_ns = 0
+        perf_counter_ns = time.perf_counter_ns
+        record = None if latency_recorder is None else latency_recorder.record
+        for order_indices in groups:
+            start = perf_counter_ns()
+            for o_i in order_indices:
+                side, stock_symbol, quantity, price = orders[o_i]
+                if side == 1:
+                    buy_method(stock_symbol, quantity, price)
+                    end = perf_counter_ns()
+                    buy_ns += end - start
+                    if record is not None:
+                        record(buy_strategy, stock_symbol, end - start)
+                else:
+                    results[o_i] = sell_method(stock_symbol, quantity, price)
+                    end = perf_counter_ns()
+                    sell_ns += end - start
+                    if record is not None:
+                        record(sell_strategy, stock_symbol, end - start)
+                start = end
+        return results, buy_ns, sell_ns
+
+    def buy_many(
+        self, orders: Sequence[tuple[str, int, float]], strategy: str = "buy"
+    ) -> None:  # O(strategy) per order
+        """Buys each (stock symbol, quantity, price) of orders with strategy (see trade_many)."""
+        self.trade_many(
+            [(1, *each_order) for each_order in orders], buy_strategy=strategy
+        )
+
+    def sell_many(
+        self, orders: Sequence[tuple[str, int, float]], strategy: str = "sell"
+    ) -> list[StockSale | None]:  # O(strategy) per order
+        """Sells each (stock symbol, quantity, price) of orders with strategy (see trade_many), and returns the sales (None for a sale that could not be filled) in order of orders."""
+        return self.trade_many(
+            [(-1, *each_order) for each_order in orders],
+            sell_strategy=strategy,
+        )[0]
+
+    def enable_operation_counts(
+        self, operation_counts: OperationCounts | None = None
+    ) -> OperationCounts:  # O(1)
+        """Counts operations (see operation_counts.OPERATIONS) by strategy in operation_counts (a new OperationCounts by default, reporting SHARE_OPERATIONS unless lot_based), which is returned; entries opened before this call are not counted, so call it before trading."""
+        self.operation_counts = (
+            OperationCounts(OPERATIONS if self.lot_based else SHARE_OPERATIONS)
+            if operation_counts is None
+            else operation_counts
+        )
+        self.entry_type = counting_entry_type(
+            LedgerEntry, self.operation_counts
+        )
+        self.lot_entry_type = counting_entry_type(
+            LotLedgerEntry, self.operation_counts
+        )
+        self._uncounted_deque_type = self.deque_type
+        self.deque_type = counting_deque_type(
+            self.deque_type, self.operation_counts
+        )
+        self.purchase_type = counting_purchase_type(self.operation_counts)
+        for each_strategy in StockLedger.STRATEGIES:
+            setattr(
+                self,
+                each_strategy,
+                self._counting(getattr(StockLedger, each_strategy)),
+            )
+        return self.operation_counts
+
+    def _counting(self, strategy_method):
+        """Returns strategy_method bound to self, counting the operations it causes under its name."""
+        operation_counts = self.operation_counts
+        strategy = strategy_method.__name__
+
+        def counted_strategy(stock_symbol, quantity, price):
+            outermost = operation_counts.begin(strategy)
+            try:
+                return strategy_method(self, stock_symbol, quantity, price)
+            finally:
+                if outermost:
+                    operation_counts.end()
+
+        return counted_strategy
+
+    def disable_operation_counts(self) -> OperationCounts | None:  # O(1)
+        """Stops counting operations of strategies (entries opened while counting keep counting their own operations, in outside_strategies), and returns the operation_counts used."""
+        operation_counts = self.operation_counts
+        for each_strategy in StockLedger.STRATEGIES:
+            self.__dict__.pop(each_strategy, None)
+        self.entry_type = LedgerEntry
+        self.lot_entry_type = LotLedgerEntry
+        self.deque_type = self.__dict__.pop(
+            "_uncounted_deque_type", self.deque_type
+        )
+        self.purchase_type = StockPurchase
+        self.operation_counts = None
+        return operation_counts
+
+    def save_snapshot(self, path: str | os.PathLike) -> None:  # O(runs)
+        """Saves the entries of this ledger (runs of cost and quantity, in deque order), its options, and its rng state (for a random.Random) to a compact binary file, for load_snapshot."""
+        arrays, meta = ledger_arrays(self)
+        SnapshotFile.write(path, arrays, meta)
+
+    @classmethod
+    def load_snapshot(
+        cls, path: str | os.PathLike, lazy: bool = True
+    ) -> "StockLedger":  # O(entries) when lazy
+        """Returns the StockLedger saved by save_snapshot; the file is memory mapped, and when lazy each entry is restored the first time it is used."""
+        snapshot_file = SnapshotFile(path)
+        stock_ledger = cls(**ledger_options(snapshot_file))
+        restore_ledger(stock_ledger, snapshot_file, lazy=lazy)
+        return stock_ledger
 
     def display_ledger(self) -> None:  # required  # O(number of shares)
         print("----  Stock Ledger  ----")
@@ -289,27 +834,16 @@ class StockLedger:
     def display_total_shares(self) -> None:
         print(self)
 
-    def contains(
-        self, stock_symbol: str
-    ) -> bool:  # required  # O(number of entries)
-        for each_entry in self.ledger_entries:
-            if each_entry.symbol == stock_symbol:
-                return True
-        return False
-
-    def get_entry(
-        self, stock_symbol: str
-    ) -> LedgerEntry:  # required  # O(number of entries)
-        for each_entry in self.ledger_entries:
-            if each_entry.symbol == stock_symbol:
-                return each_entry
-        return None
-
-    def number_of_shares(self, stock_symbol: str) -> None | int:  # O(N)
-        num_shares = 0
-        if self.contains(stock_symbol):
-            num_shares = len(
-                self.get_entry(stock_symbol)
-            )  # returns None for non-present stock_symbols
-        return num_shares  # same behavior for stock symbols not found in ledger
-    # and for those of empty ledger entries
+    def contains(self, stock_symbol: str) -> bool:  # required  # O(1)
+        return stock_symbol in self._entries_by_symbol
+
+    def get_entry(self, stock_symbol: str) -> LedgerEntry:  # required  # O(1)
+        return self._entries_by_symbol.get(
+            stock_symbol
+        )  # returns None for non-present stock_symbols
+
+    def number_of_shares(self, stock_symbol: str) -> None | int:  # O(1)
+        return self._shares_by_symbol.get(
+            stock_symbol, 0
+        )  # same behavior for stock symbols not found in ledger and for those
+    # of empty ledger entries
@@ -2,20 +2,37 @@
 
 # Stubs included by default
 from __future__ import annotations
+import os
+from collections.abc import Sequence
+from package.latency import LatencyRecorder
 from package.ledger_entry import LedgerEntry
+from package.linked_deque import LinkedDeque
+from package.lot_ledger_entry import LotLedgerEntry, StockLot
+from package.operation_counts import OperationCounts
+from package.snapshot import SnapshotFile
 from package.stock_sale import StockPurchase, StockSale
-from random import SystemRandom
+from random import Random, SystemRandom
 from typing import Any
 from typing_extensions import Self
 
 class StockLedger:
-    def __init__(self: Self) -> None: ...
+    def __init__(self: Self, lot_based: bool = ..., cost_index: bool = ..., rng: Random | None = ..., deque_type: type = ..., cost_fingerprint: bool = ...) -> None: ...
     def __len__(self: Self) -> Any: ...
     def __getitem__(self: Self, index: Any) -> LedgerEntry: ...
     def __str__(self: Self) -> str: ...
-    def equals(self: Self, other: Any) -> bool: ...
-    def open_entry(self: Self, stock_symbol: str) -> LedgerEntry: ...
+    def equals(self: Self, other: Any, costs: bool = ...) -> bool: ...
+    def fingerprint(self: Self) -> tuple[int, int | None]: ...
+    def diff(self: Self, other: StockLedger) -> list[str]: ...
+    def _new_entry(self: Self, stock_symbol: str) -> LedgerEntry: ...
+    def _writable_entry(self: Self, stock_symbol: str) -> LedgerEntry | None: ...
+    def fork(self: Self) -> StockLedger: ...
+    def preview_sell(self: Self, stock_symbol: str, quantity: int, price: float, strategies: Sequence[str] = ...) -> dict[str, float | None]: ...
+    def open_entry(self: Self, stock_symbol: str, shares_bought: int = ..., cost_per_share: float | None = ...) -> LedgerEntry: ...
     def open_sale(self: Self, stock_symbol: str, quantity: int, price: float) -> tuple[StockSale | None, LedgerEntry | None]: ...
+    def _add_shares(self: Self, entry: LedgerEntry, stock_symbol: str, shares_bought: int, cost_per_share: float, to_front: bool = ...) -> None: ...
+    def _increment_entry(self: Self, entry: LedgerEntry, steps: int) -> None: ...
+    def _add_sales(self: Self, sale: StockSale, entry: LedgerEntry, quantity: int, cost: float | None = ...) -> int: ...
+    def _add_lot_sales(self: Self, sale: StockSale, sold_lots: list[StockLot]) -> int: ...
     def buy(self: Self, stock_symbol: str, shares_bought: int, cost_per_share: float) -> None: ...
     def buyRandom(self: Self, stock_symbol: str, shares_bought: int, cost_per_share: float) -> None: ...
     def buyOptimal_1(self: Self, stock_symbol: str, shares_bought: int, cost_per_share: float) -> None: ...
@@ -25,7 +42,18 @@ class StockLedger:
     def sellRandom(self: Self, stock_symbol: str, quantity: int, price: float) -> StockSale: ...
     def sellOptimal_1(self: Self, stock_symbol: str, quantity: int, price: float) -> None: ...
     def sellOptimal_2(self: Self, stock_symbol: str, quantity: int, price: float) -> None: ...
+    def _visit_lots_up_to(self: Self, sale: StockSale, sell_entry: LotLedgerEntry, current_median: float) -> None: ...
     def sellOptimal_3(self: Self, stock_symbol: str, quantity: int, price: float) -> None: ...
+    def _sell_lower_cost_end(self: Self, sale: StockSale, sell_entry: LotLedgerEntry) -> None: ...
+    def trade_many(self: Self, orders: Sequence[tuple[int, str, int, float]], buy_strategy: str = ..., sell_strategy: str = ..., latency_recorder: LatencyRecorder | None = ...) -> tuple[list[StockSale | None], int, int]: ...
+    def buy_many(self: Self, orders: Sequence[tuple[str, int, float]], strategy: str = ...) -> None: ...
+    def sell_many(self: Self, orders: Sequence[tuple[str, int, float]], strategy: str = ...) -> list[StockSale | None]: ...
+    def enable_operation_counts(self: Self, operation_counts: OperationCounts | None = ...) -> OperationCounts: ...
+    def _counting(self: Self, strategy_method: Any) -> Any: ...
+    def disable_operation_counts(self: Self) -> OperationCounts | None: ...
+    def save_snapshot(self: Self, path: str | os.PathLike) -> None: ...
+    @classmethod
+    def load_snapshot(cls, path: str | os.PathLike, lazy: bool = ...) -> StockLedger: ...
     def display_ledger(self: Self) -> None: ...
     def display_total_shares(self: Self) -> None: ...
     def contains(self: Self, stock_symbol: str) -> bool: ...
@@ -40,5 +68,9 @@ __name__ = ...
 # Modules used internally, to allow implicit dependencies to be seen:
 import package
 import package.ledger_entry
+import package.linked_deque
+import package.lot_ledger_entry
+import package.operation_counts
+import package.snapshot
 import package.stock_sale
 import random
\ No newline at end of file
@@ -0,0 +1,317 @@
+import os
+from array import array
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from package.order_stream import CompiledOrderStream
+from package.result_cache import ResultCache
+from package.stock_ledger import StockLedger
+from package.trading_bot import TradingBot
+
+_worker_streams = []  # set in each worker process by _initialize_worker
+_worker_options = {}
+_worker_keep_series = False
+
+
+def _initialize_worker(
+    compiled_streams: list[CompiledOrderStream],
+    bot_options: dict,
+    keep_series: bool = False,
+) -> None:  # O(1), once per worker process
+    global _worker_streams, _worker_options, _worker_keep_series
+    _worker_streams = compiled_streams
+    _worker_options = bot_options
+    _worker_keep_series = keep_series
+
+
+def _cell_rng(
+    seed: int | str | None,
+    stream_index: int,
+    buy_setting: int,
+    sell_setting: int,
+) -> Random | None:  # O(1)
+    """Returns a Random for one cell of a sweep, depending only on seed and the cell (not on the worker process running it, or the order cells run in); None when seed is None."""
+    if seed is None:
+        return None
+    return Random(f"{seed}:{stream_index}:{buy_setting}:{sell_setting}")
+
+
+def _run_cell(cell: tuple[int, int, int, int | str | None]) -> "SweepResult":
+    stream_index, buy_setting, sell_setting, seed = cell
+    trading_bot = TradingBot(
+        buy_setting=buy_setting,
+        sell_setting=sell_setting,
+        rng=_cell_rng(seed, stream_index, buy_setting, sell_setting),
+        **_worker_options,
+    )
+    trading_bot.replay(_worker_streams[stream_index])
+    sweep_result = SweepResult(
+        stream_index,
+        buy_setting,
+        sell_setting,
+        trading_bot.profit(),
+        trading_bot.balance,
+        trading_bot.total_times(),
+        str(trading_bot.stock_ledger),
+    )
+    sweep_result.fingerprint = trading_bot.stock_ledger.fingerprint()
+    if _worker_keep_series:
+        sweep_result.balance_over_transactions = (
+            trading_bot.balance_over_transactions
+        )
+        sweep_result.profit_per_sell = trading_bot.profit_per_sell
+        sweep_result.accumulated_profits = trading_bot.accumulated_profits
+    return sweep_result
+
+
+class SweepResult:
+    """SweepResult is one cell of a strategy sweep: one order stream replayed by one TradingBot(buy_setting, sell_setting).\n\nledger_str: str(stock_ledger) at the end of the replay, compared as StockLedger.equals does for ledger_equal\n\nfingerprint: StockLedger.fingerprint() at the end of the replay\n\nbalance_over_transactions, profit_per_sell, accumulated_profits: the TradingBot's series, kept when the sweep has a ResultCache (None otherwise)\n\ncached: whether the result was read from a ResultCache, with the times of the replay that stored it"""
+
+    def __init__(
+        self,
+        stream_index: int,
+        buy_setting: int,
+        sell_setting: int,
+        profit: float,
+        balance: float,
+        total_times: tuple[float, float],
+        ledger_str: str,
+    ) -> None:
+        self.stream_index = stream_index
+        self.buy_setting = buy_setting
+        self.sell_setting = sell_setting
+        self.profit = profit
+        self.balance = balance
+        self.buy_time, self.sell_time = total_times
+        self.ledger_str = ledger_str
+        self.ledger_equal = None  # set by StrategySweep
+        self.fingerprint = None
+        self.balance_over_transactions = None
+        self.profit_per_sell = None
+        self.accumulated_profits = None
+        self.cached = False
+
+    def __str__(self) -> str:
+        settings_str = TradingBot.settings_string(
+            self.buy_setting, self.sell_setting
+        )
+        return (
+            f"{self.stream_index}: {settings_str}:"
+            f" profit {self.profit:.2f}, balance {self.balance:.2f},"
+            f" times ({self.buy_time:.4f}, {self.sell_time:.4f}),"
+            f" ledger_equal {self.ledger_equal}"
+        )
+
+    def total_times(self) -> tuple[float, float]:  # buy time, sell time
+        return self.buy_time, self.sell_time
+
+    def as_dict(self) -> dict:  # O(1)
+        return {
+            "stream_index": self.stream_index,
+            "buy_setting": self.buy_setting,
+            "sell_setting": self.sell_setting,
+            "profit": self.profit,
+            "balance": self.balance,
+            "buy_time": self.buy_time,
+            "sell_time": self.sell_time,
+            "ledger_equal": self.ledger_equal,
+        }
+
+    def cache_entry(self) -> tuple[dict[str, array], dict]:  # O(1)
+        """Returns the arrays and meta that ResultCache.put stores for this result (its series must have been kept), for from_cache."""
+        return {
+            "balance_over_transactions": self.balance_over_transactions,
+            "profit_per_sell": self.profit_per_sell,
+            "accumulated_profits": self.accumulated_profits,
+        }, {
+            "profit": self.profit,
+            "balance": self.balance,
+            "buy_time": self.buy_time,
+            "sell_time": self.sell_time,
+            "ledger_str": self.ledger_str,
+            "fingerprint": list(self.fingerprint),
+        }
+
+    @classmethod
+    def from_cache(
+        cls,
+        stream_index: int,
+        buy_setting: int,
+        sell_setting: int,
+        arrays: dict[str, array],
+        meta: dict,
+    ) -> "SweepResult":  # O(1)
+        sweep_result = cls(
+            stream_index,
+            buy_setting,
+            sell_setting,
+            meta["profit"],
+            meta["balance"],
+            (meta["buy_time"], meta["sell_time"]),
+            meta["ledger_str"],
+        )
+        sweep_result.fingerprint = tuple(meta["fingerprint"])
+        sweep_result.balance_over_transactions = arrays[
+            "balance_over_transactions"
+        ]
+        sweep_result.profit_per_sell = arrays["profit_per_sell"]
+        sweep_result.accumulated_profits = arrays["accumulated_profits"]
+        sweep_result.cached = True
+        return sweep_result
+
+
+class StrategySweep:
+    """StrategySweep replays each order stream with every combination of buy_settings and sell_settings (see TradingBot), fanned out over a process pool, and keeps the results as a table of SweepResults in (stream, buy_setting, sell_setting) order.\n\nseed: when not None, each cell uses its own Random, seeded from seed and the cell, so results do not depend on max_workers or scheduling\n\nmax_workers: size of the process pool (defaults to os.cpu_count()); 0 runs every cell in this process\n\nbot_options: passed to each TradingBot (ex: initial_balance, lot_based, cost_index, deque_type)\n\nledger_equal: whether a cell's final ledger equals (StockLedger.equals) that of buy_settings[0], sell_settings[0] for the same stream\n\ncache: a ResultCache (opt-in): cells found in it (by the content of their stream, settings, seed, bot_options, package version and code) are not replayed, and the others are stored in it once replayed; cells using buyRandom or sellRandom without a seed are never cached, as they are not reproducible"""
+
+    def __init__(
+        self,
+        order_streams: Iterable[CompiledOrderStream | str],
+        buy_settings: Iterable[int] = range(1, 6),
+        sell_settings: Iterable[int] = range(1, 6),
+        seed: int | str | None = None,
+        max_workers: int | None = None,
+        cache: ResultCache | None = None,
+        **bot_options,
+    ) -> None:
+        self.compiled_streams = [
+            (
+                each_stream
+                if isinstance(each_stream, CompiledOrderStream)
+                else CompiledOrderStream.from_string(each_stream)
+            )
+            for each_stream in order_streams
+        ]
+        self.buy_settings = list(buy_settings)
+        self.sell_settings = list(sell_settings)
+        self.seed = seed
+        self.max_workers = max_workers
+        self.bot_options = bot_options
+        self.cache = cache
+        self.results = []
+
+    def cells(self) -> list[tuple[int, int, int, int | str | None]]:
+        return [
+            (stream_index, buy_setting, sell_setting, self.seed)
+            for stream_index in range(len(self.compiled_streams))
+            for buy_setting in self.buy_settings
+            for sell_setting in self.sell_settings
+        ]
+
+    def _cache_keys(
+        self, cells: list[tuple[int, int, int, int | str | None]]
+    ) -> list[str | None]:  # O(streams * N + cells)
+        """Returns the ResultCache key of each of cells, None for a cell that is not reproducible (a random strategy without a seed)."""
+        stream_digests = [
+            ResultCache.stream_digest(each_stream)
+            for each_stream in self.compiled_streams
+        ]
+        keys = []
+        for stream_index, buy_setting, sell_setting, seed in cells:
+            if seed is None and (
+                TradingBot.BUY_STRATEGIES[buy_setting - 1]
+                in StockLedger.RANDOM_STRATEGIES
+                or TradingBot.SELL_STRATEGIES[sell_setting - 1]
+                in StockLedger.RANDOM_STRATEGIES
+            ):
+                keys.append(None)
+            else:
+                keys.append(
+                    ResultCache.key(
+                        stream_digests[stream_index],
+                        buy_setting,
+                        sell_setting,
+                        seed,
+                        self.bot_options,
+                    )
+                )
+        return keys
+
+    def run(self) -> list[SweepResult]:  # O(cells * replay) / workers
+        cells = self.cells()
+        results = [None] * len(cells)
+        keys = [None] * len(cells)
+        if self.cache is not None:
+            keys = self._cache_keys(cells)
+            for c_i, each_key in enumerate(keys):
+                if each_key is not None:
+                    cached = self.cache.get(each_key)
+                    if cached is not None:
+                        results[c_i] = SweepResult.from_cache(
+                            *cells[c_i][:3], *cached
+                        )
+        missing = [c_i for c_i in range(len(cells)) if results[c_i] is None]
+        worker_options = (
+            self.compiled_streams,
+            self.bot_options,
+            self.cache is not None,
+        )
+        if not missing:
+            replayed = []
+        elif self.max_workers == 0:
+            _initialize_worker(*worker_options)
+            replayed = [_run_cell(cells[c_i]) for c_i in missing]
+        else:
+            max_workers = min(
+                self.max_workers or os.cpu_count() or 1, len(missing)
+            )
+            with ProcessPoolExecutor(
+                max_workers,
+                initializer=_initialize_worker,
+                initargs=worker_options,
+            ) as executor:
+                replayed = list(
+                    executor.map(
+                        _run_cell,
+                        [cells[c_i] for c_i in missing],
+                        chunksize=max(1, len(missing) // (4 * max_workers)),
+                    )
+                )
+        for c_i, each_result in zip(missing, replayed):
+            results[c_i] = each_result
+            if keys[c_i] is not None:
+                self.cache.put(keys[c_i], *each_result.cache_entry())
+        self.results = results
+        self._check_ledgers()
+        return self.results
+
+    def _check_ledgers(self) -> None:  # O(cells * symbols)
+        reference_lines = {}
+        for each_result in self.results:
+            result_lines = set(each_result.ledger_str.split("\n"))
+            if each_result.stream_index not in reference_lines:
+                reference_lines[each_result.stream_index] = result_lines
+            each_result.ledger_equal = (
+                result_lines == reference_lines[each_result.stream_index]
+            )
+
+    def result(
+        self, stream_index: int, buy_setting: int, sell_setting: int
+    ) -> SweepResult:  # O(1)
+        buy_index = self.buy_settings.index(buy_setting)
+        sell_index = self.sell_settings.index(sell_setting)
+        return self.results[
+            (stream_index * len(self.buy_settings) + buy_index)
+            * len(self.sell_settings)
+            + sell_index
+        ]
+
+    def grid(
+        self, stream_index: int = 0, field: str = "profit"
+    ) -> list[list]:  # O(buy_settings * sell_settings)
+        """Returns field of each result for one stream, as rows of buy_settings by columns of sell_settings (ex: for .imshow)."""
+        return [
+            [
+                getattr(
+                    self.result(stream_index, buy_setting, sell_setting), field
+                )
+                for sell_setting in self.sell_settings
+            ]
+            for buy_setting in self.buy_settings
+        ]
+
+    def all_ledgers_equal(self) -> bool:  # O(cells)
+        return all(each_result.ledger_equal for each_result in self.results)
+
+    def display_results(self) -> None:  # O(cells)
+        for each_result in self.results:
+            print(each_result)
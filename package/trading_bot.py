@@ -1,13 +1,41 @@
-from logging.config import stopListening
+import copy
 import time
+import os
+import shutil
+import tempfile
+from array import array
+from collections.abc import AsyncIterable, Iterable, Sequence
+from functools import wraps
+from random import Random
+from package.history import SaleHistory, SpilledSeries
+from package.latency import LatencyRecorder
+from package.ledger_render import LedgerRenderer
+from package.linked_deque import LinkedDeque
+from package.live_feed import LiveFeed
+from package.operation_counts import OperationCounts
+from package.order_stream import (
+    CompiledOrderStream,
+    OrderStreamReport,
+    is_display_line,
+    iter_orders,
+)
+from package.snapshot import (
+    SnapshotFile,
+    ledger_arrays,
+    ledger_options,
+    restore_ledger,
+    restore_sales,
+    sales_arrays,
+)
 from package.stock_ledger import StockLedger
 
 
 def timing(func):
+    @wraps(func)
     def wrapper(*args):
-        start = time.time()
+        start = time.perf_counter()
         func(*args)
-        return time.time() - start
+        return time.perf_counter() - start
 
     return wrapper
 
@@ -16,7 +44,7 @@ class TradingBot:
     # Later: TradingBot """Has methods to determine behavior as a function of
     # inputs, and these behaviors occur through execution of public methods.
     """TradingBot is for tabulation of a given sequence of buy and sell operations, and representation of combinations of buy and sell schema.\n\n
-    \nbuy_setting:\n\n1: buy\n\n2: buyRandom\n\n3: buyOptimal_1\n\n4: buyOptimal_2\n\n5: buyOptimal_3\n\nsell_setting\n\n1: sell\n\n2: sellRandom\n\n3: sellOptimal_1\n\n4: sellOptimal_2\n\n5: sellOptimal_3
+    \nbuy_setting:\n\n1: buy\n\n2: buyRandom\n\n3: buyOptimal_1\n\n4: buyOptimal_2\n\n5: buyOptimal_3\n\nsell_setting\n\n1: sell\n\n2: sellRandom\n\n3: sellOptimal_1\n\n4: sellOptimal_2\n\n5: sellOptimal_3\n\nlot_based, cost_index, rng, deque_type, cost_fingerprint: passed to StockLedger\n\nlatency_recorder: a LatencyRecorder of buy and sell latencies by strategy and stock symbol, from enable_latency (None when disabled, so buy and sell time only as total_times does)\n\nledger_renderer: a LedgerRenderer that Display directives write the ledger with, buffered and throttled (None: StockLedger.display_ledger, for each directive)\n\nbalance_over_transactions, profit_per_sell and accumulated_profits are array('d') series (numpy.asarray can view them without copying), or SpilledSeries after set_history_retention, and profit, revenue and balance are running totals, updated as each trade happens.
     """
 
     def __init__(
@@ -24,24 +52,41 @@ class TradingBot:
         initial_balance: float = 0,
         buy_setting: int = 1,
         sell_setting: int = 1,
+        lot_based: bool = False,
+        cost_index: bool = False,
+        rng: Random | None = None,
+        deque_type: type = LinkedDeque,
+        cost_fingerprint: bool = False,
+        ledger_renderer: LedgerRenderer | None = None,
     ) -> (
         None
     ):
-        self.stock_ledger = StockLedger()
+        self.stock_ledger = StockLedger(
+            lot_based, cost_index, rng, deque_type, cost_fingerprint
+        )
         self.stock_sales_list = []
         self.balance = initial_balance
-        self.balance_over_transactions = [initial_balance]
-        self.profit_per_sell = []
+        self.balance_over_transactions = array("d", [initial_balance])
+        self.profit_per_sell = array("d")
+        self.accumulated_profits = array("d", [0])
+        self._total_profit = 0
+        self._total_revenue = 0
         self.buy_setting = buy_setting
         self.sell_setting = sell_setting
         self.sell_time = 0
         self.buy_time = 0
+        self.latency_recorder = None
+        self.ledger_renderer = ledger_renderer
+        self.history_directory = None  # see set_history_retention
+
+    BUY_STRATEGIES = StockLedger.BUY_STRATEGIES  # buy_setting - 1 -> name
+    SELL_STRATEGIES = StockLedger.SELL_STRATEGIES
 
     @staticmethod
     def settings_string(buy_setting, sell_setting) -> str:
         return (
-            f"{['buy', 'buyRandom', 'buyOptimal_1', 'buyOptimal_2', 'buyOptimal_3'][buy_setting - 1]},"
-            f" {['sell', 'sellRandom', 'sellOptimal_1', 'sellOptimal_2', 'sellOptimal_3'][sell_setting - 1]}"
+            f"{TradingBot.BUY_STRATEGIES[buy_setting - 1]},"
+            f" {TradingBot.SELL_STRATEGIES[sell_setting - 1]}"
         )
 
     def __str__(self) -> str:
@@ -56,11 +101,11 @@ class TradingBot:
         input_lines = input_str.split("\n")
         for each_line in input_lines:  # O(N=len(input_lines))
             each_split_line = each_line.split()  # splits on spaces
-            if each_line.count("Display") == 0:
+            if not is_display_line(each_line):
                 price_string = each_split_line[-1].strip(".$")
             else:
-                if display_bool:
-                    self.stock_ledger.display_ledger()
+                if display_bool and self._display_due():
+                    self._display_ledger()
             if each_split_line[0] == "Buy":
                 self.buy(
                     each_split_line[4],
@@ -74,6 +119,146 @@ class TradingBot:
                     float(price_string),
                 )  # O(1) * O(num shares)
 
+    def stream_to_trading_bot(
+        self,
+        source: os.PathLike | Iterable[str],
+        display_bool: bool = False,
+    ) -> OrderStreamReport:  # O(N) time, O(1) memory over lines
+        """Same as string_to_trading_bot, for an order log given as a file path (os.PathLike), a file object, or any iterable of lines, processing each order as it is read; returns an OrderStreamReport, with malformed lines counted (and skipped) instead of raising."""
+        report = OrderStreamReport()
+        self.apply_orders(iter_orders(source, report), display_bool)
+        return report
+
+    async def feed_to_trading_bot(
+        self,
+        source: AsyncIterable,
+        display_bool: bool = False,
+        max_queue: int = 1024,
+        max_batch: int = 256,
+    ) -> OrderStreamReport:  # O(N) time, O(max_queue) memory
+        """Same as stream_to_trading_bot, for a live feed (an async iterable of lines or orders), applied in micro-batches as orders arrive; see LiveFeed, to subscribe to P&L and balance updates."""
+        return await LiveFeed(self, max_queue, max_batch).run(
+            source, display_bool
+        )
+
+    def replay(
+        self,
+        compiled_stream: CompiledOrderStream,
+        display_bool: bool = False,
+        coalesce: bool = False,
+        keep_history: bool = False,
+    ) -> None:  # O(N) = O(len(compiled_stream))
+        """Same as string_to_trading_bot, for an order log already compiled (CompiledOrderStream.from_string, from_source or load), so one log is parsed once for any number of TradingBots; orders are applied in batches (see apply_orders, also for coalesce and keep_history)."""
+        self.apply_orders(
+            compiled_stream,
+            display_bool,
+            coalesce=coalesce,
+            keep_history=keep_history,
+        )
+
+    def apply_orders(
+        self,
+        orders: (
+            CompiledOrderStream | Iterable[tuple[str, str | None, int, float]]
+        ),
+        display_bool: bool = False,
+        batch_size: int = 4096,
+        coalesce: bool = False,
+        keep_history: bool = False,
+    ) -> None:  # O(N), O(batch_size) memory
+        """Same as buy or sell for each order of orders (a CompiledOrderStream, or ("Buy", "Sell" or "Display", stock symbol, quantity, price) as iter_orders yields), applied in batches of up to batch_size orders (see StockLedger.trade_many): strategies are dispatched once per batch, buy_time and sell_time take one clock read per order, and latency (when enabled) is recorded per order, under the same strategy and stock symbol as buy and sell record it.\n\ncoalesce: when the buy strategy is in StockLedger.COALESCING_STRATEGIES, adjacent buys of the same stock symbol at the same price are merged into one buy, which leaves the ledger, sales, profits and balance exactly as without merging; balance_over_transactions then gets one entry per merged buy, or one per order when keep_history."""
+        coalesce = (
+            coalesce
+            and TradingBot.BUY_STRATEGIES[self.buy_setting - 1]
+            in StockLedger.COALESCING_STRATEGIES
+        )
+        batch = []
+        merged_quantities = {}  # batch index -> quantities of merged buys
+        for side, stock_symbol, quantity, price in TradingBot._sided_orders(
+            orders
+        ):
+            if side == 0:
+                if display_bool and self._display_due():
+                    self._apply_batch(batch, merged_quantities, keep_history)
+                    batch = []
+                    merged_quantities = {}
+                    self._display_ledger()
+            elif (
+                coalesce
+                and side == 1
+                and batch
+                and batch[-1][0] == 1
+                and batch[-1][1] == stock_symbol
+                and batch[-1][3] == price
+            ):
+                last_quantity = batch[-1][2]
+                if len(batch) - 1 not in merged_quantities:
+                    merged_quantities[len(batch) - 1] = [last_quantity]
+                merged_quantities[len(batch) - 1].append(quantity)
+                batch[-1] = (1, stock_symbol, last_quantity + quantity, price)
+            else:
+                if len(batch) == batch_size:
+                    self._apply_batch(batch, merged_quantities, keep_history)
+                    batch = []
+                    merged_quantities = {}
+                batch.append((side, stock_symbol, quantity, price))
+        self._apply_batch(batch, merged_quantities, keep_history)
+
+    @staticmethod
+    def _sided_orders(
+        orders: (
+            CompiledOrderStream | Iterable[tuple[str, str | None, int, float]]
+        ),
+    ) -> Iterable[tuple[int, str | None, int, float]]:  # O(1) per order
+        """Yields orders with side 1 for Buy, -1 for Sell and 0 for Display, as in CompiledOrderStream."""
+        if isinstance(orders, CompiledOrderStream):
+            symbols = orders.symbols
+            for side, symbol_id, quantity, price in zip(
+                orders.sides,
+                orders.symbol_ids,
+                orders.quantities,
+                orders.prices,
+            ):
+                yield side, symbols[symbol_id], quantity, price
+        else:
+            sides = CompiledOrderStream.SIDES
+            for buy_or_sell, stock_symbol, quantity, price in orders:
+                yield sides[buy_or_sell], stock_symbol, quantity, price
+
+    def _apply_batch(
+        self,
+        batch: list[tuple[int, str, int, float]],
+        merged_quantities: dict[int, list[int]] | None = None,
+        keep_history: bool = False,
+    ) -> None:  # O(f(N)) per order
+        """Applies batch, then updates balance, sales and report series in order of batch; the balance of a buy merged from orders of merged_quantities (by batch index) is updated per order, so it is exactly as if applied one by one."""
+        if not batch:
+            return
+        results, buy_ns, sell_ns = self.stock_ledger.trade_many(
+            batch,
+            TradingBot.BUY_STRATEGIES[self.buy_setting - 1],
+            TradingBot.SELL_STRATEGIES[self.sell_setting - 1],
+            self.latency_recorder,
+        )
+        self.buy_time += buy_ns / 1e9
+        self.sell_time += sell_ns / 1e9
+        append_balance = self.balance_over_transactions.append
+        for o_i, (side, stock_symbol, quantity, price) in enumerate(batch):
+            if side == 1:
+                if merged_quantities and o_i in merged_quantities:
+                    for each_quantity in merged_quantities[o_i]:
+                        self.balance -= each_quantity * price
+                        if keep_history:
+                            append_balance(self.balance)
+                    if not keep_history:
+                        append_balance(self.balance)
+                else:
+                    self.balance -= quantity * price
+                    append_balance(self.balance)
+            elif results[o_i] is not None:
+                self.stock_sales_list.append(results[o_i])
+                self._count_sale(results[o_i], quantity, price)
+
     # Refactored 01/19/2026:
     @timing
     def _match_buy(self, stock_symbol, quantity, price):
@@ -89,6 +274,128 @@ class TradingBot:
             self.stock_ledger.buyOptimal_3(stock_symbol, quantity, price)
 
 
+    def _recording(
+        self, match_func, strategies: list[str], setting_name: str
+    ):
+        """Returns match_func (undecorated _match_buy or _match_sell) bound to self, timed with perf_counter_ns and recorded in latency_recorder by strategy and stock symbol; returns seconds, as timing does."""
+        record = self.latency_recorder.record
+        perf_counter_ns = time.perf_counter_ns
+
+        def recorded(stock_symbol, quantity, price):
+            start = perf_counter_ns()
+            match_func(self, stock_symbol, quantity, price)
+            latency_ns = perf_counter_ns() - start
+            strategy = strategies[getattr(self, setting_name) - 1]
+            record(strategy, stock_symbol, latency_ns)
+            return latency_ns / 1e9
+
+        return recorded
+
+    def enable_latency(
+        self, latency_recorder: LatencyRecorder | None = None
+    ) -> LatencyRecorder:  # O(1)
+        """Records the latency of each buy and sell, by strategy and stock symbol, in latency_recorder (a new LatencyRecorder by default), which is returned."""
+        self.latency_recorder = (
+            LatencyRecorder() if latency_recorder is None else latency_recorder
+        )
+        self._match_buy = self._recording(
+            TradingBot._match_buy.__wrapped__,
+            TradingBot.BUY_STRATEGIES,
+            "buy_setting",
+        )
+        self._match_sell = self._recording(
+            TradingBot._match_sell.__wrapped__,
+            TradingBot.SELL_STRATEGIES,
+            "sell_setting",
+        )
+        return self.latency_recorder
+
+    def disable_latency(self) -> LatencyRecorder | None:  # O(1)
+        """Stops recording latencies, so buy and sell carry no recording overhead, and returns the latency_recorder used."""
+        latency_recorder = self.latency_recorder
+        self.__dict__.pop("_match_buy", None)
+        self.__dict__.pop("_match_sell", None)
+        self.latency_recorder = None
+        return latency_recorder
+
+    def enable_operation_counts(
+        self, operation_counts: OperationCounts | None = None
+    ) -> OperationCounts:  # O(1)
+        """Counts entry, deque and StockPurchase operations of each buy and sell strategy (see StockLedger.enable_operation_counts), and returns the OperationCounts."""
+        return self.stock_ledger.enable_operation_counts(operation_counts)
+
+    def disable_operation_counts(self) -> OperationCounts | None:  # O(1)
+        return self.stock_ledger.disable_operation_counts()
+
+    def operation_counts(self) -> OperationCounts | None:  # O(1)
+        return self.stock_ledger.operation_counts
+
+    def _display_due(self) -> bool:  # O(1)
+        return self.ledger_renderer is None or self.ledger_renderer.due()
+
+    def _display_ledger(self) -> None:  # O(number of shares)
+        if self.ledger_renderer is None:
+            self.stock_ledger.display_ledger()
+        else:
+            self.ledger_renderer.write(self.stock_ledger)
+
+    def set_history_retention(
+        self, window: int, spill_directory: str | os.PathLike | None = None
+    ) -> None:  # O(N) once, then O(1) amortized per value
+        """Keeps only the most recent window (up to 2 * window) values of balance_over_transactions, profit_per_sell and accumulated_profits, and sales of stock_sales_list, in memory (see SpilledSeries and SaleHistory), so memory stays bounded on a long run; call it once, before or while trading.\n\nspill_directory: when given, older values and sales are appended to spill files in a new directory in it (history_directory, made by tempfile.mkdtemp, so any number of TradingBots can spill to one spill_directory), and every accessor (ex: accumulated_profit, stock_sales_list[i]) reads across memory and disk; otherwise they are dropped: only the running totals (profit, revenue, balance) still count them, series iterate from their first_index, and accumulated_profit raises ValueError."""
+        if window < 1:
+            raise ValueError(f"window must be at least 1, not {window}")
+        if isinstance(self.stock_sales_list, SaleHistory):
+            raise ValueError("history retention is already set")
+        if spill_directory is not None:
+            os.makedirs(spill_directory, exist_ok=True)
+            self.history_directory = tempfile.mkdtemp(
+                prefix="history-", dir=spill_directory
+            )
+        for each_series in (
+            "balance_over_transactions",
+            "profit_per_sell",
+            "accumulated_profits",
+        ):
+            setattr(
+                self,
+                each_series,
+                SpilledSeries(
+                    "d",
+                    window,
+                    self._spill_path(each_series),
+                    getattr(self, each_series),
+                ),
+            )
+        self.stock_sales_list = SaleHistory(
+            window, self.history_directory, self.stock_sales_list
+        )
+
+    def _spill_path(self, series: str) -> str | None:  # O(1)
+        if self.history_directory is None:
+            return None
+        return os.path.join(self.history_directory, f"{series}.spill")
+
+    def close(self) -> None:  # O(1)
+        """Closes the spill files and maps of the history kept by set_history_retention, and removes history_directory, so the files are released; the history beyond memory can no longer be read. Does nothing without history retention."""
+        if isinstance(self.stock_sales_list, SaleHistory):
+            for each_series in (
+                self.balance_over_transactions,
+                self.profit_per_sell,
+                self.accumulated_profits,
+                self.stock_sales_list,
+            ):
+                each_series.close()
+        if self.history_directory is not None:
+            shutil.rmtree(self.history_directory, ignore_errors=True)
+            self.history_directory = None
+
+    def __enter__(self) -> "TradingBot":
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
+
     def buy(
         self, stock_symbol: str, quantity: int, price: float
     ) -> None:  # O(f(N))
@@ -96,6 +403,12 @@ class TradingBot:
         self.balance -= quantity * price
         self.balance_over_transactions.append(self.balance)
 
+    def buy_many(
+        self, orders: Sequence[tuple[str, int, float]]
+    ) -> None:  # O(f(N)) per order
+        """Same as buy for each (stock symbol, quantity, price) of orders, as one batch (see apply_orders)."""
+        self._apply_batch([(1, *each_order) for each_order in orders])
+
     @timing
     def _match_sell(self, stock_symbol, quantity, price):
         if self.sell_setting == 1:  # O(1)
@@ -124,19 +437,154 @@ class TradingBot:
     ) -> None:  #                            # O(f(N))
         self.sell_time += self._match_sell(stock_symbol, quantity, price)
         if self.stock_sales_list[-1] is None:
-            self.stock_sales_list.remove(None)
+            self.stock_sales_list.pop()
+        else:
+            self._count_sale(self.stock_sales_list[-1], quantity, price)
+
+    def sell_many(
+        self, orders: Sequence[tuple[str, int, float]]
+    ) -> None:  # O(f(N)) per order
+        """Same as sell for each (stock symbol, quantity, price) of orders, as one batch (see apply_orders)."""
+        self._apply_batch([(-1, *each_order) for each_order in orders])
+
+    def _count_sale(self, sale, quantity: int, price: float) -> None:  # O(1)
+        self.balance += quantity * price
+        self.profit_per_sell.append(sale.get_profit())
+        self._total_profit += self.profit_per_sell[-1]
+        self.accumulated_profits.append(self._total_profit)
+        self._total_revenue += quantity * price
+
+    def fork(self, keep_history: bool = False) -> "TradingBot":  # O(symbols)
+        """Returns a TradingBot with the same settings, balance and running totals as this one, trading on a fork of its StockLedger (see StockLedger.fork), so what-if orders on either bot leave the other as it was.\n\nThe fork writes Display directives with a copy of ledger_renderer (same stream and throttle, with its own counts from here on), and, when latency is enabled, records into a new LatencyRecorder of its own, so what-if orders never show up in this bot's latencies.\n\nkeep_history: also copy stock_sales_list and the report series (O(N)); otherwise the fork's series start from the current balance and accumulated profit.\n\nHistory retention (set_history_retention) carries over: the fork keeps the same window, and drops or spills as this bot does, spilling to its own history_directory next to this one's; with keep_history, values this bot dropped stay dropped (the same first_index, so indices still match), and spilled ones are copied file to file, never through memory."""
+        trading_bot = TradingBot(
+            self.balance,
+            self.buy_setting,
+            self.sell_setting,
+            ledger_renderer=copy.copy(self.ledger_renderer),
+        )
+        trading_bot.stock_ledger = self.stock_ledger.fork()
+        if self.latency_recorder is not None:
+            trading_bot.enable_latency()
+        trading_bot._total_profit = self._total_profit
+        trading_bot._total_revenue = self._total_revenue
+        retained = isinstance(self.stock_sales_list, SaleHistory)
+        spill_directory = (
+            None
+            if self.history_directory is None
+            else os.path.dirname(self.history_directory)
+        )
+        if keep_history and retained:
+            if spill_directory is not None:
+                trading_bot.history_directory = tempfile.mkdtemp(
+                    prefix="history-", dir=spill_directory
+                )
+            for each_series in (
+                "balance_over_transactions",
+                "profit_per_sell",
+                "accumulated_profits",
+            ):
+                setattr(
+                    trading_bot,
+                    each_series,
+                    getattr(self, each_series).copy(
+                        trading_bot._spill_path(each_series)
+                    ),
+                )
+            trading_bot.stock_sales_list = self.stock_sales_list.copy(
+                trading_bot.history_directory
+            )
+        elif keep_history:
+            trading_bot.stock_sales_list = list(self.stock_sales_list)
+            trading_bot.balance_over_transactions = array(
+                "d", self.balance_over_transactions
+            )
+            trading_bot.profit_per_sell = array("d", self.profit_per_sell)
+            trading_bot.accumulated_profits = array(
+                "d", self.accumulated_profits
+            )
         else:
-            self.balance += quantity * price
-            self.profit_per_sell.append(self.last_profit())
+            trading_bot.accumulated_profits = array("d", [self._total_profit])
+            if retained:
+                trading_bot.set_history_retention(
+                    self.stock_sales_list.window, spill_directory
+                )
+        return trading_bot
+
+    def preview_sell(
+        self, stock_symbol: str, quantity: int, price: float
+    ) -> dict[str, float | None]:  # O(SELL_STRATEGIES * (symbols + sell))
+        """Returns the profit each of SELL_STRATEGIES would realize selling quantity shares of stock_symbol at price (None when the sale could not be filled), without changing this TradingBot (see StockLedger.preview_sell)."""
+        return self.stock_ledger.preview_sell(
+            stock_symbol, quantity, price, TradingBot.SELL_STRATEGIES
+        )
 
     # end Refactored
 
-    # $ report methods:
+    def save_snapshot(
+        self, path: str | os.PathLike, include_sales: bool = True
+    ) -> None:  # O(runs + sale lots)
+        """Saves this TradingBot to a compact binary file, for load_snapshot: its StockLedger (see StockLedger.save_snapshot), settings, balance, running totals and report series, and (when include_sales) stock_sales_list, as runs of the costs of shares sold (of series and sales kept by set_history_retention, only what can still be read)."""
+        arrays, meta = ledger_arrays(self.stock_ledger, "ledger_")
+        arrays["balance_over_transactions"] = array(
+            "d", self.balance_over_transactions
+        )
+        arrays["profit_per_sell"] = array("d", self.profit_per_sell)
+        arrays["accumulated_profits"] = array("d", self.accumulated_profits)
+        if include_sales:
+            arrays |= sales_arrays(
+                self.stock_sales_list, meta["ledger_symbols"]
+            )
+        meta |= {
+            "buy_setting": self.buy_setting,
+            "sell_setting": self.sell_setting,
+            "balance": self.balance,
+            "total_profit": self._total_profit,
+            "total_revenue": self._total_revenue,
+            "buy_time": self.buy_time,
+            "sell_time": self.sell_time,
+        }
+        SnapshotFile.write(path, arrays, meta)
 
-    def profit(self) -> float:  # O(num sold shares)
-        return sum(
-            [stock_sale.get_profit() for stock_sale in self.stock_sales_list]
+    @classmethod
+    def load_snapshot(
+        cls, path: str | os.PathLike, lazy: bool = True
+    ) -> "TradingBot":  # O(entries + series + sale lots) when lazy
+        """Returns the TradingBot saved by save_snapshot, ready to trade on from where it was saved; ledger entries are restored as for StockLedger.load_snapshot, and stock_sales_list is empty if saved without sales."""
+        snapshot_file = SnapshotFile(path)
+        meta = snapshot_file.meta
+        trading_bot = cls(
+            meta["balance"],
+            meta["buy_setting"],
+            meta["sell_setting"],
+            **ledger_options(snapshot_file, "ledger_"),
+        )
+        restore_ledger(
+            trading_bot.stock_ledger, snapshot_file, "ledger_", lazy
         )
+        for each_series in (
+            "balance_over_transactions",
+            "profit_per_sell",
+            "accumulated_profits",
+        ):
+            setattr(
+                trading_bot,
+                each_series,
+                array("d", snapshot_file.array(each_series)),
+            )
+        if "sale_symbol_ids" in snapshot_file:
+            trading_bot.stock_sales_list = restore_sales(
+                snapshot_file, meta["ledger_symbols"]
+            )
+        trading_bot._total_profit = meta["total_profit"]
+        trading_bot._total_revenue = meta["total_revenue"]
+        trading_bot.buy_time = meta["buy_time"]
+        trading_bot.sell_time = meta["sell_time"]
+        return trading_bot
+
+    # $ report methods:
+
+    def profit(self) -> float:  # O(1)
+        return self._total_profit
 
     def last_profit(self):  # O(num shares in last sale)
         if len(self.stock_sales_list) > 0:
@@ -144,21 +592,18 @@ class TradingBot:
         else:
             return 0
 
-    def accumulated_profit(self) -> list[float]:  # O(N)
-        accumulated_profits = [0]
-        for p_i in range(len(self.profit_per_sell)):
-            accumulated_profits.append(sum(self.profit_per_sell[0 : p_i + 1]))
-        return (
-            accumulated_profits  # TODO Compare these as functions in a .ipynb
-        )
+    def accumulated_profit(self) -> list[float]:  # O(N), to export
+        """Returns accumulated_profits as a list; raises ValueError if set_history_retention, without a spill_directory, dropped earlier values (profit still counts them)."""
+        if getattr(self.accumulated_profits, "first_index", 0) > 0:
+            raise ValueError(
+                "accumulated profits before"
+                f" {self.accumulated_profits.first_index} were dropped (no"
+                " spill directory)"
+            )
+        return self.accumulated_profits.tolist()
 
-    def revenue(self) -> float:  # O(N)
-        return sum(
-            [
-                each_sale.quantity * len(each_sale.shares)
-                for each_sale in self.stock_sales_list
-            ]
-        )
+    def revenue(self) -> float:  # O(1)
+        return self._total_revenue
 
     def last_revenue(self) -> float:  # O(1)
         return (
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from pathlib import Path
 from setuptools import setup, Extension, find_packages
 
@@ -7,6 +8,14 @@ def read_readme() -> str:
     readme = Path(__file__).with_name("README.md")
     return readme.read_text(encoding="utf-8") if readme.exists() else ""
 
+def read_version() -> str:
+    # package/__init__.py is the one place the version is set (ResultCache
+    # keys include it), so it is read rather than imported before install
+    init = Path(__file__).with_name("package") / "__init__.py"
+    return re.search(
+        r'^__version__ = "([^"]+)"', init.read_text(encoding="utf-8"), re.M
+    ).group(1)
+
 # --- Cython is optional at sdist time, but required to build from .pyx ---
 try:
     from Cython.Build import cythonize
@@ -35,7 +44,7 @@ if pyx_path.exists():
 
 setup(
     name="trading_deque_2",
-    version="1.0.0",
+    version=read_version(),
     author="Alan MH Beem",
     author_email="Alan.Beem@seattlecolleges.edu",
     description="Refactored project from the CS DS Program at NSC",
@@ -46,6 +55,7 @@ setup(
     ext_modules=extensions,
     include_package_data=True,  # allows MANIFEST/package_data to matter
     install_requires=[],
+    extras_require={"generator": ["numpy"]},  # package.order_generator
     python_requires=">=3.8",
     classifiers=[
         "Programming Language :: Python :: 3",
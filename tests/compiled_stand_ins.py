@@ -0,0 +1,322 @@
+# Pure Python stand-ins for the modules shipped only as compiled extensions
+# (package/ledger_entry, linked_deque, stock_purchase and stock_sale, built
+# with Nuitka for one platform), following their .pyi interfaces and the
+# output of main.ipynb, so the test suite runs wherever those do not import.
+
+import sys
+import types
+from collections.abc import Iterable
+
+
+class StockPurchase:
+    def __init__(self, stock_symbol: str, cost_per_share: float) -> None:
+        self.symbol = stock_symbol
+        self.cost = cost_per_share
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, StockPurchase)
+            and self.symbol == other.symbol
+            and self.cost == other.cost
+        )
+
+    def __str__(self) -> str:  # ex: "AAPL: $20.0"
+        return f"{self.symbol}: ${self.cost}"
+
+    def __lt__(self, other) -> bool:
+        return self.cost < other.cost
+
+
+class StockSale:
+    def __init__(self, stock_symbol: str, quantity: int, price: float) -> None:
+        self.symbol = stock_symbol
+        self.quantity = quantity
+        self.price = price
+        self.shares = []
+
+    def __len__(self) -> int:
+        return len(self.shares)
+
+    def __str__(self) -> str:
+        return (
+            f"StockSale: {self.quantity} shares of {self.symbol} at"
+            f" ${self.price}: " + ", ".join(str(each) for each in self.shares)
+        )
+
+    def add_sale(self, stock: StockPurchase) -> None:
+        self.shares.append(stock)
+
+    def total_cost(self) -> float:
+        return sum(each_share.cost for each_share in self.shares)
+
+    def get_profit(self) -> float:
+        return self.price * len(self.shares) - self.total_cost()
+
+    def is_filled(self) -> bool:
+        return len(self.shares) == self.quantity
+
+
+class LinkedDeque:
+    class DLNode:
+        def __init__(self, previous_node, data_portion, next_node) -> None:
+            self._previous_node = previous_node
+            self._data_portion = data_portion
+            self._next_node = next_node
+
+        def get_data_portion(self):
+            return self._data_portion
+
+        def set_data_portion(self, data_portion) -> None:
+            self._data_portion = data_portion
+
+        def get_next_node(self):
+            return self._next_node
+
+        def set_next_node(self, next_node) -> None:
+            self._next_node = next_node
+
+        def get_previous_node(self):
+            return self._previous_node
+
+        def set_previous_node(self, previous_node) -> None:
+            self._previous_node = previous_node
+
+    def __init__(
+        self, initial_data: Iterable | None = None, front_or_back: str = "back"
+    ) -> None:
+        self._front = None
+        self._back = None
+        self._size = 0
+        self._current = None  # next node of iteration
+        for each_datum in initial_data or ():
+            if front_or_back == "front":
+                self.add_to_front(each_datum)
+            else:
+                self.add_to_back(each_datum)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("LinkedDeque index out of range")
+        node = self._front
+        for i in range(index):
+            node = node.get_next_node()
+        return node.get_data_portion()
+
+    def _items_data_list(self) -> list:
+        return [each_datum for each_datum in self]
+
+    def __iter__(self):
+        self._current = self._front
+        return self
+
+    def __next__(self):
+        if self._current is None:
+            raise StopIteration
+        datum = self._current.get_data_portion()
+        self._current = self._current.get_next_node()
+        return datum
+
+    def __eq__(self, other) -> bool:
+        return self._items_data_list() == list(other)
+
+    def add_to_back(self, new_entry) -> None:
+        new_node = LinkedDeque.DLNode(self._back, new_entry, None)
+        if self._back is None:
+            self._front = new_node
+        else:
+            self._back.set_next_node(new_node)
+        self._back = new_node
+        self._size += 1
+
+    def add_to_front(self, new_entry) -> None:
+        new_node = LinkedDeque.DLNode(None, new_entry, self._front)
+        if self._front is None:
+            self._back = new_node
+        else:
+            self._front.set_previous_node(new_node)
+        self._front = new_node
+        self._size += 1
+
+    def get_back(self):
+        return None if self._back is None else self._back.get_data_portion()
+
+    def get_front(self):
+        return None if self._front is None else self._front.get_data_portion()
+
+    def remove_front(self):
+        if self._front is None:
+            return None
+        front = self._front
+        self._front = front.get_next_node()
+        if self._front is None:
+            self._back = None
+        else:
+            self._front.set_previous_node(None)
+        self._size -= 1
+        return front.get_data_portion()
+
+    def remove_back(self):
+        if self._back is None:
+            return None
+        back = self._back
+        self._back = back.get_previous_node()
+        if self._back is None:
+            self._front = None
+        else:
+            self._back.set_next_node(None)
+        self._size -= 1
+        return back.get_data_portion()
+
+    def clear(self) -> None:
+        self._front = self._back = self._current = None
+        self._size = 0
+
+    def is_empty(self) -> bool:
+        return self._size == 0
+
+    def front_to_back(self) -> None:
+        if self._size > 1:
+            self.add_to_back(self.remove_front())
+
+    def back_to_front(self) -> None:
+        if self._size > 1:
+            self.add_to_front(self.remove_back())
+
+    def display(self) -> None:  # ex: "LinkedDeque: AAPL: $20.0, AAPL: $24.0"
+        print("LinkedDeque: " + self._display_recursive("", self._front))
+
+    def _display_recursive(self, in_string: str, current_node) -> str:
+        if current_node is None:
+            return in_string
+        if in_string:
+            in_string += ", "
+        return self._display_recursive(
+            in_string + str(current_node.get_data_portion()),
+            current_node.get_next_node(),
+        )
+
+    def count_eq_data_portion(self, datum) -> int:
+        return sum(1 for each_datum in self if each_datum == datum)
+
+    def count_lt_data_portion(self, datum) -> int:
+        return sum(1 for each_datum in self if each_datum < datum)
+
+    def count_gt_data_portion(self, datum) -> int:
+        return sum(1 for each_datum in self if datum < each_datum)
+
+
+class LedgerEntry:
+    def __init__(self, stock_symbol: str) -> None:
+        self.symbol = stock_symbol
+        self._linked_deque = LinkedDeque(None, "back")
+
+    def __len__(self) -> int:
+        return len(self._linked_deque)
+
+    def add_purchase(self, new_purchase: StockPurchase) -> None:
+        self._linked_deque.add_to_back(new_purchase)
+
+    def add_purchase_front(self, new_purchase: StockPurchase) -> None:
+        self._linked_deque.add_to_front(new_purchase)
+
+    def peek(self) -> StockPurchase:
+        return self._linked_deque.get_front()
+
+    def peek_back(self) -> StockPurchase:
+        return self._linked_deque.get_back()
+
+    def increment_entry(self) -> None:
+        self._linked_deque.front_to_back()
+
+    def decrement_entry(self) -> None:
+        self._linked_deque.back_to_front()
+
+    def remove_purchase(self) -> StockPurchase:
+        return self._linked_deque.remove_front()
+
+    def _costs(self) -> list[float]:
+        return [each_purchase.cost for each_purchase in self._linked_deque]
+
+    def __eq__(self, other) -> bool:
+        return self.equals(other)
+
+    def equals(self, other) -> bool:
+        return (
+            isinstance(other, LedgerEntry)
+            and self.symbol == other.symbol
+            and self._costs() == other._costs()
+        )
+
+    def display_entry(self) -> None:  # ex: "AAPL: 20.0 (90 shares)   "
+        runs = []
+        for cost in self._costs():
+            if runs and runs[-1][0] == cost:
+                runs[-1][1] += 1
+            else:
+                runs.append([cost, 1])
+        if not runs:
+            print(f"{self.symbol}: None")
+        else:
+            print(
+                f"{self.symbol}: "
+                + "".join(
+                    f"{cost} ({quantity} shares)   " for cost, quantity in runs
+                )
+            )
+
+    def position_entry_add_between(self, cost_per_share: float) -> None:
+        for each_share in range(len(self)):
+            back_cost = self.peek_back().cost
+            front_cost = self.peek().cost
+            if back_cost <= cost_per_share <= front_cost:
+                return
+            if back_cost > front_cost and (
+                cost_per_share >= back_cost or cost_per_share <= front_cost
+            ):
+                return
+            self.increment_entry()
+
+    def align_head_tail(self) -> None:
+        for each_share in range(len(self)):
+            if self.peek_back().cost > self.peek().cost:
+                return
+            self.increment_entry()
+
+    def median(self) -> float:
+        costs = sorted(self._costs())
+        return costs[(len(costs) - 1) // 2]
+
+    def median_2(self) -> float:
+        costs = self._costs()
+        return (max(costs) - min(costs)) / 2 + min(costs)
+
+
+MODULES = {
+    "package.stock_purchase": {"StockPurchase": StockPurchase},
+    "package.stock_sale": {
+        "StockSale": StockSale,
+        "StockPurchase": StockPurchase,
+    },
+    "package.linked_deque": {"LinkedDeque": LinkedDeque},
+    "package.ledger_entry": {"LedgerEntry": LedgerEntry},
+}
+
+
+def install() -> list[str]:
+    """Puts a stand-in in sys.modules for each compiled module that does not import here, and returns their names."""
+    installed = []
+    for module_name, attributes in MODULES.items():
+        try:
+            __import__(module_name)
+        except ImportError:
+            stand_in = types.ModuleType(module_name)
+            stand_in.__file__ = __file__
+            stand_in.__dict__.update(attributes)
+            sys.modules[module_name] = stand_in
+            installed.append(module_name)
+    return installed
@@ -0,0 +1,70 @@
+from random import Random
+import pytest
+from tests import compiled_stand_ins
+
+compiled_stand_ins.install()
+
+# Buy, sell, display string from Project 1 assignment (see main.ipynb)
+PROJECT_1_LOG = """Buy 20 shares of AAPL at $45.
+Buy 20 shares of AAPL at $75.
+Buy 20 shares of MSFT at $95.
+Display the ledger
+Sell 30 shares of AAPL at $65
+Display the ledger
+Sell 10 shares of AAPL at $65
+Display the ledger
+Buy 100 shares of AAPL at $20
+Buy 20 shares of AAPL at $24
+Buy 200 shares of TSLA at $36
+Display the ledger
+Sell 10 shares of AAPL at $65
+Display the ledger
+Sell 150 shares of TSLA at $30
+Display the ledger
+Buy 5 shares of MSFT at $60
+Buy 5 shares of MSFT at $70
+Display the ledger
+Sell 4 shares of MSFT at $30
+Display the ledger
+Sell 2 shares of MSFT at $30
+Display the ledger"""
+
+
+def random_log(
+    seed: int,
+    number_of_transactions: int = 300,
+    stock_symbols: tuple[str, ...] = ("AAPL", "MSFT", "NVDA", "TSLA"),
+) -> str:  # O(N)
+    """Same as capital_gains_helper_methods.generate_buy_sell_lines_string, from Random(seed) rather than SystemRandom, with repeated whole dollar prices (for lots and ties), cent prices (as order_generator makes, so sums of costs round) and a Display line every 50 orders."""
+    rng = Random(seed)
+    shares_held = {each_symbol: 0 for each_symbol in stock_symbols}
+    lines = []
+    for t_i in range(number_of_transactions):
+        stock_symbol = rng.choice(stock_symbols)
+        quantity = rng.randrange(1, 31)
+        price = float(rng.randrange(10, 41))
+        if rng.random() < 0.5:
+            price = rng.randrange(1000, 4100) / 100
+        if quantity > shares_held[stock_symbol] or rng.random() < 0.5:
+            lines.append(
+                f"Buy {quantity} shares of {stock_symbol} at ${price}."
+            )
+            shares_held[stock_symbol] += quantity
+        else:
+            lines.append(
+                f"Sell {quantity} shares of {stock_symbol} at ${price}."
+            )
+            shares_held[stock_symbol] -= quantity
+        if t_i % 50 == 49:
+            lines.append("Display the ledger")
+    return "\n".join(lines)
+
+
+@pytest.fixture
+def project_1_log() -> str:
+    return PROJECT_1_LOG
+
+
+@pytest.fixture(params=[1, 2, 3])
+def seeded_log(request) -> str:
+    return random_log(request.param)
@@ -0,0 +1,35 @@
+import json
+from package import benchmark
+from package.stock_ledger import StockLedger
+from package.trading_bot import TradingBot
+
+
+def test_strategies_are_the_ledger_strategies():
+    assert benchmark.BUY_STRATEGIES + benchmark.SELL_STRATEGIES == (
+        StockLedger.STRATEGIES
+    )
+    assert TradingBot.BUY_STRATEGIES is StockLedger.BUY_STRATEGIES
+    assert TradingBot.SELL_STRATEGIES is StockLedger.SELL_STRATEGIES
+    for each_strategy in StockLedger.STRATEGIES:
+        assert callable(getattr(StockLedger, each_strategy))
+
+
+def test_main_writes_and_compares_results(tmp_path, capsys):
+    output_path = tmp_path / "results.json"
+    arguments = [
+        "--orders",
+        "20",
+        "--factors",
+        "1",
+        "2",
+        "--repeats",
+        "1",
+        "--no-memory",
+        "--lot-based",
+    ]
+    assert benchmark.main(arguments + ["--output", str(output_path)]) == 0
+    suite = json.loads(output_path.read_text())
+    assert set(suite["exponents"]) == set(StockLedger.STRATEGIES)
+    assert len(suite["results"]) == 10 * len(benchmark.DIMENSIONS) * 2
+    assert benchmark.compare(suite, suite) == []
+    capsys.readouterr()
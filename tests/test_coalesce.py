@@ -0,0 +1,89 @@
+from random import Random
+import pytest
+from package.order_stream import CompiledOrderStream
+from package.trading_bot import TradingBot
+from tests.test_lot_ledger_entry import outcome
+
+
+def with_repeated_buys(log: str) -> str:  # O(N)
+    """Returns log with each buy followed by a buy of 1 share of the same stock symbol at the same price, so every buy can be merged."""
+    lines = []
+    for each_line in log.split("\n"):
+        lines.append(each_line)
+        if each_line.startswith("Buy"):
+            each_split_line = each_line.split()
+            each_split_line[1] = "1"
+            lines.append(" ".join(each_split_line))
+    return "\n".join(lines)
+
+
+def replay_bot(
+    log: str,
+    buy_setting: int,
+    sell_setting: int,
+    lot_based: bool = False,
+    **replay_options,
+) -> TradingBot:
+    trading_bot = TradingBot(
+        1000, buy_setting, sell_setting, lot_based=lot_based, rng=Random(7)
+    )
+    trading_bot.replay(CompiledOrderStream.from_string(log), **replay_options)
+    return trading_bot
+
+
+@pytest.mark.parametrize("buy_setting", range(1, 6))
+@pytest.mark.parametrize("sell_setting", [1, 3, 5])
+@pytest.mark.parametrize("lot_based", [False, True])
+def test_coalesce_matches_order_by_order(
+    seeded_log, buy_setting, sell_setting, lot_based
+):
+    log = with_repeated_buys(seeded_log)
+    expected = replay_bot(log, buy_setting, sell_setting, lot_based=lot_based)
+    coalesced = replay_bot(
+        log, buy_setting, sell_setting, lot_based=lot_based, coalesce=True
+    )
+    assert outcome(coalesced) == outcome(expected)
+    assert list(coalesced.accumulated_profits) == (
+        list(expected.accumulated_profits)
+    )
+    assert coalesced.balance_over_transactions[-1] == (
+        expected.balance_over_transactions[-1]
+    )
+
+
+@pytest.mark.parametrize("buy_setting", [1, 5])
+def test_coalesce_keep_history_matches_order_by_order(seeded_log, buy_setting):
+    log = with_repeated_buys(seeded_log)
+    expected = replay_bot(log, buy_setting, 3)
+    coalesced = replay_bot(log, buy_setting, 3, coalesce=True)
+    kept = replay_bot(log, buy_setting, 3, coalesce=True, keep_history=True)
+    assert list(kept.balance_over_transactions) == (
+        list(expected.balance_over_transactions)
+    )
+    assert len(coalesced.balance_over_transactions) < (
+        len(expected.balance_over_transactions)
+    )
+
+
+def test_coalesce_merges_only_adjacent_same_price_buys():
+    """A Display, unless displayed, leaves the buys around it adjacent."""
+    orders = [
+        ("Buy", "AAPL", 2, 10.0),
+        ("Buy", "AAPL", 3, 10.0),
+        ("Buy", "AAPL", 1, 11.0),
+        ("Buy", "MSFT", 1, 11.0),
+        ("Sell", "AAPL", 1, 12.0),
+        ("Buy", "AAPL", 4, 12.0),
+        ("Display", None, 0, 0.0),
+        ("Buy", "AAPL", 4, 12.0),
+    ]
+    trading_bot = TradingBot(1000)
+    trading_bot.apply_orders(orders, coalesce=True)
+    assert list(trading_bot.balance_over_transactions) == [
+        1000.0,
+        950.0,
+        939.0,
+        928.0,
+        844.0,
+    ]
+    assert trading_bot.balance == 1000 - 50 - 11 - 11 + 12 - 96
@@ -0,0 +1,51 @@
+from random import Random
+import pytest
+from package.cost_index import CostIndex
+from package.ledger_entry import LedgerEntry
+from package.lot_ledger_entry import LotLedgerEntry
+from package.stock_purchase import StockPurchase
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_median_matches_sorted_costs(seed):
+    rng = Random(seed)
+    cost_index = CostIndex()
+    costs = []
+    for o_i in range(500):
+        if costs and rng.random() < 0.4:
+            cost = rng.choice(costs)
+            quantity = rng.randrange(1, costs.count(cost) + 1)
+            cost_index.remove_shares(cost, quantity)
+            for q_i in range(quantity):
+                costs.remove(cost)
+        else:
+            cost = float(rng.randrange(1, 60))
+            quantity = rng.randrange(1, 20)
+            cost_index.add_shares(cost, quantity)
+            costs.extend([cost] * quantity)
+        if costs:
+            costs.sort()
+            assert cost_index.median() == costs[(len(costs) - 1) // 2]
+            assert cost_index.lowest_cost() == costs[0]
+            assert cost_index.highest_cost() == costs[-1]
+
+
+@pytest.mark.parametrize("cost_index", [False, True])
+def test_lot_entry_medians_match_ledger_entry(cost_index):
+    rng = Random(11)
+    entry = LedgerEntry("AAPL")
+    lot_entry = LotLedgerEntry("AAPL", cost_index)
+    for o_i in range(200):
+        if len(entry) and rng.random() < 0.3:
+            for q_i in range(rng.randrange(1, len(entry) + 1)):
+                entry.remove_purchase()
+            lot_entry.remove_lots(len(lot_entry) - len(entry))
+        else:
+            cost = float(rng.randrange(1, 40))
+            quantity = rng.randrange(1, 10)
+            for q_i in range(quantity):
+                entry.add_purchase(StockPurchase("AAPL", cost))
+            lot_entry.add_purchase(StockPurchase("AAPL", cost), quantity)
+        if len(entry):
+            assert lot_entry.median() == entry.median()
+            assert lot_entry.median_2() == entry.median_2()
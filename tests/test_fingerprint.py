@@ -0,0 +1,42 @@
+import pytest
+from tests.test_lot_ledger_entry import SETTINGS, string_bot
+from tests.test_stock_ledger import held_costs
+
+
+def string_equals(stock_ledger, other) -> bool:
+    """StockLedger.equals as it was, comparing lines of str."""
+    return set(str(stock_ledger).split("\n")) == set(str(other).split("\n"))
+
+
+@pytest.mark.parametrize("lot_based", [False, True])
+def test_fingerprint_equals_matches_string_equals(seeded_log, lot_based):
+    trading_bots = [
+        string_bot(
+            seeded_log,
+            buy_setting,
+            sell_setting,
+            lot_based=lot_based,
+            cost_fingerprint=True,
+        )
+        for buy_setting, sell_setting in SETTINGS
+    ] + [
+        string_bot("\n".join(seeded_log.split("\n")[:150]), 1, 1),
+        string_bot("Buy 1 shares of AAPL at $1.", 1, 1, cost_fingerprint=True),
+    ]
+    costs_held = [held_costs(each_bot) for each_bot in trading_bots]
+    for b_i, each_bot in enumerate(trading_bots):
+        for o_i, other_bot in enumerate(trading_bots):
+            stock_ledger = each_bot.stock_ledger
+            other = other_bot.stock_ledger
+            assert stock_ledger.equals(other) == string_equals(
+                stock_ledger, other
+            )
+            assert (stock_ledger.diff(other) == []) == stock_ledger.equals(
+                other, costs=True
+            )
+            if stock_ledger.equals(other, costs=True):
+                assert stock_ledger.fingerprint()[0] == other.fingerprint()[0]
+                if stock_ledger._cost_hashes and other._cost_hashes:
+                    assert costs_held[b_i] == costs_held[o_i]
+            elif stock_ledger.equals(other):
+                assert costs_held[b_i] != costs_held[o_i]
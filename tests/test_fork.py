@@ -0,0 +1,94 @@
+import io
+from random import Random
+import pytest
+from package.ledger_render import LedgerRenderer
+from package.order_stream import CompiledOrderStream
+from package.trading_bot import TradingBot
+from tests.test_lot_ledger_entry import SETTINGS, outcome
+
+
+class UnscannableList(list):
+    """A list of ledger entries that fails the test when iterated."""
+
+    def __iter__(self):
+        raise AssertionError("ledger_entries scanned")
+
+
+def halves(log: str) -> tuple[CompiledOrderStream, CompiledOrderStream]:
+    lines = log.split("\n")
+    return (
+        CompiledOrderStream.from_string("\n".join(lines[: len(lines) // 2])),
+        CompiledOrderStream.from_string("\n".join(lines[len(lines) // 2 :])),
+    )
+
+
+@pytest.mark.parametrize("buy_setting, sell_setting", SETTINGS)
+@pytest.mark.parametrize("lot_based", [False, True])
+def test_fork_trades_on_as_the_original(
+    seeded_log, buy_setting, sell_setting, lot_based
+):
+    first_half, second_half = halves(seeded_log)
+    expected = TradingBot(
+        1000, buy_setting, sell_setting, lot_based=lot_based, rng=Random(7)
+    )
+    expected.replay(first_half)
+    expected.replay(second_half)
+    trading_bot = TradingBot(
+        1000, buy_setting, sell_setting, lot_based=lot_based, rng=Random(7)
+    )
+    trading_bot.replay(first_half)
+    before_fork = outcome(trading_bot)
+    forked_bot = trading_bot.fork(keep_history=True)
+    forked_bot.stock_ledger.ledger_entries = UnscannableList(
+        forked_bot.stock_ledger.ledger_entries
+    )
+    forked_bot.replay(second_half)
+    forked_bot.stock_ledger.ledger_entries = list.copy(
+        forked_bot.stock_ledger.ledger_entries
+    )
+    assert outcome(trading_bot) == before_fork
+    assert outcome(forked_bot) == outcome(expected)
+    trading_bot.replay(second_half)
+    assert outcome(trading_bot) == outcome(expected)
+
+
+def test_fork_of_a_lazy_snapshot_replaces_entries_in_place(
+    tmp_path, seeded_log
+):
+    first_half, second_half = halves(seeded_log)
+    trading_bot = TradingBot(1000, 3, 4, lot_based=True)
+    trading_bot.replay(first_half)
+    trading_bot.save_snapshot(tmp_path / "bot.snapshot")
+    restored_bot = TradingBot.load_snapshot(tmp_path / "bot.snapshot")
+    forked_bot = restored_bot.fork()
+    forked_bot.replay(second_half)
+    restored_bot.replay(second_half)
+    trading_bot.replay(second_half)
+    for each_bot in (restored_bot, forked_bot):
+        stock_ledger = each_bot.stock_ledger
+        assert [
+            stock_ledger.get_entry(each_entry.symbol)
+            for each_entry in stock_ledger.ledger_entries
+        ] == stock_ledger.ledger_entries
+        assert outcome(each_bot)[0] == outcome(trading_bot)[0]
+
+
+def test_fork_copies_renderer_and_gets_its_own_latency_recorder(
+    project_1_log,
+):
+    stream = io.StringIO()
+    trading_bot = TradingBot(1000, ledger_renderer=LedgerRenderer(stream))
+    latency_recorder = trading_bot.enable_latency()
+    trading_bot.string_to_trading_bot(project_1_log, True)
+    latencies = latency_recorder.rows()
+    calls = trading_bot.ledger_renderer.calls
+    forked_bot = trading_bot.fork()
+    assert forked_bot.ledger_renderer is not trading_bot.ledger_renderer
+    assert forked_bot.ledger_renderer.stream is stream
+    assert forked_bot.latency_recorder not in (None, latency_recorder)
+    forked_bot.string_to_trading_bot(project_1_log, True)
+    assert trading_bot.ledger_renderer.calls == calls
+    assert forked_bot.ledger_renderer.calls == 2 * calls
+    assert latency_recorder.rows() == latencies
+    assert len(forked_bot.latency_recorder) == len(latency_recorder)
+    assert TradingBot(1000).fork().ledger_renderer is None
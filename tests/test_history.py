@@ -0,0 +1,126 @@
+import os
+import pytest
+from package.history import SaleHistory, SpilledSeries
+from package.trading_bot import TradingBot
+from tests.test_lot_ledger_entry import outcome, string_bot
+
+
+def report(trading_bot: TradingBot) -> tuple:  # O(N)
+    return (
+        trading_bot.accumulated_profit(),
+        list(trading_bot.balance_over_transactions),
+        list(trading_bot.profit_per_sell),
+        [each_sale.get_profit() for each_sale in trading_bot.stock_sales_list],
+    )
+
+
+@pytest.mark.parametrize("window", [1, 8, 1000])
+def test_spilled_history_matches_kept_history(tmp_path, seeded_log, window):
+    expected = string_bot(seeded_log, 3, 4, lot_based=True)
+    trading_bots = []
+    for b_i in range(2):  # two bots spilling to one directory
+        trading_bot = TradingBot(1000, 3, 4, lot_based=True)
+        trading_bot.set_history_retention(window, tmp_path)
+        trading_bots.append(trading_bot)
+    for each_line in seeded_log.split("\n"):
+        for each_bot in trading_bots:
+            each_bot.string_to_trading_bot(each_line)
+    assert trading_bots[0].history_directory != (
+        trading_bots[1].history_directory
+    )
+    for each_bot in trading_bots:
+        assert outcome(each_bot) == outcome(expected)
+        assert report(each_bot) == report(expected)
+
+
+def test_dropped_history_keeps_totals(seeded_log):
+    expected = string_bot(seeded_log, 1, 1)
+    trading_bot = TradingBot(1000)
+    trading_bot.set_history_retention(8)
+    trading_bot.string_to_trading_bot(seeded_log)
+    assert (trading_bot.profit(), trading_bot.revenue()) == (
+        expected.profit(),
+        expected.revenue(),
+    )
+    assert trading_bot.balance == expected.balance
+    accumulated_profits = trading_bot.accumulated_profits
+    assert accumulated_profits.first_index > 0
+    assert list(accumulated_profits) == list(
+        expected.accumulated_profits[accumulated_profits.first_index :]
+    )
+    with pytest.raises(ValueError):
+        trading_bot.accumulated_profit()
+    with pytest.raises(IndexError):
+        trading_bot.stock_sales_list[0]
+
+
+def test_spill_file_is_never_overwritten(tmp_path):
+    series = SpilledSeries("d", 1, tmp_path / "series.spill", [1.0, 2.0])
+    with pytest.raises(FileExistsError):
+        SpilledSeries("d", 1, tmp_path / "series.spill", [3.0, 4.0])
+    assert series.tolist() == [1.0, 2.0]
+    series.close()
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_fork_keeps_history_retention(tmp_path, seeded_log, spill):
+    spill_directory = tmp_path if spill else None
+    lines = seeded_log.split("\n")
+    expected = string_bot(seeded_log, 3, 4)
+    trading_bot = TradingBot(1000, 3, 4)
+    trading_bot.set_history_retention(2, spill_directory)
+    trading_bot.string_to_trading_bot("\n".join(lines[:150]))
+    forked_bot = trading_bot.fork(keep_history=True)
+    fresh_fork = trading_bot.fork()
+    for each_bot in (trading_bot, forked_bot):
+        each_bot.string_to_trading_bot("\n".join(lines[150:]))
+        assert len(each_bot.stock_sales_list) == len(expected.stock_sales_list)
+        assert len(each_bot.accumulated_profits) == (
+            len(expected.accumulated_profits)
+        )
+        assert len(each_bot.accumulated_profits._memory) < 4
+        if spill:
+            assert report(each_bot) == report(expected)
+        else:
+            with pytest.raises(ValueError):
+                each_bot.accumulated_profit()
+            first_index = each_bot.accumulated_profits.first_index
+            assert list(each_bot.accumulated_profits) == list(
+                expected.accumulated_profits[first_index:]
+            )
+    assert forked_bot.accumulated_profits.window == 2
+    assert isinstance(fresh_fork.stock_sales_list, SaleHistory)
+    assert fresh_fork.stock_sales_list.window == 2
+    if spill:
+        history_directories = {
+            each_bot.history_directory
+            for each_bot in (trading_bot, forked_bot, fresh_fork)
+        }
+        assert len(history_directories) == 3
+        assert all(
+            os.path.dirname(each_directory) == str(tmp_path)
+            for each_directory in history_directories
+        )
+    for each_bot in (trading_bot, forked_bot, fresh_fork):
+        each_bot.close()
+
+
+def test_close_releases_spill_files(tmp_path, seeded_log):
+    with TradingBot(1000, 3, 4) as trading_bot:
+        trading_bot.set_history_retention(2, tmp_path)
+        trading_bot.string_to_trading_bot(seeded_log)
+        trading_bot.accumulated_profit()
+        trading_bot.stock_sales_list[0]
+        history_directory = trading_bot.history_directory
+        assert len(os.listdir(history_directory)) == 3 + 8
+        spilled = [
+            trading_bot.balance_over_transactions,
+            trading_bot.profit_per_sell,
+            trading_bot.accumulated_profits,
+            *trading_bot.stock_sales_list._columns.values(),
+        ]
+    assert all(each_series._spill_file.closed for each_series in spilled)
+    assert all(each_series._mmap is None for each_series in spilled)
+    assert not os.path.exists(history_directory)
+    assert os.listdir(tmp_path) == []
+    assert trading_bot.history_directory is None
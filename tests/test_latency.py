@@ -0,0 +1,39 @@
+import pytest
+from package.latency import LatencyHistogram, LatencyRecorder
+from package.order_stream import CompiledOrderStream
+from package.trading_bot import TradingBot
+
+
+def recorded_counts(latency_recorder: LatencyRecorder) -> dict:
+    return {
+        key: len(histogram)
+        for key, histogram in latency_recorder.histograms.items()
+    }
+
+
+@pytest.mark.parametrize("buy_setting, sell_setting", [(1, 1), (2, 5)])
+def test_string_and_batch_paths_record_the_same_keys(
+    seeded_log, buy_setting, sell_setting
+):
+    string_bot = TradingBot(1000, buy_setting, sell_setting)
+    string_latency = string_bot.enable_latency()
+    string_bot.string_to_trading_bot(seeded_log)
+    replay_bot = TradingBot(1000, buy_setting, sell_setting)
+    replay_latency = replay_bot.enable_latency()
+    replay_bot.replay(CompiledOrderStream.from_string(seeded_log))
+    assert recorded_counts(replay_latency) == recorded_counts(string_latency)
+    assert {strategy for strategy, symbol in replay_latency.histograms} == {
+        TradingBot.BUY_STRATEGIES[buy_setting - 1],
+        TradingBot.SELL_STRATEGIES[sell_setting - 1],
+    }
+
+
+def test_percentiles_within_a_bucket():
+    latency_histogram = LatencyHistogram()
+    for latency_ns in range(1, 100001):
+        latency_histogram.record(latency_ns)
+    for each_percent in [50, 90, 99]:
+        exact = each_percent * 1000
+        assert exact <= latency_histogram.percentile(each_percent) <= (
+            exact * 1.04
+        )
@@ -0,0 +1,57 @@
+import io
+import pytest
+from package.ledger_render import LedgerRenderer
+from package.trading_bot import TradingBot
+from tests.test_lot_ledger_entry import string_bot
+
+# Project 1's last Display the ledger, as main.ipynb shows it
+PROJECT_1_LEDGER = "\n".join(
+    [
+        "----  Stock Ledger  ----",
+        "AAPL: 20.0 (90 shares)   24.0 (20 shares)   ",
+        "MSFT: 95.0 (14 shares)   60.0 (5 shares)   70.0 (5 shares)   ",
+        "TSLA: 36.0 (50 shares)   ",
+        "",
+    ]
+)
+
+
+@pytest.mark.parametrize("lot_based", [False, True])
+def test_render_matches_display_ledger(capsys, seeded_log, lot_based):
+    trading_bot = TradingBot(1000, 3, 4, lot_based=lot_based)
+    for each_part in seeded_log.split("Display the ledger"):
+        if each_part.strip("\n"):
+            trading_bot.string_to_trading_bot(each_part.strip("\n"))
+        trading_bot.stock_ledger.display_ledger()
+        assert LedgerRenderer().render(trading_bot.stock_ledger) == (
+            capsys.readouterr().out
+        )
+
+
+@pytest.mark.parametrize("lot_based", [False, True])
+def test_project_1_golden_output(capsys, project_1_log, lot_based):
+    trading_bot = string_bot(project_1_log, 1, 1, lot_based=lot_based)
+    trading_bot.stock_ledger.display_ledger()
+    assert capsys.readouterr().out == PROJECT_1_LEDGER
+    assert LedgerRenderer().render(trading_bot.stock_ledger) == (
+        PROJECT_1_LEDGER
+    )
+    stream = io.StringIO()
+    trading_bot.stock_ledger.get_entry("TSLA").remove_purchase()
+    LedgerRenderer(stream, per_share=True).write(trading_bot.stock_ledger)
+    lines = stream.getvalue().split("\n")
+    assert lines[:3] == [LedgerRenderer.HEADER, "AAPL: 20.0", "AAPL: 20.0"]
+    assert lines.count("AAPL: 24.0") == 20
+    assert lines.count("TSLA: 36.0") == 49
+    assert len(lines) == 1 + 110 + 24 + 49 + 1
+
+
+def test_throttled_displays_skip_rendering(project_1_log):
+    stream = io.StringIO()
+    trading_bot = TradingBot(
+        1000, ledger_renderer=LedgerRenderer(stream, every=3)
+    )
+    trading_bot.string_to_trading_bot(project_1_log, True)
+    renderer = trading_bot.ledger_renderer
+    assert (renderer.calls, renderer.skipped) == (9, 6)
+    assert stream.getvalue().count(LedgerRenderer.HEADER) == 3
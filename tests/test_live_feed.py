@@ -0,0 +1,86 @@
+import asyncio
+from random import Random
+import threading
+import pytest
+from package.live_feed import LiveFeed
+from package.trading_bot import TradingBot
+from tests.test_lot_ledger_entry import outcome, string_bot
+
+
+async def feed(lines: list, fail_after: int | None = None):
+    for l_i, each_line in enumerate(lines):
+        if l_i == fail_after:
+            raise ConnectionError("feed lost")
+        await asyncio.sleep(0)
+        yield each_line
+
+
+@pytest.mark.parametrize("max_batch", [1, 7, 256])
+def test_live_feed_matches_string(seeded_log, max_batch):
+    trading_bot = TradingBot(1000, 2, 4, rng=Random(7))
+    report = asyncio.run(
+        trading_bot.feed_to_trading_bot(
+            feed(seeded_log.split("\n")), max_batch=max_batch
+        )
+    )
+    assert report.is_clean()
+    assert outcome(trading_bot) == outcome(string_bot(seeded_log, 2, 4))
+
+
+def test_batches_are_applied_off_the_event_loop(project_1_log):
+    trading_bot = TradingBot(1000)
+    live_feed = LiveFeed(trading_bot, max_batch=4)
+    threads = set()
+    apply_orders = trading_bot.apply_orders
+
+    def recording_apply_orders(*arguments) -> None:
+        threads.add(threading.get_ident())
+        apply_orders(*arguments)
+
+    trading_bot.apply_orders = recording_apply_orders
+
+    async def main():
+        updates = live_feed.subscribe(100)
+        await live_feed.run(feed(project_1_log.split("\n")))
+        return [
+            each_update
+            async for each_update in LiveFeed.iter_updates(updates)
+        ]
+
+    updates = asyncio.run(main())
+    assert threading.get_ident() not in threads
+    assert updates[-1].orders_applied == live_feed.orders_applied
+    assert live_feed.number_of_batches == len(updates)
+
+
+def test_failing_apply_awaits_the_cancelled_reader(project_1_log):
+    trading_bot = TradingBot(1000)
+    live_feed = LiveFeed(trading_bot, max_queue=1, max_batch=1)
+
+    def failing_apply_orders(*arguments) -> None:
+        raise RuntimeError("apply failed")
+
+    trading_bot.apply_orders = failing_apply_orders
+
+    async def main():
+        updates = live_feed.subscribe()
+        with pytest.raises(RuntimeError):
+            await live_feed.run(feed(project_1_log.split("\n")))
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+        assert await updates.get() is None
+
+    asyncio.run(main())
+
+
+def test_failing_feed_is_raised(project_1_log):
+    trading_bot = TradingBot(1000)
+
+    async def main():
+        with pytest.raises(ConnectionError):
+            await trading_bot.feed_to_trading_bot(
+                feed(project_1_log.split("\n"), fail_after=5)
+            )
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    asyncio.run(main())
+    assert len(trading_bot.stock_ledger.ledger_entries) > 0
@@ -0,0 +1,65 @@
+from random import Random
+import pytest
+from package.order_stream import CompiledOrderStream
+from package.snapshot import entry_runs
+from package.trading_bot import TradingBot
+
+SETTINGS = [
+    (buy_setting, sell_setting)
+    for buy_setting in range(1, 6)
+    for sell_setting in range(1, 6)
+]
+
+
+def outcome(trading_bot: TradingBot) -> tuple:  # O(runs)
+    """Returns what every buy and sell method must leave the same, whether lot_based or not: ledger runs, in order, per entry, profits and balance."""
+    return (
+        [
+            (each_entry.symbol, entry_runs(each_entry))
+            for each_entry in trading_bot.stock_ledger.ledger_entries
+        ],
+        list(trading_bot.profit_per_sell),
+        trading_bot.balance,
+    )
+
+
+def string_bot(log: str, buy_setting: int, sell_setting: int, **options):
+    trading_bot = TradingBot(
+        1000, buy_setting, sell_setting, rng=Random(7), **options
+    )
+    trading_bot.string_to_trading_bot(log)
+    return trading_bot
+
+
+def replay_bot(log: str, buy_setting: int, sell_setting: int, **options):
+    trading_bot = TradingBot(
+        1000, buy_setting, sell_setting, rng=Random(7), **options
+    )
+    trading_bot.replay(CompiledOrderStream.from_string(log))
+    return trading_bot
+
+
+@pytest.mark.parametrize("buy_setting, sell_setting", SETTINGS)
+@pytest.mark.parametrize("make_bot", [string_bot, replay_bot])
+def test_lot_based_matches_per_share(
+    seeded_log, make_bot, buy_setting, sell_setting
+):
+    per_share = make_bot(seeded_log, buy_setting, sell_setting)
+    lot_based = make_bot(seeded_log, buy_setting, sell_setting, lot_based=True)
+    assert outcome(lot_based) == outcome(per_share)
+
+
+@pytest.mark.parametrize("buy_setting, sell_setting", SETTINGS)
+def test_replay_matches_string(seeded_log, buy_setting, sell_setting):
+    assert outcome(replay_bot(seeded_log, buy_setting, sell_setting)) == (
+        outcome(string_bot(seeded_log, buy_setting, sell_setting))
+    )
+
+
+def test_project_1_lots(project_1_log):
+    trading_bot = string_bot(project_1_log, 1, 1, lot_based=True)
+    assert outcome(trading_bot)[0] == [
+        ("AAPL", [(20.0, 90), (24.0, 20)]),
+        ("MSFT", [(95.0, 14), (60.0, 5), (70.0, 5)]),
+        ("TSLA", [(36.0, 50)]),
+    ]
@@ -0,0 +1,74 @@
+from random import Random
+import pytest
+from package.lot_stock_sale import LotStockSale, _repeated_sum
+from package.stock_purchase import StockPurchase
+from package.stock_sale import StockSale
+from tests.test_lot_ledger_entry import string_bot
+
+
+def sale_values(sale) -> tuple:
+    return (
+        sale.symbol,
+        sale.quantity,
+        sale.price,
+        len(sale),
+        [each_share.cost for each_share in sale.shares],
+        sale.total_cost(),
+        sale.get_profit(),
+        sale.is_filled(),
+    )
+
+
+def test_lot_sale_matches_share_sale():
+    rng = Random(6)
+    lot_sale = LotStockSale("AAPL", 60, 20.0)
+    share_sale = StockSale("AAPL", 60, 20.0)
+    while not share_sale.is_filled():
+        purchase = StockPurchase("AAPL", float(rng.randrange(10, 14)))
+        quantity = min(rng.randrange(1, 6), 60 - len(share_sale))
+        lot_sale.add_sale(purchase, quantity)
+        for q_i in range(quantity):
+            share_sale.add_sale(purchase)
+        assert sale_values(lot_sale) == sale_values(share_sale)
+    assert sum(each_lot.quantity for each_lot in lot_sale.lots) == 60
+    assert all(
+        each_lot.cost != next_lot.cost
+        for each_lot, next_lot in zip(lot_sale.lots, lot_sale.lots[1:])
+    )
+
+
+def test_ledger_sales_match(seeded_log):
+    share_bot = string_bot(seeded_log, 3, 4)
+    lot_bot = string_bot(seeded_log, 3, 4, lot_based=True)
+    assert [
+        sale_values(each_sale) for each_sale in lot_bot.stock_sales_list
+    ] == [sale_values(each_sale) for each_sale in share_bot.stock_sales_list]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_repeated_sum_matches_a_loop(seed):
+    rng = Random(seed)
+    for r_i in range(2000):
+        total = rng.choice([0.0, rng.randrange(0, 10**8) / 100, 2.0**53])
+        addend = rng.choice(
+            [rng.randrange(1, 50000) / 100, 0.1, 1 / 3, 1.0, 3.0]
+        )
+        count = rng.choice([rng.randrange(0, 10), rng.randrange(0, 20000)])
+        expected = total
+        for c_i in range(count):
+            expected += addend
+        assert _repeated_sum(total, addend, count) == expected
+
+
+def test_lot_sale_of_cent_costs_matches_share_sale():
+    rng = Random(8)
+    lot_sale = LotStockSale("AAPL", 100000, 20.0)
+    share_sale = StockSale("AAPL", 100000, 20.0)
+    while not share_sale.is_filled():
+        purchase = StockPurchase("AAPL", rng.randrange(1000, 4100) / 100)
+        quantity = min(rng.randrange(1, 5000), 100000 - len(share_sale))
+        lot_sale.add_sale(purchase, quantity)
+        for q_i in range(quantity):
+            share_sale.add_sale(purchase)
+        assert lot_sale.total_cost() == share_sale.total_cost()
+    assert lot_sale.get_profit() == share_sale.get_profit()
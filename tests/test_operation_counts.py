@@ -0,0 +1,99 @@
+import pytest
+from package.linked_deque import LinkedDeque
+from package.operation_counts import OPERATIONS
+from package.ring_deque import RingDeque
+from package.trading_bot import TradingBot
+
+
+def test_counts_by_strategy(project_1_log, capsys):
+    trading_bot = TradingBot(100000, 4, 3, lot_based=True)
+    operation_counts = trading_bot.enable_operation_counts()
+    trading_bot.string_to_trading_bot(project_1_log, True)
+    assert None not in operation_counts.by_strategy
+    assert operation_counts.by_strategy["buyOptimal_2"]["calls"] == 8
+    assert operation_counts.by_strategy["sellOptimal_1"]["calls"] == 6
+    assert [each_row["strategy"] for each_row in operation_counts.rows()] == [
+        "buyOptimal_2",
+        "sellOptimal_1",
+    ]
+    assert operation_counts.by_strategy["buyOptimal_2"]["adds"] == 390
+    trading_bot.stock_ledger.get_entry("AAPL").median()
+    assert operation_counts.outside_strategies["medians"] == 1
+    assert None not in operation_counts.by_strategy
+    totals = operation_counts.totals()
+    for each_operation in OPERATIONS:
+        assert totals[each_operation] == (
+            operation_counts.outside_strategies[each_operation]
+            + sum(
+                each_counts[each_operation]
+                for each_counts in operation_counts.by_strategy.values()
+            )
+        )
+    capsys.readouterr()
+
+
+def test_counts_do_not_change_results(seeded_log):
+    trading_bots = [TradingBot(1000, 3, 4), TradingBot(1000, 3, 4)]
+    trading_bots[1].enable_operation_counts()
+    for each_bot in trading_bots:
+        each_bot.string_to_trading_bot(seeded_log)
+    assert list(trading_bots[1].profit_per_sell) == (
+        list(trading_bots[0].profit_per_sell)
+    )
+
+
+FIVE_BUYS_ONE_SELL = [
+    ("Buy", "AAPL", 2, 30.0),
+    ("Buy", "AAPL", 3, 10.0),
+    ("Buy", "AAPL", 4, 40.0),
+    ("Buy", "AAPL", 3, 20.0),
+    ("Buy", "AAPL", 3, 50.0),
+    ("Sell", "AAPL", 5, 60.0),
+]
+
+
+@pytest.mark.parametrize("deque_type", [LinkedDeque, RingDeque])
+def test_lot_sell_optimal_1_counts_traversals(deque_type):
+    counts = {}
+    for lot_based in [False, True]:
+        trading_bot = TradingBot(
+            1000, 1, 3, lot_based=lot_based, deque_type=deque_type
+        )
+        operation_counts = trading_bot.enable_operation_counts()
+        for each_order in FIVE_BUYS_ONE_SELL:
+            trading_bot.apply_orders([each_order])
+        counts[lot_based] = operation_counts.by_strategy["sellOptimal_1"]
+    for each_operation in ["traversals", "comparisons", "removes"]:
+        assert counts[True][each_operation] > 0
+        assert counts[False][each_operation] > 0
+    assert counts[True]["traversals"] < counts[False]["traversals"]
+    assert counts[True]["removes"] == counts[False]["removes"] == 5
+
+
+def test_per_share_report_leaves_out_deque_operations(project_1_log, capsys):
+    reports = []
+    for lot_based in [False, True]:
+        trading_bot = TradingBot(1000, 4, 3, lot_based=lot_based)
+        operation_counts = trading_bot.enable_operation_counts()
+        trading_bot.string_to_trading_bot(project_1_log)
+        operation_counts.display_report()
+        reports.append(capsys.readouterr().out)
+        assert list(operation_counts.rows()[0]) == [
+            "strategy",
+            "calls",
+            *operation_counts.operations,
+        ]
+    assert operation_counts.operations == OPERATIONS
+    assert "deque_moves" not in reports[0]
+    assert "deque_moves" in reports[1]
+    assert "medians 4" in reports[0] and "medians 4" in reports[1]
+
+
+def test_lot_median_counts_cost_comparisons():
+    trading_bot = TradingBot(1000, 4, 1, lot_based=True)
+    operation_counts = trading_bot.enable_operation_counts()
+    for each_cost in [5.0, 3.0, 9.0, 1.0]:
+        trading_bot.buy("AAPL", 2, each_cost)
+    buy_counts = operation_counts.by_strategy["buyOptimal_2"]
+    assert buy_counts["medians"] == 3  # none for the first buy
+    assert buy_counts["traversals"] > 0 and buy_counts["comparisons"] > 0
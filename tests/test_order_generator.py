@@ -0,0 +1,63 @@
+import pytest
+from package.order_stream import CompiledOrderStream
+from package.trading_bot import TradingBot
+
+pytest.importorskip("numpy")
+
+from package.order_generator import (  # noqa: E402
+    OrderGenerator,
+    generate_buy_sell_lines_string,
+    generate_compiled_order_stream,
+)
+
+STOCK_SYMBOLS = ["AAPL", "MSFT", "NVDA", "TSLA"]
+
+
+def columns(compiled_stream: CompiledOrderStream) -> tuple:
+    return (
+        [compiled_stream.symbols[s_i] for s_i in compiled_stream.symbol_ids],
+        compiled_stream.sides.tolist(),
+        compiled_stream.quantities.tolist(),
+        compiled_stream.prices.tolist(),
+    )
+
+
+def test_same_seed_same_orders():
+    assert generate_buy_sell_lines_string(STOCK_SYMBOLS, 500, seed=4) == (
+        generate_buy_sell_lines_string(STOCK_SYMBOLS, 500, seed=4)
+    )
+    assert generate_buy_sell_lines_string(STOCK_SYMBOLS, 500, seed=4) != (
+        generate_buy_sell_lines_string(STOCK_SYMBOLS, 500, seed=5)
+    )
+
+
+def test_orders_do_not_depend_on_batch_size():
+    lines = [
+        list(
+            OrderGenerator(
+                STOCK_SYMBOLS, seed=8, batch_size=each_batch_size
+            ).iter_lines(1000)
+        )
+        for each_batch_size in [1, 7, 1 << 16]
+    ]
+    assert lines[0] == lines[1] == lines[2]
+
+
+def test_compiled_stream_matches_lines():
+    lines_str, shares_quantity_list = generate_buy_sell_lines_string(
+        STOCK_SYMBOLS, 2000, seed=9
+    )
+    compiled_stream, compiled_shares = generate_compiled_order_stream(
+        STOCK_SYMBOLS, 2000, seed=9
+    )
+    assert compiled_shares == shares_quantity_list
+    assert columns(compiled_stream) == (
+        columns(CompiledOrderStream.from_string(lines_str))
+    )
+    trading_bot = TradingBot(0, 1, 3, lot_based=True)
+    trading_bot.replay(compiled_stream)  # every sale can be filled
+    assert [
+        trading_bot.stock_ledger.number_of_shares(each_symbol)
+        for each_symbol in STOCK_SYMBOLS
+    ] == shares_quantity_list
+    assert len(trading_bot.profit_per_sell) == compiled_stream.sides.count(-1)
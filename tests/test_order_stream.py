@@ -0,0 +1,75 @@
+import io
+import pathlib
+import pytest
+from package.ledger_render import LedgerRenderer
+from package.order_stream import CompiledOrderStream, is_display_line
+from package.trading_bot import TradingBot
+from tests.test_lot_ledger_entry import outcome, string_bot
+
+
+def test_stream_sources_match_string(tmp_path, seeded_log):
+    expected = outcome(string_bot(seeded_log, 1, 3))
+    log_path = tmp_path / "orders.txt"
+    log_path.write_text(seeded_log)
+    with open(log_path) as log_file:
+        for each_source in [
+            log_path,
+            log_file,
+            seeded_log.split("\n"),
+            io.StringIO(seeded_log),
+            (each_line.encode() for each_line in seeded_log.split("\n")),
+        ]:
+            trading_bot = TradingBot(1000, 1, 3)
+            report = trading_bot.stream_to_trading_bot(each_source)
+            assert report.is_clean()
+            assert outcome(trading_bot) == expected
+
+
+def test_str_source_is_not_read_as_a_path(tmp_path, project_1_log):
+    log_path = tmp_path / "orders.txt"
+    log_path.write_text(project_1_log)
+    with pytest.raises(TypeError):
+        TradingBot(1000).stream_to_trading_bot(str(log_path))
+    with pytest.raises(TypeError):
+        CompiledOrderStream.from_source(project_1_log)
+    assert len(CompiledOrderStream.from_source(pathlib.Path(log_path))) == 23
+
+
+def test_malformed_lines_are_counted():
+    trading_bot = TradingBot(1000)
+    report = trading_bot.stream_to_trading_bot(
+        ["Buy 2 shares of AAPL at $4.", "", "Buy two shares", "Display"]
+    )
+    assert (report.number_of_buys, report.number_of_displays) == (1, 1)
+    assert report.number_of_blank_lines == 1
+    assert report.malformed_examples == [(3, "Buy two shares")]
+
+
+DISPLAY_LOG = """Buy 2 shares of AAPL at $4.
+Display the ledger
+Show Display
+  Display
+Displayed
+Sell 1 shares of AAPL at $5."""
+
+
+def test_display_rule_matches_in_every_path(capsys):
+    assert [
+        each_line
+        for each_line in DISPLAY_LOG.split("\n")
+        if is_display_line(each_line)
+    ] == ["Display the ledger", "  Display"]
+    paths = [
+        lambda trading_bot: trading_bot.string_to_trading_bot(
+            DISPLAY_LOG, True
+        ),
+        lambda trading_bot: trading_bot.stream_to_trading_bot(
+            DISPLAY_LOG.split("\n"), True
+        ),
+        lambda trading_bot: trading_bot.replay(
+            CompiledOrderStream.from_string(DISPLAY_LOG), True
+        ),
+    ]
+    for each_path in paths:
+        each_path(TradingBot(1000))
+        assert capsys.readouterr().out.count(LedgerRenderer.HEADER) == 2
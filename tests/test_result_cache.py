@@ -0,0 +1,86 @@
+import pytest
+from package import result_cache as result_cache_module
+from package.result_cache import ResultCache
+from package.snapshot import SnapshotFile
+from package.strategy_sweep import StrategySweep
+from tests.test_strategy_sweep import cell_values
+
+
+def series(sweep_results) -> list[tuple]:
+    return [
+        (
+            list(each_result.balance_over_transactions),
+            list(each_result.profit_per_sell),
+            list(each_result.accumulated_profits),
+        )
+        for each_result in sweep_results
+    ]
+
+
+def test_cached_sweep_matches_replayed_sweep(tmp_path, seeded_log):
+    replayed = StrategySweep([seeded_log], seed=5, max_workers=0).run()
+    result_cache = ResultCache(tmp_path)
+    stored = StrategySweep(
+        [seeded_log], seed=5, max_workers=0, cache=result_cache
+    ).run()
+    assert (result_cache.hits, len(result_cache)) == (0, 25)
+    cached = StrategySweep(
+        [seeded_log], seed=5, max_workers=0, cache=ResultCache(tmp_path)
+    ).run()
+    assert all(each_result.cached for each_result in cached)
+    assert cell_values(cached) == cell_values(replayed)
+    assert series(cached) == series(stored)
+
+
+def test_key_depends_on_code(monkeypatch):
+    key = ResultCache.key("digest", 1, 1, None, {})
+    assert ResultCache.code_digest() == ResultCache.code_digest()
+    assert ResultCache.key("digest", 1, 1, None, {}) == key
+    monkeypatch.setattr(
+        ResultCache, "code_digest", staticmethod(lambda: "changed")
+    )
+    assert ResultCache.key("digest", 1, 1, None, {}) != key
+
+
+def test_code_digest_hashes_module_files(monkeypatch, tmp_path):
+    strategy_file = tmp_path / "strategy.py"
+    strategy_file.write_text("STRATEGY = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(ResultCache, "RESULT_MODULES", ["strategy"])
+    ResultCache.code_digest.cache_clear()
+    try:
+        digest = ResultCache.code_digest()
+        strategy_file.write_text("STRATEGY = 2\n")
+        ResultCache.code_digest.cache_clear()
+        assert ResultCache.code_digest() != digest
+    finally:
+        ResultCache.code_digest.cache_clear()
+
+
+def test_get_closes_the_result_file(monkeypatch, tmp_path, project_1_log):
+    closed = []
+
+    class ClosingSnapshotFile(SnapshotFile):
+        def close(self) -> None:
+            SnapshotFile.close(self)
+            closed.append(self._mmap.closed)
+
+    StrategySweep(
+        [project_1_log],
+        buy_settings=[1],
+        sell_settings=[1],
+        max_workers=0,
+        cache=ResultCache(tmp_path),
+    ).run()
+    monkeypatch.setattr(
+        result_cache_module, "SnapshotFile", ClosingSnapshotFile
+    )
+    result_cache = ResultCache(tmp_path)
+    (key,) = list(result_cache._sizes)
+    arrays, meta = result_cache.get(key)
+    assert closed == [True]
+    assert sum(len(each_array) for each_array in arrays.values()) > 0
+    with SnapshotFile(result_cache._path(key)) as result_file:
+        name = result_file.names()[0]
+    with pytest.raises(ValueError):
+        result_file.array(name)
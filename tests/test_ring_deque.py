@@ -0,0 +1,119 @@
+from random import Random
+import pytest
+from package.linked_deque import LinkedDeque
+from package.lot_ledger_entry import LotLedgerEntry
+from package.ring_deque import RingDeque
+from package.stock_purchase import StockPurchase
+from tests.test_lot_ledger_entry import SETTINGS, outcome, replay_bot
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ring_deque_matches_linked_deque(seed, capsys):
+    rng = Random(seed)
+    ring_deque = RingDeque(None, "back")
+    linked_deque = LinkedDeque(None, "back")
+    for o_i in range(2000):
+        operation = rng.choice(
+            [
+                "add_to_back",
+                "add_to_front",
+                "remove_front",
+                "remove_back",
+                "front_to_back",
+                "back_to_front",
+            ]
+        )
+        if operation.startswith("add"):
+            datum = rng.randrange(100)
+            getattr(ring_deque, operation)(datum)
+            getattr(linked_deque, operation)(datum)
+        elif operation.startswith("remove"):
+            if len(linked_deque) > 0:
+                assert getattr(ring_deque, operation)() == (
+                    getattr(linked_deque, operation)()
+                )
+        else:
+            getattr(ring_deque, operation)()
+            getattr(linked_deque, operation)()
+        assert len(ring_deque) == len(linked_deque)
+        assert ring_deque.get_front() == linked_deque.get_front()
+        assert ring_deque.get_back() == linked_deque.get_back()
+    assert ring_deque == linked_deque
+    ring_deque.display()
+    linked_deque.display()
+    ring_output, linked_output = capsys.readouterr().out.splitlines()
+    assert ring_output == linked_output
+
+
+def test_iteration_protocol():
+    ring_deque = RingDeque([1, 2, 3], "back")
+    assert iter(ring_deque) is ring_deque
+    assert [next(ring_deque), next(ring_deque), next(ring_deque)] == [1, 2, 3]
+    with pytest.raises(StopIteration):
+        next(ring_deque)
+    assert list(ring_deque) == [1, 2, 3]
+    assert ring_deque == ring_deque
+
+
+def test_buffer_shrinks_under_a_quarter_full():
+    ring_deque = RingDeque(range(1000), "back")
+    assert len(ring_deque._items) == 1024
+    for r_i in range(990):
+        ring_deque.remove_front()
+    assert len(ring_deque._items) < 4 * len(ring_deque) + 8
+    assert list(ring_deque) == list(range(990, 1000))
+
+
+@pytest.mark.parametrize("steps", [-17, -1, 0, 1, 5, 8, 9, 30])
+@pytest.mark.parametrize("size", [8, 9, 20])
+def test_rotate_matches_front_to_back(size, steps):
+    ring_deque = RingDeque(range(size), "back")
+    linked_deque = LinkedDeque(range(size), "back")
+    ring_deque.rotate(steps)
+    for r_i in range(steps % size):
+        linked_deque.front_to_back()
+    assert ring_deque == linked_deque
+
+
+@pytest.mark.parametrize("buy_setting, sell_setting", SETTINGS)
+@pytest.mark.parametrize("cost_index", [False, True])
+def test_ring_deque_entries_match_linked_deque_entries(
+    seeded_log, buy_setting, sell_setting, cost_index
+):
+    assert outcome(
+        replay_bot(
+            seeded_log,
+            buy_setting,
+            sell_setting,
+            lot_based=True,
+            cost_index=cost_index,
+            deque_type=RingDeque,
+        )
+    ) == outcome(
+        replay_bot(
+            seeded_log,
+            buy_setting,
+            sell_setting,
+            lot_based=True,
+            cost_index=cost_index,
+        )
+    )
+
+
+def test_lot_entries_rotate_lots_in_one_call():
+    rotations = []
+
+    class RecordingRingDeque(RingDeque):
+        def rotate(self, steps: int) -> None:
+            rotations.append(steps)
+            RingDeque.rotate(self, steps)
+
+    lot_entry = LotLedgerEntry("AAPL", deque_type=RecordingRingDeque)
+    for each_cost in [5.0, 6.0, 7.0, 1.0, 2.0, 3.0]:
+        lot_entry.add_purchase(StockPurchase("AAPL", each_cost), 2)
+    lot_entry.align_head_tail()
+    assert rotations == [3]
+    assert lot_entry.runs()[0] == (1.0, 2)
+    lot_entry.position_entry_add_between(6.5)
+    assert rotations == [3, 5]
+    assert lot_entry.runs()[0] == (7.0, 2)
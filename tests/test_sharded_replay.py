@@ -0,0 +1,89 @@
+import pytest
+from package.order_stream import CompiledOrderStream
+from package.ring_deque import RingDeque
+from package.sharded_replay import ShardedReplay
+from tests.test_lot_ledger_entry import SETTINGS, outcome, replay_bot
+
+# buyRandom and sellRandom draw from one Random per shard, so only the
+# other settings can match a single replay
+SEEDLESS_SETTINGS = [
+    (buy_setting, sell_setting)
+    for buy_setting, sell_setting in SETTINGS
+    if buy_setting != 2 and sell_setting != 2
+]
+
+
+@pytest.mark.parametrize("buy_setting, sell_setting", SEEDLESS_SETTINGS)
+@pytest.mark.parametrize("shards", [1, 3])
+@pytest.mark.parametrize("lazy", [False, True])
+def test_sharded_replay_matches_replay(
+    seeded_log, buy_setting, sell_setting, shards, lazy
+):
+    expected = replay_bot(seeded_log, buy_setting, sell_setting)
+    trading_bot = ShardedReplay(
+        seeded_log,
+        buy_setting,
+        sell_setting,
+        initial_balance=1000,
+        shards=shards,
+        max_workers=0,
+    ).run(lazy)
+    assert outcome(trading_bot) == outcome(expected)
+    assert list(trading_bot.balance_over_transactions) == (
+        list(expected.balance_over_transactions)
+    )
+    assert list(trading_bot.accumulated_profits) == (
+        list(expected.accumulated_profits)
+    )
+    assert (trading_bot.profit(), trading_bot.revenue()) == (
+        expected.profit(),
+        expected.revenue(),
+    )
+
+
+@pytest.mark.parametrize(
+    "ledger_options",
+    [
+        {"lot_based": True},
+        {"lot_based": True, "cost_index": True},
+        {"lot_based": True, "deque_type": RingDeque},
+    ],
+)
+def test_sharded_replay_in_a_process_pool_matches_replay(
+    seeded_log, ledger_options
+):
+    expected = replay_bot(seeded_log, 3, 4, **ledger_options)
+    trading_bot = ShardedReplay(
+        CompiledOrderStream.from_string(seeded_log),
+        3,
+        4,
+        initial_balance=1000,
+        shards=4,
+        max_workers=2,
+        **ledger_options,
+    ).run()
+    assert outcome(trading_bot) == outcome(expected)
+    assert len(trading_bot.stock_sales_list) == len(expected.stock_sales_list)
+
+
+def test_partition_keeps_each_symbol_in_one_shard(seeded_log):
+    partitions = ShardedReplay(seeded_log, shards=3).partition()
+    shard_symbols = [
+        set(shard_stream.symbols) for shard_stream, order_indices in partitions
+    ]
+    for each_symbols in shard_symbols:
+        for other_symbols in shard_symbols:
+            assert each_symbols is other_symbols or not (
+                each_symbols & other_symbols
+            )
+    assert sorted(
+        o_i
+        for shard_stream, order_indices in partitions
+        for o_i in order_indices
+    ) == [
+        o_i
+        for o_i, side in enumerate(
+            CompiledOrderStream.from_string(seeded_log).sides
+        )
+        if side != 0
+    ]
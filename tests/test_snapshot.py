@@ -0,0 +1,48 @@
+from random import Random
+import pytest
+from package.order_stream import CompiledOrderStream
+from package.ring_deque import RingDeque
+from package.trading_bot import TradingBot
+from tests.test_lot_ledger_entry import outcome
+
+
+def halves(log: str) -> tuple[CompiledOrderStream, CompiledOrderStream]:
+    lines = log.split("\n")
+    return (
+        CompiledOrderStream.from_string("\n".join(lines[: len(lines) // 2])),
+        CompiledOrderStream.from_string("\n".join(lines[len(lines) // 2 :])),
+    )
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize(
+    "buy_setting, sell_setting, options",
+    [
+        (1, 1, {}),
+        (2, 2, {}),
+        (4, 3, {"lot_based": True, "cost_index": True}),
+        (2, 5, {"lot_based": True, "deque_type": RingDeque}),
+    ],
+)
+def test_restored_bot_trades_on_as_the_original(
+    tmp_path, seeded_log, lazy, buy_setting, sell_setting, options
+):
+    first_half, second_half = halves(seeded_log)
+    trading_bot = TradingBot(
+        1000, buy_setting, sell_setting, rng=Random(2), **options
+    )
+    trading_bot.replay(first_half)
+    trading_bot.save_snapshot(tmp_path / "bot.snapshot")
+    restored_bot = TradingBot.load_snapshot(tmp_path / "bot.snapshot", lazy)
+    assert outcome(restored_bot) == outcome(trading_bot)
+    assert restored_bot.profit() == trading_bot.profit()
+    assert restored_bot.revenue() == trading_bot.revenue()
+    for each_bot in [trading_bot, restored_bot]:
+        each_bot.replay(second_half)
+    assert outcome(restored_bot) == outcome(trading_bot)
+    assert list(restored_bot.balance_over_transactions) == list(
+        trading_bot.balance_over_transactions
+    )
+    assert [
+        each_sale.get_profit() for each_sale in restored_bot.stock_sales_list
+    ] == [each_sale.get_profit() for each_sale in trading_bot.stock_sales_list]
@@ -0,0 +1,116 @@
+from random import Random
+import pytest
+from package.snapshot import entry_runs
+from package.stock_ledger import StockLedger
+from package.trading_bot import TradingBot
+from tests.test_lot_ledger_entry import outcome
+
+
+def scanned_shares(stock_ledger: StockLedger, stock_symbol: str) -> int:
+    for each_entry in stock_ledger.ledger_entries:  # O(number of entries)
+        if each_entry.symbol == stock_symbol:
+            return len(each_entry)
+    return 0
+
+
+@pytest.mark.parametrize("lot_based", [False, True])
+def test_symbol_index_matches_scan(seeded_log, lot_based):
+    stock_ledger = StockLedger(lot_based, rng=Random(3))
+    for each_line in seeded_log.split("\n"):
+        each_split_line = each_line.split()
+        if each_split_line[0] == "Buy":
+            stock_ledger.buy(
+                each_split_line[4],
+                int(each_split_line[1]),
+                float(each_split_line[-1].strip(".$")),
+            )
+        elif each_split_line[0] == "Sell":
+            stock_ledger.sell(
+                each_split_line[4],
+                int(each_split_line[1]),
+                float(each_split_line[-1].strip(".$")),
+            )
+    for each_symbol in ["AAPL", "MSFT", "NVDA", "TSLA", "NONE"]:
+        assert stock_ledger.number_of_shares(each_symbol) == (
+            scanned_shares(stock_ledger, each_symbol)
+        )
+        assert stock_ledger.contains(each_symbol) == (each_symbol != "NONE")
+    assert [
+        stock_ledger.get_entry(each_entry.symbol)
+        for each_entry in stock_ledger.ledger_entries
+    ] == stock_ledger.ledger_entries
+    assert str(stock_ledger) == "\n".join(
+        ["Total shares:"]
+        + [
+            f"{each_entry.symbol}: {len(each_entry)} shares"
+            for each_entry in stock_ledger.ledger_entries
+        ]
+    )
+
+
+def test_unfilled_sale_keeps_share_count():
+    stock_ledger = StockLedger()
+    stock_ledger.buy("AAPL", 5, 10.0)
+    stock_ledger.sell("AAPL", 6, 12.0)
+    stock_ledger.sell("MSFT", 1, 12.0)
+    assert stock_ledger.number_of_shares("AAPL") == 5
+    assert stock_ledger.get_entry("MSFT") is None
+
+
+@pytest.mark.parametrize(
+    "lot_based, cost_index", [(False, False), (True, False), (True, True)]
+)
+def test_sell_optimal_1_unfilled_sale(lot_based, cost_index):
+    stock_ledger = StockLedger(lot_based, cost_index)
+    stock_ledger.buy("AAPL", 5, 10.0)
+    assert stock_ledger.sellOptimal_1("AAPL", 6, 12.0) is None
+    assert stock_ledger.sellOptimal_1("MSFT", 1, 12.0) is None
+    assert stock_ledger.number_of_shares("AAPL") == 5
+
+
+def held_costs(trading_bot: TradingBot) -> dict:  # O(runs)
+    """Returns the multiset of costs held per symbol, regardless of order."""
+    held = {}
+    for each_entry, runs in outcome(trading_bot)[0]:
+        held[each_entry] = {}
+        for cost, quantity in runs:
+            held[each_entry][cost] = held[each_entry].get(cost, 0) + quantity
+    return held
+
+
+@pytest.mark.parametrize("sell_setting", [3, 4])
+def test_cost_index_matches_scan(seeded_log, sell_setting):
+    """With a cost index, shares are taken out of order, so only the shares held (not their order), profits and balance must be the same."""
+    trading_bots = []
+    for cost_index in [False, True]:
+        trading_bots.append(
+            TradingBot(
+                1000, 1, sell_setting, lot_based=True, cost_index=cost_index
+            )
+        )
+        trading_bots[-1].string_to_trading_bot(seeded_log)
+    assert held_costs(trading_bots[1]) == held_costs(trading_bots[0])
+    assert outcome(trading_bots[1])[1:] == outcome(trading_bots[0])[1:]
+
+
+@pytest.mark.parametrize("lot_based", [False, True])
+def test_increment_entry_matches_single_steps(lot_based):
+    stock_ledger = StockLedger(lot_based)
+    for each_cost in [3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0]:
+        stock_ledger.buy("AAPL", 2, each_cost)
+    entry = stock_ledger.get_entry("AAPL")
+    expected = [
+        each_cost
+        for each_cost in [3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0]
+        for q_i in range(2)
+    ]
+    for steps in range(0, 3 * len(entry)):
+        stock_ledger._increment_entry(entry, steps)
+        expected = expected[steps % len(expected) :] + (
+            expected[: steps % len(expected)]
+        )
+        assert [
+            cost
+            for cost, quantity in entry_runs(entry)
+            for q_i in range(quantity)
+        ] == expected
@@ -0,0 +1,51 @@
+import pytest
+from package.order_stream import CompiledOrderStream
+from package.strategy_sweep import StrategySweep, _cell_rng
+from package.trading_bot import TradingBot
+
+
+def cell_values(sweep_results) -> list[tuple]:
+    return [
+        (
+            each_result.stream_index,
+            each_result.buy_setting,
+            each_result.sell_setting,
+            each_result.profit,
+            each_result.balance,
+            each_result.ledger_str,
+        )
+        for each_result in sweep_results
+    ]
+
+
+def test_sweep_matches_one_bot_per_cell(seeded_log):
+    strategy_sweep = StrategySweep([seeded_log], seed=5, max_workers=0)
+    strategy_sweep.run()
+    compiled_stream = CompiledOrderStream.from_string(seeded_log)
+    for buy_setting in range(1, 6):
+        for sell_setting in range(1, 6):
+            trading_bot = TradingBot(
+                buy_setting=buy_setting,
+                sell_setting=sell_setting,
+                rng=_cell_rng(5, 0, buy_setting, sell_setting),
+            )
+            trading_bot.replay(compiled_stream)
+            each_result = strategy_sweep.result(0, buy_setting, sell_setting)
+            assert each_result.profit == trading_bot.profit()
+            assert each_result.balance == trading_bot.balance
+            assert each_result.ledger_str == str(trading_bot.stock_ledger)
+    assert strategy_sweep.all_ledgers_equal()
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_sweep_does_not_depend_on_workers(project_1_log, max_workers):
+    sweeps = [
+        StrategySweep(
+            [project_1_log, project_1_log.replace("AAPL", "NVDA")],
+            seed="s",
+            max_workers=each_max_workers,
+            lot_based=True,
+        )
+        for each_max_workers in [0, max_workers]
+    ]
+    assert cell_values(sweeps[1].run()) == cell_values(sweeps[0].run())
@@ -0,0 +1,53 @@
+from itertools import accumulate
+from package.order_stream import CompiledOrderStream
+from package.trading_bot import TradingBot
+from tests.test_lot_ledger_entry import string_bot
+
+
+def test_running_totals_match_sales(seeded_log):
+    for trading_bot in [
+        string_bot(seeded_log, 3, 4),
+        string_bot(seeded_log, 3, 4, lot_based=True),
+    ]:
+        sales = trading_bot.stock_sales_list
+        assert trading_bot.revenue() == sum(
+            each_sale.quantity * each_sale.price for each_sale in sales
+        )
+        assert trading_bot.profit() == sum(
+            each_sale.get_profit() for each_sale in sales
+        )
+        assert trading_bot.accumulated_profit() == [0.0] + list(
+            accumulate(each_sale.get_profit() for each_sale in sales)
+        )
+        assert trading_bot.last_revenue() == (
+            sales[-1].quantity * sales[-1].price
+        )
+
+
+def test_project_1_totals(project_1_log):
+    trading_bot = TradingBot(100000)
+    trading_bot.replay(CompiledOrderStream.from_string(project_1_log))
+    # 50 AAPL at $65, 150 TSLA at $30 and 6 MSFT at $30
+    assert trading_bot.revenue() == 50 * 65 + 150 * 30 + 6 * 30
+    assert trading_bot.balance == 100000 - 14630 + trading_bot.revenue()
+
+
+def test_batch_makes_entries_in_order_of_first_buy():
+    log = (
+        "Sell 1 shares of X at $1.\n"
+        "Buy 1 shares of Y at $1.\n"
+        "Buy 1 shares of X at $1."
+    )
+    for buy_setting, sell_setting in [(1, 1), (2, 2)]:
+        one_by_one_bot = TradingBot(10, buy_setting, sell_setting)
+        one_by_one_bot.string_to_trading_bot(log)
+        batch_bot = TradingBot(10, buy_setting, sell_setting)
+        batch_bot.replay(CompiledOrderStream.from_string(log))
+        assert [
+            each_entry.symbol
+            for each_entry in batch_bot.stock_ledger.ledger_entries
+        ] == ["Y", "X"]
+        assert [
+            each_entry.symbol
+            for each_entry in one_by_one_bot.stock_ledger.ledger_entries
+        ] == ["Y", "X"]